@@ -38,11 +38,14 @@ from app.common.data.types import (
     QuestionDataType,
     RoleEnum,
     SubmissionAssessmentStatusEnum,
+    SubmissionExportFormatEnum,
+    SubmissionExportJobStatusEnum,
     SubmissionModeEnum,
     SubmissionStatusEnum,
     TasklistSectionStatusEnum,
 )
 from app.common.exceptions import RedirectException
+from app.common.expressions import configure_statement_cache
 from app.common.expressions.references import ExpressionReference
 from app.common.filters import (
     format_date,
@@ -60,17 +63,24 @@ from app.common.filters import (
 from app.common.helpers.collections import SubmissionAuthorisationError
 from app.common.helpers.feature_flags import FeatureFlags
 from app.common.helpers.request_tracing import get_tracing_state
+from app.common.helpers.submission_exports import (
+    configure_submission_export_cache,
+    process_next_submission_export_job,
+)
+from app.common.helpers.submission_pdfs import process_next_submission_pdf_job
 from app.common.utils import comma_join_items, slugify, uppercase_first
 from app.config import get_settings
 from app.constants import DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER
 from app.extensions import (
     auto_commit_after_request,
+    background_jobs,
     db,
     flask_assets_vite,
     govuk_markdown,
     login_manager,
     migrate,
     notification_service,
+    pdf_renderer,
     psycopg_citext,
     record_sqlalchemy_queries,
     register_signals,
@@ -238,11 +248,19 @@ def create_app() -> Flask:  # noqa: C901
         toolbar.init_app(app)
     notification_service.init_app(app)
     s3_service.init_app(app)
+    pdf_renderer.init_app(app)
     talisman.init_app(app, **app.config["TALISMAN_SETTINGS"])
     login_manager.init_app(app)
     register_signals(app)
     record_sqlalchemy_queries.init_app(app, db)
     govuk_markdown.init_app(app)
+    configure_statement_cache(app.config["EXPRESSION_STATEMENT_CACHE_SIZE"])
+    background_jobs.init_app(app)
+    background_jobs.register(process_next_submission_export_job)
+    background_jobs.register(process_next_submission_pdf_job)
+    configure_submission_export_cache(
+        app.config["SUBMISSION_EXPORT_CACHE_DIR"], max_size=app.config["SUBMISSION_EXPORT_CACHE_MAX_SIZE_BYTES"]
+    )
 
     @app.after_request
     def set_cache_control_headers(response: Response) -> Response:
@@ -328,6 +346,8 @@ def create_app() -> Flask:  # noqa: C901
                 form_runner_state=FormRunnerState,
                 submission_status=SubmissionStatusEnum,
                 submission_assessment_status=SubmissionAssessmentStatusEnum,
+                submission_export_format=SubmissionExportFormatEnum,
+                submission_export_job_status=SubmissionExportJobStatusEnum,
                 tasklist_section_status=TasklistSectionStatusEnum,
                 expression_type=ExpressionType,
                 grant_status=GrantStatusEnum,
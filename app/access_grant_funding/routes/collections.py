@@ -17,7 +17,7 @@ from app.common.exceptions import SubmissionValidationFailed
 from app.common.forms import GenericSubmitForm
 from app.common.helpers.collections import CollectionHelper, SubmissionHelper
 from app.common.helpers.feature_flags import FeatureFlags
-from app.common.helpers.pdf import render_pdf
+from app.common.helpers.submission_pdfs import SubmissionPdfAudience, get_submission_pdf
 from app.extensions import auto_commit_after_request
 from app.metrics import MetricEventName, emit_metric_count
 from app.types import FlashMessageType
@@ -198,17 +198,12 @@ def export_submission_pdf(
 
     submission = SubmissionHelper.load(submission_id=submission_id, grant_recipient_id=grant_recipient.id)
 
-    html_content = render_template(
-        "common/submission_print_baseline.html",
-        grant_recipient=grant_recipient,
-        submission=submission,
-        interpolate=SubmissionHelper.get_interpolator(collection=submission.collection, submission_helper=submission),
-    )
+    pdf_bytes = get_submission_pdf(submission, SubmissionPdfAudience.ACCESS)
 
     emit_metric_count(MetricEventName.SUBMISSION_PDF_DOWNLOADED, submission=submission.submission)
 
     return send_file(
-        io.BytesIO(render_pdf(html_content)),
+        io.BytesIO(pdf_bytes),
         mimetype="application/pdf",
         as_attachment=True,
         download_name=secure_filename(f"{submission.collection.grant.name} - {submission.long_collection_name}.pdf"),
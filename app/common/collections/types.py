@@ -53,6 +53,9 @@ class SubmissionAnswerRootModel[T](RootModel[T]):
     def get_value_for_json_export(self) -> T:
         return cast(T, self.model_dump(mode="json"))
 
+    def get_value_for_spreadsheet_export(self) -> T:
+        return self.root
+
 
 class SubmissionAnswerBaseModel(BaseModel, abc.ABC):
     @property
@@ -70,6 +73,8 @@ class SubmissionAnswerBaseModel(BaseModel, abc.ABC):
     def get_value_for_text_export(self) -> str: ...
     @abc.abstractmethod
     def get_value_for_json_export(self) -> Any: ...
+    @abc.abstractmethod
+    def get_value_for_spreadsheet_export(self) -> Any: ...
 
 
 class TextSingleLineAnswer(SubmissionAnswerRootModel[str]):
@@ -152,6 +157,10 @@ class _NumberAnswer[T: int | Decimal](SubmissionAnswerBaseModel):
 
         return data
 
+    def get_value_for_spreadsheet_export(self) -> T:
+        # The prefix and suffix are the same for every answer to a question, so leave them out to keep the cell numeric.
+        return self.value
+
 
 IntegerAnswer = _NumberAnswer[int]
 
@@ -199,6 +208,9 @@ class SingleChoiceFromListAnswer(SubmissionAnswerBaseModel):
     def get_value_for_json_export(self) -> ChoiceDict:
         return {"key": self.key, "label": self.label}
 
+    def get_value_for_spreadsheet_export(self) -> str:
+        return self.label
+
 
 class MultipleChoiceFromListAnswer(SubmissionAnswerBaseModel):
     choices: list[ChoiceDict]
@@ -226,6 +238,9 @@ class MultipleChoiceFromListAnswer(SubmissionAnswerBaseModel):
     def get_value_for_json_export(self) -> list[ChoiceDict]:
         return self.choices
 
+    def get_value_for_spreadsheet_export(self) -> str:
+        return self.get_value_for_text_export()
+
 
 class DateAnswer(SubmissionAnswerBaseModel):
     answer: date
@@ -253,6 +268,10 @@ class DateAnswer(SubmissionAnswerBaseModel):
     def get_value_for_json_export(self) -> str:
         return self.answer.isoformat() if not self.approximate_date else self.answer.strftime("%B %-Y")
 
+    def get_value_for_spreadsheet_export(self) -> date | str:
+        # Approximate dates don't have a day, so writing them as a date would make one up.
+        return self.answer if not self.approximate_date else self.get_value_for_text_export()
+
 
 class FileUploadAnswer(SubmissionAnswerBaseModel):
     filename: str
@@ -289,6 +308,9 @@ class FileUploadAnswer(SubmissionAnswerBaseModel):
         # todo: we can expose more information in the JSON export when persisting more
         return self.filename
 
+    def get_value_for_spreadsheet_export(self) -> str:
+        return self.filename
+
 
 AllAnswerTypes = Union[
     TextSingleLineAnswer
@@ -10,5 +10,9 @@ from app.extensions import db
 __all__ = ["grants", "magic_link", "user", "collections", "grant_recipients", "data_analysis", "release_notes"]
 
 
+def commit() -> None:
+    db.session.commit()
+
+
 def rollback() -> None:
     db.session.rollback()
@@ -1,15 +1,33 @@
 import datetime
 import uuid
-from collections.abc import Sequence
-from copy import deepcopy
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from typing import Any, List, Literal, Never, Protocol, Unpack, cast, overload
 from uuid import UUID
 
 from flask import current_app
-from sqlalchemy import and_, delete, func, null, or_, select, text
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Text,
+    and_,
+    case,
+    delete,
+    func,
+    inspect,
+    literal,
+    null,
+    or_,
+    select,
+    text,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.common.data.interfaces.exceptions import (
     CollectionChronologyError,
@@ -621,17 +639,54 @@ def update_collection(  # noqa: C901
 def update_submission_data(submission: Submission) -> None:
     """Update the submission data with the data from the helper.
 
+    Only the paths changed through the data manager (see `SubmissionDataManager.get_changes`) are written with
+    `jsonb_set` and `#-`, rather than rewriting the whole blob, unless there are more than
+    `SUBMISSION_DATA_PATCH_MAX_KEYS` of them or the submission hasn't been persisted yet. This also means concurrent
+    requests answering different questions, or the same question in different add another entries, don't overwrite
+    each other's answers. Adding or removing an add another entry still rewrites that whole container.
+
     NOTE: the submission's status probably needs updating after this; SubmissionHelper owns the status of a submission.
     This interface should only be called by the SubmissionHelper, and it must make sure that the status of the
     submission is updated appropriately (after clearing appropriate caches).
     """
-    # We make a deepcopy here so that if any changes are made to `submission.data_manager.data` after this is flushed,
-    # the changes are not reflected on the submission.
-    submission._data = deepcopy(submission.data_manager.data)
+    data_manager = submission.data_manager
 
     # Bust the DataManager cached property so that it reads the new submission data
     del submission.data_manager
 
+    if not data_manager.has_changes:
+        return
+
+    updated, removed = data_manager.get_changes()
+    if (
+        not inspect(submission).persistent
+        or len(updated) + len(removed) > current_app.config["SUBMISSION_DATA_PATCH_MAX_KEYS"]
+    ):
+        # `data_manager.data` is a new copy of the submission data, so any changes made through the data manager after
+        # this is flushed are not reflected on the submission.
+        submission._data = data_manager.data
+        return
+
+    patched_data: ColumnElement[Any] = Submission._data.expression
+    for path, value in updated.items():
+        patched_data = func.jsonb_set(
+            patched_data, literal(list(path), ARRAY(Text)), literal(value, JSONB), True, type_=JSONB
+        )
+    for path in removed:
+        patched_data = patched_data.op("#-", return_type=JSONB)(literal(list(path), ARRAY(Text)))
+
+    new_data = db.session.execute(
+        update(Submission)
+        .where(Submission.id == submission.id)
+        .values({Submission._data: patched_data})
+        .returning(Submission._data)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+    # Load the patched data (including any keys changed concurrently by other requests) without marking the attribute
+    # as modified, which would have the ORM write the whole blob again on the next flush.
+    set_committed_value(submission, "_data", new_data)
+
 
 @flush_and_rollback_on_exceptions
 def update_submission(
@@ -705,6 +760,142 @@ def get_all_submissions_with_mode_for_collection(
     return db.session.scalars(stmt).unique().all()
 
 
+# How many submissions collection-wide exports hold in memory at once.
+SUBMISSION_EXPORT_CHUNK_SIZE = 200
+
+
+def iter_submissions_with_mode_for_collection(
+    collection: Collection,
+    submission_mode: SubmissionModeEnum,
+    *,
+    chunk_size: int = SUBMISSION_EXPORT_CHUNK_SIZE,
+    submission_ids: Sequence[UUID] | None = None,
+) -> Iterator[Sequence[Submission]]:
+    """
+    Yields a collection's submissions in chunks, ordered by reference, so that collection-wide exports use memory in
+    proportion to `chunk_size` rather than the number of submissions. Pass `submission_ids` to only load some of them.
+
+    Submissions are read through a server-side cursor, with each chunk's events and creators batch-loaded as it's
+    fetched. The schema isn't reloaded for each submission: pass a collection that was loaded with
+    `get_collection(..., with_full_schema=True)` and each submission's `collection` comes from the session.
+
+    Each chunk is expunged from the session when the next one is requested, so callers mustn't hold onto
+    submissions (or anything loaded from them) between chunks.
+    """
+    filters = [Submission.collection_id == collection.id, Submission.mode == submission_mode]
+    if submission_ids is not None:
+        filters.append(Submission.id.in_(submission_ids))
+
+    stmt = (
+        select(Submission)
+        .where(*filters)
+        # Order the same way as Python would sort the references, rather than by the citext collation.
+        .order_by(Submission.reference.cast(Text).collate("C"))
+        .options(
+            selectinload(Submission.events).joinedload(SubmissionEvent.created_by),
+            selectinload(Submission.data_sources),
+            joinedload(Submission.created_by),
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+
+    for chunk in db.session.scalars(stmt).partitions():
+        yield chunk
+
+        for submission in chunk:
+            db.session.expunge(submission)
+
+
+def get_submission_ids_with_mode_for_collection(
+    collection_id: UUID, submission_mode: SubmissionModeEnum
+) -> Sequence[UUID]:
+    """Every submission's ID, in the same order as `iter_submissions_with_mode_for_collection` loads them."""
+    return db.session.scalars(
+        select(Submission.id)
+        .where(Submission.collection_id == collection_id, Submission.mode == submission_mode)
+        .order_by(Submission.reference.cast(Text).collate("C"))
+    ).all()
+
+
+def get_changed_submissions_for_collection(
+    collection_id: UUID,
+    submission_mode: SubmissionModeEnum,
+    *,
+    since: datetime.datetime | None,
+    until: datetime.datetime,
+    after: tuple[datetime.datetime, UUID] | None = None,
+    limit: int,
+) -> Sequence[tuple[UUID, datetime.datetime]]:
+    """
+    The IDs of up to `limit` submissions whose data or events last changed after `since` (or at any time, if it's None)
+    and no later than `until`, along with when they last changed, ordered by that and then ID. Pass the last of these
+    as `after` to get the next page.
+
+    Submissions that have been deleted aren't included, since there's nothing left to say they changed.
+    """
+    changed_at = Submission.last_updated_at_utc
+    filters = [
+        Submission.collection_id == collection_id,
+        Submission.mode == submission_mode,
+        changed_at <= until,
+    ]
+    if since is not None:
+        filters.append(changed_at > since)
+    if after is not None:
+        filters.append(tuple_(changed_at, Submission.id) > tuple_(*after))
+
+    # Anything that's changed since the lower bound has either been updated or had an event added since then. Both of
+    # those can be found from an index, so the exact time each submission changed is only worked out for those.
+    lower_bound = after[0] if after is not None else since
+    if lower_bound is not None:
+        filters.append(
+            Submission.id.in_(
+                union(
+                    select(Submission.id).where(
+                        Submission.collection_id == collection_id,
+                        Submission.mode == submission_mode,
+                        Submission.updated_at_utc >= lower_bound,
+                    ),
+                    select(SubmissionEvent.submission_id).where(SubmissionEvent.created_at_utc >= lower_bound),
+                )
+            )
+        )
+
+    return (
+        db.session.execute(
+            select(Submission.id, changed_at).where(*filters).order_by(changed_at, Submission.id).limit(limit)
+        )
+        .tuples()
+        .all()
+    )
+
+
+def get_max_add_another_counts_for_collection(
+    collection_id: UUID,
+    submission_mode: SubmissionModeEnum,
+    add_another_container_ids: Sequence[UUID],
+) -> dict[UUID, int | None]:
+    """
+    The most entries any submission has for each add another container, worked out in the database so that exports
+    can size their columns without loading every submission first. Counts are None if there are no submissions.
+    """
+    if not add_another_container_ids:
+        return {}
+
+    def _max_count(container_id: UUID) -> ColumnElement[int | None]:
+        entries = Submission._data[str(container_id)]
+        return func.max(
+            func.coalesce(
+                case((func.jsonb_typeof(entries) == "array", func.jsonb_array_length(entries)), else_=None), 0
+            )
+        )
+
+    stmt = select(*[_max_count(container_id) for container_id in add_another_container_ids]).where(
+        Submission.collection_id == collection_id, Submission.mode == submission_mode
+    )
+    return dict(zip(add_another_container_ids, db.session.execute(stmt).one(), strict=True))
+
+
 @dataclass(frozen=True)
 class ListSubmissionData:
     """Lightweight view of a row in the submissions list.
@@ -741,9 +932,10 @@ def get_submission_list_for_collection(
 
     Selects only the columns needed to render the list, deriving the submission name in SQL (via the
     Submission hybrid property) rather than loading the full `data` blob into Python. The last-updated
-    timestamp is derived by left-joining a single pre-aggregated max of event dates per submission,
-    rather than the per-row correlated subquery the `last_updated_at_utc` hybrid would emit. This is a further
-    optimisation for performance, as the correlated subquery can be expensive for large datasets.
+    timestamp is read from the submission's `last_event_at_utc`, falling back to left-joining a single pre-aggregated
+    max of event dates for submissions without one, rather than the per-row correlated subquery the
+    `last_updated_at_utc` hybrid would emit. This is a further optimisation for performance, as the correlated
+    subquery can be expensive for large datasets.
 
     Rows are ordered by organisation name, then by submission name for multiple-submission collections.
     """
@@ -755,13 +947,21 @@ def get_submission_list_for_collection(
             func.max(SubmissionEvent.created_at_utc).label("max_created_at_utc"),
         )
         .join(Submission, Submission.id == SubmissionEvent.submission_id)
-        .where(Submission.collection_id == collection.id, Submission.mode == submission_mode)
+        .where(
+            Submission.collection_id == collection.id,
+            Submission.mode == submission_mode,
+            Submission.last_event_at_utc.is_(None),
+        )
         .group_by(SubmissionEvent.submission_id)
         .subquery()
     )
-    last_updated_at_utc = func.greatest(Submission.updated_at_utc, latest_event.c.max_created_at_utc).label(
-        "last_updated_at_utc"
-    )
+    last_updated_at_utc = func.greatest(
+        Submission.updated_at_utc,
+        func.coalesce(
+            Submission.last_event_at_utc,
+            latest_event.c.max_created_at_utc,
+        ),
+    ).label("last_updated_at_utc")
 
     grant_recipient_mode = GrantRecipientModeEnum.from_similar(submission_mode)
     name_column = Submission.name.label("name") if collection.allow_multiple_submissions else null().label("name")
@@ -2032,6 +2232,8 @@ def _add_submission_event(
             data=SubmissionEventHelper.event_from(event_type, **kwargs),
         )
     )
+    # The same `now()` the event's `created_at_utc` defaults to, as both are written in this transaction.
+    submission.last_event_at_utc = func.now()
 
     match event_type:
         case SubmissionEventType.SUBMISSION_SENT_FOR_CERTIFICATION:
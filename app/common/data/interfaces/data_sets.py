@@ -1,10 +1,14 @@
 import datetime
+import hashlib
+import json
 import uuid
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from decimal import Decimal
+from itertools import batched
+from typing import Any
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import aliased, lazyload, selectinload
 from sqlalchemy.orm.attributes import flag_modified
@@ -31,6 +35,8 @@ from app.deliver_grant_funding.session_models import DataSetColumnMapping
 from app.extensions import db, s3_service
 from app.types import NOT_PROVIDED, TNotProvided
 
+DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE = 1000
+
 
 def get_data_source(
     data_source_id: uuid.UUID,
@@ -119,6 +125,17 @@ def _build_data_blob(
     }
 
 
+def _insert_organisation_items(items: Iterable[dict[str, Any]], *, batch_size: int) -> None:
+    # A multi-row INSERT per batch rather than an ORM object per row, which is much quicker for data sets covering
+    # every grant recipient.
+    for batch in batched(items, batch_size, strict=False):
+        db.session.execute(insert(DataSourceOrganisationItem).values(batch))
+
+
+def _hash_data_blob(data: dict[str, str | int | None]) -> bytes:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).digest()
+
+
 def _create_organisation_items(
     data_source: DataSource,
     all_rows: TUnvalidatedDataSetRows,
@@ -126,14 +143,103 @@ def _create_organisation_items(
     identifier_columns: list[str],
 ) -> None:
     mappings = {m.column_name: m for m in column_mappings}
-    for row in all_rows:
-        item = DataSourceOrganisationItem(
-            data_source_id=data_source.id,
-            external_id=row.get(DATA_SET_EXTERNAL_ID_COLUMN_HEADER, "").strip(),
-            _data=_build_data_blob(row, mappings, identifier_columns),
+
+    # The data source has to be written first for the items to point at.
+    db.session.flush()
+    _insert_organisation_items(
+        (
+            {
+                "data_source_id": data_source.id,
+                "external_id": row.get(DATA_SET_EXTERNAL_ID_COLUMN_HEADER, "").strip(),
+                "_data": _build_data_blob(row, mappings, identifier_columns),
+            }
+            for row in all_rows
+        ),
+        batch_size=DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE,
+    )
+
+    # The session didn't see the items being written, so load them from the database if they're needed.
+    db.session.expire(data_source, ["organisation_items"])
+
+
+@dataclass(frozen=True)
+class DataSourceReplacementSummary:
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+def _replace_organisation_items(
+    data_source: DataSource,
+    all_rows: TUnvalidatedDataSetRows,
+    column_mappings: list[DataSetColumnMapping],
+    identifier_columns: list[str],
+) -> DataSourceReplacementSummary:
+    """
+    Brings the data source's items in line with the rows, matching them up by external ID. Only rows that are new or
+    whose data has changed are written, and items for rows that have gone are deleted; the rest are left alone.
+    """
+    mappings = {m.column_name: m for m in column_mappings}
+
+    # Only a hash of each item's data is kept to compare against, rather than the items themselves.
+    existing_items = {
+        external_id: (item_id, _hash_data_blob(data))
+        for item_id, external_id, data in db.session.execute(
+            select(
+                DataSourceOrganisationItem.id,
+                DataSourceOrganisationItem.external_id,
+                DataSourceOrganisationItem._data,
+            ).where(DataSourceOrganisationItem.data_source_id == data_source.id)
         )
-        data_source.organisation_items.append(item)
-        db.session.add(item)
+    }
+
+    seen_external_ids: set[str] = set()
+    items_to_insert: list[dict[str, Any]] = []
+    items_to_update: list[dict[str, Any]] = []
+    added = updated = unchanged = 0
+
+    for row in all_rows:
+        external_id = row.get(DATA_SET_EXTERNAL_ID_COLUMN_HEADER, "").strip()
+        if external_id in seen_external_ids:
+            raise DuplicateDataSourceItemError(f"Duplicate external ID in data set: {external_id}")
+        seen_external_ids.add(external_id)
+
+        data = _build_data_blob(row, mappings, identifier_columns)
+        if (existing_item := existing_items.get(external_id)) is None:
+            items_to_insert.append({"data_source_id": data_source.id, "external_id": external_id, "_data": data})
+        elif existing_item[1] != _hash_data_blob(data):
+            items_to_update.append({"id": existing_item[0], "_data": data})
+        else:
+            unchanged += 1
+
+        if len(items_to_insert) >= DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE:
+            _insert_organisation_items(items_to_insert, batch_size=DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE)
+            added += len(items_to_insert)
+            items_to_insert = []
+        if len(items_to_update) >= DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE:
+            db.session.execute(update(DataSourceOrganisationItem), items_to_update)
+            updated += len(items_to_update)
+            items_to_update = []
+
+    if items_to_insert:
+        _insert_organisation_items(items_to_insert, batch_size=DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE)
+        added += len(items_to_insert)
+    if items_to_update:
+        db.session.execute(update(DataSourceOrganisationItem), items_to_update)
+        updated += len(items_to_update)
+
+    removed_item_ids = [
+        item_id for external_id, (item_id, _) in existing_items.items() if external_id not in seen_external_ids
+    ]
+    for batch in batched(removed_item_ids, DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE, strict=False):
+        db.session.execute(delete(DataSourceOrganisationItem).where(DataSourceOrganisationItem.id.in_(batch)))
+
+    db.session.expire(data_source, ["organisation_items"])
+
+    return DataSourceReplacementSummary(
+        added=added, updated=updated, removed=len(removed_item_ids), unchanged=unchanged
+    )
 
 
 @flush_and_rollback_on_exceptions(coerce_exceptions=[(IntegrityError, DuplicateDataSourceItemError)])
@@ -183,7 +289,7 @@ def replace_uploaded_data_source(
     original_filename: str,
     user: User,
     name: str | TNotProvided = NOT_PROVIDED,
-) -> DataSource:
+) -> DataSourceReplacementSummary:
 
     data_source.updated_by = user
 
@@ -210,15 +316,7 @@ def replace_uploaded_data_source(
         for schema_column in data_source.schema.ordered_values()  # ty:ignore[unresolved-attribute]
     ]
 
-    # delete all existing data source org items as the IDs aren't referenced, just column names
-    stmt = delete(DataSourceOrganisationItem).where(DataSourceOrganisationItem.data_source_id == data_source.id)
-    db.session.execute(stmt)
-    data_source.organisation_items.clear()
-
-    # create all new org items with the updated data
-    _create_organisation_items(data_source, all_rows, all_column_mappings, DATA_SET_IDENTIFIER_COLUMN_HEADERS)
-
-    return data_source
+    return _replace_organisation_items(data_source, all_rows, all_column_mappings, DATA_SET_IDENTIFIER_COLUMN_HEADERS)
 
 
 @flush_and_rollback_on_exceptions
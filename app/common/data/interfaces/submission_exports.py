@@ -0,0 +1,218 @@
+import datetime
+import re
+import uuid
+from typing import Any
+
+from sqlalchemy import and_, func, or_, select, text, update
+
+from app.common.data.interfaces.exceptions import flush_and_rollback_on_exceptions
+from app.common.data.models import (
+    Collection,
+    Component,
+    Expression,
+    Form,
+    GrantRecipient,
+    Organisation,
+    Submission,
+    SubmissionEvent,
+    SubmissionExportJob,
+)
+from app.common.data.models_user import User
+from app.common.data.types import SubmissionExportFormatEnum, SubmissionExportJobStatusEnum, SubmissionModeEnum
+from app.extensions import db
+
+
+@flush_and_rollback_on_exceptions
+def create_submission_export_job(
+    collection: Collection,
+    *,
+    submission_mode: SubmissionModeEnum,
+    export_format: SubmissionExportFormatEnum,
+    requested_by: User,
+) -> SubmissionExportJob:
+    job = SubmissionExportJob(
+        collection=collection,
+        submission_mode=submission_mode,
+        export_format=export_format,
+        requested_by=requested_by,
+    )
+    db.session.add(job)
+    return job
+
+
+def get_submission_export_job(job_id: uuid.UUID, *, collection_id: uuid.UUID) -> SubmissionExportJob:
+    return db.session.scalars(
+        select(SubmissionExportJob).where(
+            SubmissionExportJob.id == job_id, SubmissionExportJob.collection_id == collection_id
+        )
+    ).one()
+
+
+def get_latest_submission_export_job(
+    collection_id: uuid.UUID, *, submission_mode: SubmissionModeEnum, requested_by: User
+) -> SubmissionExportJob | None:
+    return db.session.scalar(
+        select(SubmissionExportJob)
+        .where(
+            SubmissionExportJob.collection_id == collection_id,
+            SubmissionExportJob.submission_mode == submission_mode,
+            SubmissionExportJob.requested_by_id == requested_by.id,
+        )
+        .order_by(SubmissionExportJob.created_at_utc.desc())
+        .limit(1)
+    )
+
+
+@flush_and_rollback_on_exceptions
+def claim_next_submission_export_job(*, stale_after: datetime.timedelta) -> SubmissionExportJob | None:
+    """
+    Marks the oldest waiting export job as in progress and returns it, or None if there's nothing to do. Jobs that
+    have been in progress for longer than `stale_after` without being updated are assumed to belong to a worker that
+    died, and are claimed again.
+
+    `SKIP LOCKED` lets any number of workers poll for jobs at the same time: each one skips over rows that another is
+    in the middle of claiming rather than waiting for it, so a job is only ever claimed once. Callers should commit
+    the claim straight away so that other workers can see it.
+    """
+    job = db.session.scalar(
+        select(SubmissionExportJob)
+        .where(
+            or_(
+                SubmissionExportJob.status == SubmissionExportJobStatusEnum.PENDING,
+                and_(
+                    SubmissionExportJob.status == SubmissionExportJobStatusEnum.IN_PROGRESS,
+                    SubmissionExportJob.updated_at_utc < func.now() - stale_after,
+                ),
+            )
+        )
+        .order_by(SubmissionExportJob.created_at_utc)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if job is None:
+        return None
+
+    job.status = SubmissionExportJobStatusEnum.IN_PROGRESS
+    job.submissions_exported = 0
+    job.attempts += 1
+    job.total_submissions = db.session.scalar(
+        select(func.count(Submission.id)).where(
+            Submission.collection_id == job.collection_id, Submission.mode == job.submission_mode
+        )
+    )
+    return job
+
+
+def update_submission_export_job_progress(job_id: uuid.UUID, *, submissions_exported: int) -> None:
+    # This runs on its own connection and commits straight away so that progress is visible to anyone polling the job,
+    # while the export itself is still reading submissions in its (long-running) transaction.
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(SubmissionExportJob)
+            .where(SubmissionExportJob.id == job_id)
+            .values(submissions_exported=submissions_exported, updated_at_utc=func.now())
+        )
+
+
+@flush_and_rollback_on_exceptions
+def complete_submission_export_job(job: SubmissionExportJob, *, s3_key: str, submissions_exported: int) -> None:
+    job.status = SubmissionExportJobStatusEnum.COMPLETED
+    job.s3_key = s3_key
+    job.submissions_exported = submissions_exported
+    job.completed_at_utc = func.now()
+
+
+@flush_and_rollback_on_exceptions
+def fail_submission_export_job(job: SubmissionExportJob) -> None:
+    job.status = SubmissionExportJobStatusEnum.FAILED
+    job.completed_at_utc = func.now()
+
+
+def begin_submission_export_snapshot() -> str:
+    """
+    Starts the session's transaction at `REPEATABLE READ`, so that everything read in it comes from one snapshot of
+    the database, and exports that snapshot so that other processes can read from it too (see
+    `use_submission_export_snapshot`). Call this before anything else is read in the transaction, and keep the
+    transaction open until the other processes have started using the snapshot.
+    """
+    db.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return db.session.execute(select(func.pg_export_snapshot())).scalar_one()
+
+
+def use_submission_export_snapshot(snapshot_id: str) -> None:
+    """Has the session's transaction read from a snapshot exported by `begin_submission_export_snapshot`."""
+    # Postgres doesn't take parameters for `SET TRANSACTION`, so make sure this is a snapshot ID before including it.
+    if not re.fullmatch(r"[0-9A-F]+(-[0-9A-F]+)+", snapshot_id):
+        raise ValueError(f"Invalid snapshot ID: {snapshot_id!r}")
+
+    db.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    db.session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+
+
+def get_submission_export_watermark(
+    collection_id: uuid.UUID, *, submission_mode: SubmissionModeEnum
+) -> tuple[Any, ...]:
+    """
+    Returns values that change whenever any of a collection's submissions (in the given mode) are added, removed or
+    changed, or any of the organisations or users named in an export of them are, or the collection's forms, components
+    or expressions are, so that exports generated from them can be cached until they do.
+
+    The latest `updated_at_utc` on its own isn't enough: it's the time the updating transaction started, so a slow
+    transaction can commit a change that's older than one already seen. Summing every row's timestamp catches that,
+    and the count catches rows being deleted.
+    """
+    submissions = select(Submission.id).where(
+        Submission.collection_id == collection_id, Submission.mode == submission_mode
+    )
+    latest_event_at = (
+        select(func.max(SubmissionEvent.created_at_utc))
+        .where(SubmissionEvent.submission_id.in_(submissions))
+        .scalar_subquery()
+    )
+    organisations = (
+        select(func.max(Organisation.updated_at_utc), func.sum(func.extract("epoch", Organisation.updated_at_utc)))
+        .join(GrantRecipient, GrantRecipient.organisation_id == Organisation.id)
+        .where(
+            GrantRecipient.id.in_(
+                select(Submission.grant_recipient_id).where(
+                    Submission.collection_id == collection_id, Submission.mode == submission_mode
+                )
+            )
+        )
+    )
+    # Submission creators and anyone who has acted on a submission, which includes its certifier.
+    users = select(func.max(User.updated_at_utc), func.sum(func.extract("epoch", User.updated_at_utc))).where(
+        User.id.in_(
+            select(Submission.created_by_id)
+            .where(Submission.collection_id == collection_id, Submission.mode == submission_mode)
+            .union(select(SubmissionEvent.created_by_id).where(SubmissionEvent.submission_id.in_(submissions)))
+        )
+    )
+
+    forms = select(Form.id).where(Form.collection_id == collection_id)
+    components = select(Component.id).where(Component.form_id.in_(forms))
+    schema = [
+        select(
+            func.count(model.id), func.max(model.updated_at_utc), func.sum(func.extract("epoch", model.updated_at_utc))
+        ).where(criterion)
+        for model, criterion in [
+            (Form, Form.collection_id == collection_id),
+            (Component, Component.id.in_(components)),
+            (Expression, Expression.question_id.in_(components)),
+        ]
+    ]
+
+    watermark = db.session.execute(
+        select(
+            func.count(Submission.id),
+            func.max(Submission.updated_at_utc),
+            func.sum(func.extract("epoch", Submission.updated_at_utc)),
+            latest_event_at,
+        ).where(Submission.collection_id == collection_id, Submission.mode == submission_mode)
+    ).one()
+    return (
+        *watermark,
+        *db.session.execute(organisations).one(),
+        *db.session.execute(users).one(),
+        *(value for query in schema for value in db.session.execute(query).one()),
+    )
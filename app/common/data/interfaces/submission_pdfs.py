@@ -0,0 +1,28 @@
+from sqlalchemy import select
+
+from app.common.data.interfaces.exceptions import flush_and_rollback_on_exceptions
+from app.common.data.models import Submission, SubmissionPdfJob
+from app.extensions import db
+
+
+@flush_and_rollback_on_exceptions
+def create_submission_pdf_job(submission: Submission) -> SubmissionPdfJob:
+    job = SubmissionPdfJob(submission=submission)
+    db.session.add(job)
+    return job
+
+
+def claim_next_submission_pdf_job() -> SubmissionPdfJob | None:
+    """
+    Returns the oldest waiting job, or None if there's nothing to do. It stays locked until the end of the
+    transaction, so the caller should delete it and commit before rendering; `SKIP LOCKED` stops any other worker
+    claiming it in the meantime.
+    """
+    return db.session.scalar(
+        select(SubmissionPdfJob).order_by(SubmissionPdfJob.created_at_utc).limit(1).with_for_update(skip_locked=True)
+    )
+
+
+@flush_and_rollback_on_exceptions
+def delete_submission_pdf_job(job: SubmissionPdfJob) -> None:
+    db.session.delete(job)
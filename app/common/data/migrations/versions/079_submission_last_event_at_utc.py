@@ -0,0 +1,25 @@
+"""Add last_event_at_utc column to submission table
+
+Revision ID: 079_submission_last_event_at_utc
+Revises: 078_add_collection_id_magic_link
+Create Date: 2026-10-17 14:03:27.118402
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "079_submission_last_event_at_utc"
+down_revision = "078_add_collection_id_magic_link"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("last_event_at_utc", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.drop_column("last_event_at_utc")
@@ -0,0 +1,67 @@
+"""Add submission_export_job table
+
+Revision ID: 080_submission_export_jobs
+Revises: 079_submission_last_event_at_utc
+Create Date: 2026-10-17 15:22:09.641873
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "080_submission_export_jobs"
+down_revision = "079_submission_last_event_at_utc"
+branch_labels = None
+depends_on = None
+
+submission_mode_enum = postgresql.ENUM("TEST", "PREVIEW", "LIVE", name="submission_mode_enum", create_type=False)
+submission_export_format_enum = postgresql.ENUM(
+    "CSV", "JSON", "NDJSON", name="submission_export_format_enum", create_type=False
+)
+submission_export_job_status_enum = postgresql.ENUM(
+    "PENDING", "IN_PROGRESS", "COMPLETED", "FAILED", name="submission_export_job_status_enum", create_type=False
+)
+
+
+def upgrade() -> None:
+    submission_export_format_enum.create(op.get_bind())
+    submission_export_job_status_enum.create(op.get_bind())
+    op.create_table(
+        "submission_export_job",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at_utc", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("collection_id", sa.Uuid(), nullable=False),
+        sa.Column("submission_mode", submission_mode_enum, nullable=False),
+        sa.Column("export_format", submission_export_format_enum, nullable=False),
+        sa.Column("status", submission_export_job_status_enum, nullable=False),
+        sa.Column("requested_by_id", sa.Uuid(), nullable=False),
+        sa.Column("total_submissions", sa.Integer(), nullable=True),
+        sa.Column("submissions_exported", sa.Integer(), nullable=False),
+        sa.Column("s3_key", sa.String(), nullable=True),
+        sa.Column("completed_at_utc", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["collection_id"],
+            ["collection.id"],
+            name=op.f("fk_submission_export_job_collection_id_collection"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["requested_by_id"], ["user.id"], name=op.f("fk_submission_export_job_requested_by_id_user")
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_submission_export_job")),
+    )
+    with op.batch_alter_table("submission_export_job", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_submission_export_job_status_created_at_utc", ["status", "created_at_utc"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission_export_job", schema=None) as batch_op:
+        batch_op.drop_index("ix_submission_export_job_status_created_at_utc")
+
+    op.drop_table("submission_export_job")
+    submission_export_job_status_enum.drop(op.get_bind())
+    submission_export_format_enum.drop(op.get_bind())
@@ -0,0 +1,39 @@
+"""Add XLSX to submission_export_format_enum
+
+Revision ID: 081_xlsx_submission_exports
+Revises: 080_submission_export_jobs
+Create Date: 2026-10-17 16:40:51.208317
+
+"""
+
+from alembic import op
+from alembic_postgresql_enum import TableReference
+
+revision = "081_xlsx_submission_exports"
+down_revision = "080_submission_export_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.sync_enum_values(  # ty: ignore[unresolved-attribute]
+        enum_schema="public",
+        enum_name="submission_export_format_enum",
+        new_values=["CSV", "JSON", "NDJSON", "XLSX"],
+        affected_columns=[
+            TableReference(table_schema="public", table_name="submission_export_job", column_name="export_format")
+        ],
+        enum_values_to_rename=[],
+    )
+
+
+def downgrade() -> None:
+    op.sync_enum_values(  # ty: ignore[unresolved-attribute]
+        enum_schema="public",
+        enum_name="submission_export_format_enum",
+        new_values=["CSV", "JSON", "NDJSON"],
+        affected_columns=[
+            TableReference(table_schema="public", table_name="submission_export_job", column_name="export_format")
+        ],
+        enum_values_to_rename=[],
+    )
@@ -0,0 +1,34 @@
+"""Index submissions and submission events by when they changed
+
+Revision ID: 082_submission_changes_indexes
+Revises: 081_xlsx_submission_exports
+Create Date: 2026-10-17 17:52:13.604180
+
+"""
+
+from alembic import op
+
+revision = "082_submission_changes_indexes"
+down_revision = "081_xlsx_submission_exports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_submission_collection_id_mode_updated_at_utc",
+            ["collection_id", "mode", "updated_at_utc"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("submission_event", schema=None) as batch_op:
+        batch_op.create_index("ix_submission_event_created_at_utc", ["created_at_utc"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission_event", schema=None) as batch_op:
+        batch_op.drop_index("ix_submission_event_created_at_utc")
+
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.drop_index("ix_submission_collection_id_mode_updated_at_utc")
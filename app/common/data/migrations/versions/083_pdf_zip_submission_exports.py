@@ -0,0 +1,39 @@
+"""Add PDF_ZIP to submission_export_format_enum
+
+Revision ID: 083_pdf_zip_submission_exports
+Revises: 082_submission_changes_indexes
+Create Date: 2026-10-17 19:12:37.504918
+
+"""
+
+from alembic import op
+from alembic_postgresql_enum import TableReference
+
+revision = "083_pdf_zip_submission_exports"
+down_revision = "082_submission_changes_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.sync_enum_values(  # ty: ignore[unresolved-attribute]
+        enum_schema="public",
+        enum_name="submission_export_format_enum",
+        new_values=["CSV", "JSON", "NDJSON", "XLSX", "PDF_ZIP"],
+        affected_columns=[
+            TableReference(table_schema="public", table_name="submission_export_job", column_name="export_format")
+        ],
+        enum_values_to_rename=[],
+    )
+
+
+def downgrade() -> None:
+    op.sync_enum_values(  # ty: ignore[unresolved-attribute]
+        enum_schema="public",
+        enum_name="submission_export_format_enum",
+        new_values=["CSV", "JSON", "NDJSON", "XLSX"],
+        affected_columns=[
+            TableReference(table_schema="public", table_name="submission_export_job", column_name="export_format")
+        ],
+        enum_values_to_rename=[],
+    )
@@ -0,0 +1,41 @@
+"""Add submission_pdf_job table
+
+Revision ID: 084_submission_pdf_jobs
+Revises: 083_pdf_zip_submission_exports
+Create Date: 2026-10-17 20:03:45.118204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "084_submission_pdf_jobs"
+down_revision = "083_pdf_zip_submission_exports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "submission_pdf_job",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at_utc", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("submission_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["submission_id"],
+            ["submission.id"],
+            name=op.f("fk_submission_pdf_job_submission_id_submission"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_submission_pdf_job")),
+    )
+    with op.batch_alter_table("submission_pdf_job", schema=None) as batch_op:
+        batch_op.create_index("ix_submission_pdf_job_created_at_utc", ["created_at_utc"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission_pdf_job", schema=None) as batch_op:
+        batch_op.drop_index("ix_submission_pdf_job_created_at_utc")
+
+    op.drop_table("submission_pdf_job")
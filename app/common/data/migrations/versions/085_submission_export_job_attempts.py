@@ -0,0 +1,25 @@
+"""Add attempts column to submission_export_job table
+
+Revision ID: 085_submission_export_job_attempts
+Revises: 084_submission_pdf_jobs
+Create Date: 2026-10-17 22:41:07.362915
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "085_submission_export_job_attempts"
+down_revision = "084_submission_pdf_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("submission_export_job", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("attempts", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission_export_job", schema=None) as batch_op:
+        batch_op.drop_column("attempts")
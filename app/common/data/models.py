@@ -30,7 +30,15 @@ from sqlalchemy.dialects.postgresql import CITEXT, JSONB
 from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.ext.orderinglist import OrderingList, ordering_list
-from sqlalchemy.orm import Mapped, aliased, column_property, foreign, mapped_column, relationship, remote
+from sqlalchemy.orm import (
+    Mapped,
+    aliased,
+    column_property,
+    foreign,
+    mapped_column,
+    relationship,
+    remote,
+)
 from sqlalchemy_json import mutable_json_type
 
 from app.common.collections.types import DataSourceAnswerTypes, DecimalAnswer, IntegerAnswer, TextSingleLineAnswer
@@ -67,6 +75,8 @@ from app.common.data.types import (
     RoleEnum,
     SubmissionAssessmentStatusEnum,
     SubmissionEventType,
+    SubmissionExportFormatEnum,
+    SubmissionExportJobStatusEnum,
     SubmissionModeEnum,
     SubmissionStatusEnum,
     json_flat_scalars,
@@ -87,6 +97,7 @@ from app.common.utils import comma_join_items
 
 if TYPE_CHECKING:
     from app.common.expressions.managed import ManagedExpression
+    from app.common.helpers.collection_plan import CollectionPlan
 
 
 class Grant(BaseModel):
@@ -485,6 +496,19 @@ class Collection(BaseModel):
     def get_section_names_from_ids(self, form_ids: list[str]) -> list[str]:
         return [form.title for form in self.forms if str(form.id) in form_ids]
 
+    def clear_caches(self):
+        for attr, value in self.__class__.__dict__.items():
+            if isinstance(value, cached_property):
+                if attr in self.__dict__:
+                    del self.__dict__[attr]
+
+    @cached_property
+    def cached_plan(self) -> CollectionPlan:
+        """The flattened form of this collection's schema, shared by every submission helper for this instance."""
+        from app.common.helpers.collection_plan import CollectionPlan
+
+        return CollectionPlan.build(self)
+
 
 class Submission(BaseModel):
     __tablename__ = "submission"
@@ -537,6 +561,10 @@ class Submission(BaseModel):
         default=SubmissionAssessmentStatusEnum.NOT_STARTED,
     )
 
+    # When the latest event was added, kept up to date by `_add_submission_event` so that pages listing many submissions
+    # don't need to aggregate all of their events. Null for submissions with no events since it was introduced.
+    last_event_at_utc: Mapped[datetime.datetime | None] = mapped_column(default=None)
+
     @hybrid_property
     def last_updated_at_utc(self) -> datetime.datetime:
         from app.common.helpers.submission_events import SubmissionEventHelper
@@ -547,22 +575,30 @@ class Submission(BaseModel):
     @last_updated_at_utc.inplace.expression
     @classmethod
     def _last_updated_at_utc_expression(cls) -> ColumnElement[datetime.datetime]:
-        # Postgres GREATEST ignores NULLs, so this falls back to updated_at_utc when there are no events.
+        # Postgres GREATEST ignores NULLs, so this falls back to updated_at_utc when there are no events. The events are
+        # only aggregated for submissions that haven't recorded their latest event yet.
         return func.greatest(
             cls.updated_at_utc,
-            select(func.max(SubmissionEvent.created_at_utc))
-            .where(SubmissionEvent.submission_id == cls.id)
-            .correlate(cls)
-            .scalar_subquery(),
+            func.coalesce(
+                cls.last_event_at_utc,
+                select(func.max(SubmissionEvent.created_at_utc))
+                .where(SubmissionEvent.submission_id == cls.id)
+                .correlate(cls)
+                .scalar_subquery(),
+            ),
         )
 
     @property
     def s3_key_prefix(self) -> str:
         return f"{current_app.config['SUBMISSION_FILES_PREFIX']}/{self.mode}/{self.collection_id}/{self.id}"
 
+    @property
+    def pdfs_s3_key_prefix(self) -> str:
+        return f"{self.s3_key_prefix}/pdfs/"
+
     @cached_property
     def data_manager(self) -> SubmissionDataManager:
-        """Copies the existing submission data and wrap it in a helper to update answers.
+        """Wraps the existing submission data in a helper to read and update answers, without modifying it in place.
 
         Use this to add/edit/remove answers from the submission. Changes must be synced back onto the submission model
         using the `update_submission_data` interface.
@@ -678,6 +714,8 @@ class Submission(BaseModel):
             "mode = 'PREVIEW' OR grant_recipient_id IS NOT NULL",
             name="ck_grant_recipient_if_live",
         ),
+        # Finds the submissions that have changed recently for `get_changed_submissions_for_collection`.
+        Index("ix_submission_collection_id_mode_updated_at_utc", "collection_id", "mode", "updated_at_utc"),
     )
 
     def __repr__(self) -> str:
@@ -1204,6 +1242,57 @@ class SubmissionEvent(BaseModel):
     created_by_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
     created_by: Mapped[User] = relationship("User")
 
+    __table_args__ = (Index("ix_submission_event_created_at_utc", "created_at_utc"),)
+
+
+class SubmissionExportJob(BaseModel):
+    """
+    A request to export all of a collection's submissions in the background, which is picked up by whichever worker
+    claims it first. See `app.common.helpers.submission_exports`.
+    """
+
+    __tablename__ = "submission_export_job"
+
+    collection_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("collection.id", ondelete="CASCADE"))
+    collection: Mapped[Collection] = relationship("Collection")
+
+    submission_mode: Mapped[SubmissionModeEnum] = mapped_column(
+        SqlEnum(SubmissionModeEnum, name="submission_mode_enum", validate_strings=True)
+    )
+    export_format: Mapped[SubmissionExportFormatEnum] = mapped_column(
+        SqlEnum(SubmissionExportFormatEnum, name="submission_export_format_enum", validate_strings=True)
+    )
+    status: Mapped[SubmissionExportJobStatusEnum] = mapped_column(
+        SqlEnum(SubmissionExportJobStatusEnum, name="submission_export_job_status_enum", validate_strings=True),
+        default=SubmissionExportJobStatusEnum.PENDING,
+    )
+
+    requested_by_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    requested_by: Mapped[User] = relationship("User")
+
+    total_submissions: Mapped[int | None]
+    submissions_exported: Mapped[int] = mapped_column(default=0)
+    # How many times a worker has claimed the job, so that one that keeps killing workers is eventually given up on.
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    s3_key: Mapped[str | None]
+    completed_at_utc: Mapped[datetime.datetime | None]
+
+    __table_args__ = (Index("ix_submission_export_job_status_created_at_utc", "status", "created_at_utc"),)
+
+
+class SubmissionPdfJob(BaseModel):
+    """
+    A request to render a submission's PDFs ahead of them being downloaded, queued when it's submitted and removed
+    once they've been rendered. See `app.common.helpers.submission_pdfs`.
+    """
+
+    __tablename__ = "submission_pdf_job"
+
+    submission_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("submission.id", ondelete="CASCADE"))
+    submission: Mapped[Submission] = relationship("Submission")
+
+    __table_args__ = (Index("ix_submission_pdf_job_created_at_utc", "created_at_utc"),)
+
 
 class Expression(BaseModel):
     __tablename__ = "expression"
@@ -1,3 +1,5 @@
+import uuid
+from collections.abc import Mapping
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any
 
@@ -21,34 +23,74 @@ from app.common.data.types import NumberTypeEnum, QuestionDataType
 
 if TYPE_CHECKING:
     from app.common.data.models import Component, Question
+    from app.common.helpers.collection_plan import CollectionPlan
+
+
+# Building a `TypeAdapter` is relatively expensive (it generates a validator for the type), so build one per answer type
+# up front rather than one per answer read.
+_ANSWER_TYPE_ADAPTERS: dict[tuple[QuestionDataType, NumberTypeEnum | None], TypeAdapter[Any]] = {
+    (QuestionDataType.TEXT_SINGLE_LINE, None): TypeAdapter(TextSingleLineAnswer),
+    (QuestionDataType.URL, None): TypeAdapter(UrlAnswer),
+    (QuestionDataType.EMAIL, None): TypeAdapter(EmailAnswer),
+    (QuestionDataType.TEXT_MULTI_LINE, None): TypeAdapter(TextMultiLineAnswer),
+    (QuestionDataType.NUMBER, NumberTypeEnum.INTEGER): TypeAdapter(IntegerAnswer),
+    (QuestionDataType.NUMBER, NumberTypeEnum.DECIMAL): TypeAdapter(DecimalAnswer),
+    (QuestionDataType.YES_NO, None): TypeAdapter(YesNoAnswer),
+    (QuestionDataType.RADIOS, None): TypeAdapter(SingleChoiceFromListAnswer),
+    (QuestionDataType.CHECKBOXES, None): TypeAdapter(MultipleChoiceFromListAnswer),
+    (QuestionDataType.DATE, None): TypeAdapter(DateAnswer),
+    (QuestionDataType.FILE_UPLOAD, None): TypeAdapter(FileUploadAnswer),
+}
+
+
+def _get_answer_type_adapter(
+    data_type: QuestionDataType | None, number_type: NumberTypeEnum | None
+) -> TypeAdapter[AllAnswerTypes]:
+    if data_type == QuestionDataType.NUMBER:
+        number_type = NumberTypeEnum.DECIMAL if number_type == NumberTypeEnum.DECIMAL else NumberTypeEnum.INTEGER
+    else:
+        number_type = None
+
+    if data_type is None or (adapter := _ANSWER_TYPE_ADAPTERS.get((data_type, number_type))) is None:
+        raise ValueError(f"Could not deserialise data for question type={data_type}")
+
+    return adapter
 
 
 def _deserialise_question_type(question: Question, serialised_data: str | int | float | bool) -> AllAnswerTypes:
-    match question.data_type:
-        case QuestionDataType.TEXT_SINGLE_LINE:
-            return TypeAdapter(TextSingleLineAnswer).validate_python(serialised_data)
-        case QuestionDataType.URL:
-            return TypeAdapter(UrlAnswer).validate_python(serialised_data)
-        case QuestionDataType.EMAIL:
-            return TypeAdapter(EmailAnswer).validate_python(serialised_data)
-        case QuestionDataType.TEXT_MULTI_LINE:
-            return TypeAdapter(TextMultiLineAnswer).validate_python(serialised_data)
-        case QuestionDataType.NUMBER:
-            if question.data_options.number_type == NumberTypeEnum.DECIMAL:
-                return TypeAdapter(DecimalAnswer).validate_python(serialised_data)
-            return TypeAdapter(IntegerAnswer).validate_python(serialised_data)
-        case QuestionDataType.YES_NO:
-            return TypeAdapter(YesNoAnswer).validate_python(serialised_data)
-        case QuestionDataType.RADIOS:
-            return TypeAdapter(SingleChoiceFromListAnswer).validate_python(serialised_data)
-        case QuestionDataType.CHECKBOXES:
-            return TypeAdapter(MultipleChoiceFromListAnswer).validate_python(serialised_data)
-        case QuestionDataType.DATE:
-            return TypeAdapter(DateAnswer).validate_python(serialised_data)
-        case QuestionDataType.FILE_UPLOAD:
-            return TypeAdapter(FileUploadAnswer).validate_python(serialised_data)
-
-    raise ValueError(f"Could not deserialise data for question type={question.data_type}")
+    return _get_answer_type_adapter(question.data_type, question.number_type).validate_python(serialised_data)
+
+
+def deserialise_all(
+    collection_plan: CollectionPlan, data: Mapping[str, Any]
+) -> dict[tuple[uuid.UUID, int | None], AllAnswerTypes]:
+    """Decodes every answer in a submission's data in one pass, keyed by question ID and add another index.
+
+    Answers to questions that aren't in the collection plan (eg ones that have since been deleted) are skipped.
+    """
+    answers: dict[tuple[uuid.UUID, int | None], AllAnswerTypes] = {}
+
+    for key, value in data.items():
+        if value is None or (component := collection_plan.components.get(uuid.UUID(key))) is None:
+            continue
+
+        if component.is_question and component.add_another_container_id is None:
+            answers[(component.id, None)] = _get_answer_type_adapter(
+                component.data_type, component.number_type
+            ).validate_python(value)
+
+        elif component.add_another_container_id == component.id:
+            for add_another_index, entry in enumerate(value):
+                for question_key, raw_answer in entry.items():
+                    question = collection_plan.components.get(uuid.UUID(question_key))
+                    if raw_answer is None or question is None or question.add_another_container_id != component.id:
+                        continue
+
+                    answers[(question.id, add_another_index)] = _get_answer_type_adapter(
+                        question.data_type, question.number_type
+                    ).validate_python(raw_answer)
+
+    return answers
 
 
 class SubmissionDataAddAnotherIndexInvalid(ValueError):
@@ -56,11 +98,18 @@ class SubmissionDataAddAnotherIndexInvalid(ValueError):
         super().__init__(message)
 
 
+_REMOVED = object()
+
+
 class SubmissionDataManager:
     """A helper to handle creating/updating/deleting answers in the `data` blob of a submission.
 
-    This makes a deep copy of the submission data so that any changes do not get persisted/synced with SQLAlchemy until
-    they are persisted explicitly with a call to `update_submission_data`.
+    This reads through to the submission data it is given but never modifies it: changes are recorded in a separate
+    copy-on-write layer, keyed by the top-level keys of the blob (a question ID, or an add another container ID), so
+    that they do not get persisted/synced with SQLAlchemy until they are persisted explicitly with a call to
+    `update_submission_data`. Read-only uses (eg viewing or exporting a submission) therefore don't need to copy the
+    whole blob. Answers changed within existing add another entries are also tracked by their path within the
+    container, so that they can be persisted without rewriting the container's other entries.
 
     This is *only* concerned with managing the structure of the `submission.data` blob, not any higher-level concerns
     such as 'how complete is this submission' or 'what is the current state of the submission'.
@@ -70,13 +119,76 @@ class SubmissionDataManager:
     """
 
     def __init__(self, data: dict[str, Any]) -> None:
-        # Make a deep copy of the submission data so that any changes do not get persisted/synced with SQLAlchemy unless
-        # done so explicitly.
-        self.data = deepcopy(data)
+        self._original = data
+        self._changes: dict[str, Any] = {}
+        self._entry_changes: dict[str, dict[tuple[int, str], Any]] = {}
+        self._resized_containers: set[str] = set()
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """A new copy of the submission data with any changes applied, which is safe to persist or modify."""
+        merged = {
+            key: deepcopy(self._changes.get(key, value))
+            for key, value in self._original.items()
+            if self._changes.get(key) is not _REMOVED
+        }
+        merged.update(
+            {
+                key: deepcopy(value)
+                for key, value in self._changes.items()
+                if key not in self._original and value is not _REMOVED
+            }
+        )
+        return merged
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._changes)
+
+    def get_changes(self) -> tuple[dict[tuple[str, ...], Any], set[tuple[str, ...]]]:
+        """Returns the paths into the data that have been set (with copies of their new values), and those removed.
+
+        Answers changed within existing add another entries are returned by their `(container, index, question)` path.
+        Adding or removing an entry shifts the indexes of the ones after it, so a container that's had entries added or
+        removed is returned whole.
+        """
+        updated: dict[tuple[str, ...], Any] = {}
+        removed: set[tuple[str, ...]] = set()
+        for key, value in self._changes.items():
+            if value is _REMOVED:
+                removed.add((key,))
+            elif key in self._entry_changes and key not in self._resized_containers:
+                for (index, question_key), entry_value in self._entry_changes[key].items():
+                    if entry_value is _REMOVED:
+                        removed.add((key, str(index), question_key))
+                    else:
+                        updated[(key, str(index), question_key)] = deepcopy(entry_value)
+            else:
+                updated[(key,)] = deepcopy(value)
+        return updated, removed
+
+    def get_all(self, collection_plan: CollectionPlan) -> dict[tuple[uuid.UUID, int | None], AllAnswerTypes]:
+        """Decodes every answer in the submission in one pass; see `deserialise_all`."""
+        view = {key: value for key, value in self._original.items() if key not in self._changes}
+        view.update({key: value for key, value in self._changes.items() if value is not _REMOVED})
+        return deserialise_all(collection_plan, view)
+
+    def _read(self, key: str) -> Any:
+        if key in self._changes:
+            value = self._changes[key]
+            return None if value is _REMOVED else value
+        return self._original.get(key)
+
+    def _get_entries_for_update(self, container_key: str) -> list[dict[str, Any]]:
+        # Only the list is copied; individual entries are replaced rather than modified when they change, so any that
+        # are unchanged can still be shared with the original data.
+        if container_key not in self._changes or self._changes[container_key] is _REMOVED:
+            self._changes[container_key] = list(self._read(container_key) or [])
+        return self._changes[container_key]
 
     def get(self, question: Question, *, add_another_index: int | None = None) -> AllAnswerTypes | None:
         if question.add_another_container:
-            entries = self.data.get(str(question.add_another_container.id), [])
+            entries = self._read(str(question.add_another_container.id)) or []
             if add_another_index is None:
                 raise SubmissionDataAddAnotherIndexInvalid(
                     "add_another_index must be provided for questions within an add another container"
@@ -92,7 +204,7 @@ class SubmissionDataManager:
                 raw_answer = entries[add_another_index].get(str(question.id))
 
         else:
-            raw_answer = self.data.get(str(question.id))
+            raw_answer = self._read(str(question.id))
 
         if raw_answer is None:
             return None
@@ -114,18 +226,20 @@ class SubmissionDataManager:
                 )
 
             container_key = str(question.add_another_container.id)
-            entries = self.data.get(container_key, [])
-            if add_another_index is not None and add_another_index == len(entries):
+            entries = self._get_entries_for_update(container_key)
+            if add_another_index == len(entries):
                 entries.append({})
-            entries[add_another_index][str(question.id)] = answer.get_value_for_submission()
-            self.data[container_key] = entries
+                self._resized_containers.add(container_key)
+            value = answer.get_value_for_submission()
+            entries[add_another_index] = {**entries[add_another_index], str(question.id): value}
+            self._entry_changes.setdefault(container_key, {})[(add_another_index, str(question.id))] = value
         else:
             if add_another_index is not None:
                 raise ValueError(
                     "add_another_index cannot be provided for questions not within an add another container"
                 )
 
-            self.data[str(question.id)] = answer.get_value_for_submission()
+            self._changes[str(question.id)] = answer.get_value_for_submission()
 
     def remove(self, question: Question, *, add_another_index: int | None = None) -> None:
         if question.data_type not in [QuestionDataType.FILE_UPLOAD]:
@@ -144,14 +258,17 @@ class SubmissionDataManager:
                     f"only {num_existing_entries} existing answers"
                 )
 
-            entries = self.data.get(str(question.add_another_container.id), [])
-            if add_another_index is not None and 0 <= add_another_index < len(entries):
-                entries[add_another_index].pop(str(question.id), None)
+            container_key = str(question.add_another_container.id)
+            entries = self._get_entries_for_update(container_key)
+            entries[add_another_index] = {
+                key: value for key, value in entries[add_another_index].items() if key != str(question.id)
+            }
+            self._entry_changes.setdefault(container_key, {})[(add_another_index, str(question.id))] = _REMOVED
         else:
-            self.data.pop(str(question.id), None)
+            self._changes[str(question.id)] = _REMOVED
 
     def get_count_for_add_another(self, group: Component) -> int:
-        entries = self.data.get(str(group.id))
+        entries = self._read(str(group.id))
         return len(entries) if entries else 0
 
     def remove_add_another_entry(self, group: Component, *, add_another_index: int) -> None:
@@ -162,4 +279,5 @@ class SubmissionDataManager:
                 f"as there are only {num_existing_entries} existing answers"
             )
 
-        self.data[str(group.id)].pop(add_another_index)
+        self._get_entries_for_update(str(group.id)).pop(add_another_index)
+        self._resized_containers.add(str(group.id))
@@ -1,7 +1,7 @@
 import datetime
 import enum
 import typing
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from enum import IntEnum
 from typing import TYPE_CHECKING, Any, Literal, Optional
 from uuid import UUID
@@ -181,6 +181,21 @@ class SubmissionStatusEnum(enum.StrEnum):
     SUBMITTED_WITH_CHANGES = "Submitted with changes"
 
 
+class SubmissionExportFormatEnum(enum.StrEnum):
+    CSV = "csv"
+    JSON = "json"
+    NDJSON = "ndjson"
+    XLSX = "xlsx"
+    PDF_ZIP = "pdf.zip"
+
+
+class SubmissionExportJobStatusEnum(enum.StrEnum):
+    PENDING = "Pending"
+    IN_PROGRESS = "In progress"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+
 class SubmissionAssessmentStatusEnum(enum.StrEnum):
     NOT_STARTED = "Not started"
     MARKED_AS_APPROVED = "Marked as approved"
@@ -638,7 +653,7 @@ class DataSourceFileMetadata(BaseModel):
 
 
 TUnvalidatedDataSetRow = dict[str, str]
-TUnvalidatedDataSetRows = list[TUnvalidatedDataSetRow]
+TUnvalidatedDataSetRows = Iterable[TUnvalidatedDataSetRow]
 TDataSetPreviewData = dict[str, list[str]]
 
 
@@ -1,10 +1,13 @@
 import abc
 import ast
+import contextlib
 import enum
 import re
+import threading
 from collections import ChainMap
-from collections.abc import MutableMapping
+from collections.abc import Iterator, MutableMapping
 from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Literal, cast, overload
 
 import simpleeval
@@ -18,11 +21,15 @@ from app.common.expressions.references import (
     EvaluationStatement,
     ExpressionReference,
     ExpressionStatement,
+    InterpolationSlot,
     InterpolationStatement,
+    configure_interpolation_template_cache,
 )
 from app.types import NOT_PROVIDED
 
 if TYPE_CHECKING:
+    from functools import _CacheInfo
+
     from app.common.data.models import Collection, Component, Expression, Group, Question
     from app.common.helpers.collections import SubmissionHelper
     from app.deliver_grant_funding.session_models import AddContextToExpressionsModel
@@ -610,12 +617,17 @@ def get_restricted_evaluator(
     return evaluator
 
 
-def run_evaluation(evaluator: simpleeval.SimpleEval, statement: str) -> Any:
+@contextlib.contextmanager
+def _raise_as_expression_errors() -> Iterator[None]:
+    """Translate simpleeval's exceptions into our own form-renderable expression errors."""
     try:
-        return evaluator.eval(statement)
+        yield
 
     except simpleeval.NameNotDefined as e:
         raise UndefinedVariableInExpression(e.message, e.name) from e
+    except simpleeval.AttributeDoesNotExist as e:
+        # eg a reference to a data set column that doesn't exist
+        raise UndefinedVariableInExpression(e.message, e.attr) from e
     except simpleeval.FunctionNotDefined as e:
         raise UndefinedFunctionInExpression(e.message, e.func_name) from e  # ty:ignore[unresolved-attribute]
     except (SyntaxError, simpleeval.FeatureNotAvailable, KeyError) as e:
@@ -624,6 +636,88 @@ def run_evaluation(evaluator: simpleeval.SimpleEval, statement: str) -> Any:
         raise UndefinedOperatorInExpression(e.message, e.attr) from e
 
 
+def run_evaluation(evaluator: simpleeval.SimpleEval, statement: str, previously_parsed: ast.AST | None = None) -> Any:
+    with _raise_as_expression_errors():
+        return evaluator.eval(statement, previously_parsed=previously_parsed)
+
+
+class CompiledStatement:
+    """
+    A statement that has been parsed and checked against the restricted evaluator ahead of time, so that evaluating
+    it only needs to bind names from an `ExpressionContext`.
+
+    Instances are shared between requests through the per-worker statement cache (see `compile_statement`), so they
+    must never hold on to any request data between evaluations.
+    """
+
+    def __init__(self, statement: str, required_functions: dict[str, Callable[[Any], Any] | type[Any]]):
+        self.statement = statement
+        self._required_functions = required_functions
+        self._evaluator = get_restricted_evaluator(names=None, required_functions=dict(required_functions))
+        self._lock = threading.Lock()
+
+        with _raise_as_expression_errors():
+            self._parsed = self._evaluator.parse(statement)
+
+            # Anything outside of the allowlisted AST nodes would be rejected part-way through evaluation anyway; reject
+            # it up front so that the statement is never partially evaluated.
+            for node in ast.walk(self._parsed):
+                if isinstance(node, (ast.expr, ast.stmt)) and type(node) not in self._evaluator.nodes:
+                    raise simpleeval.FeatureNotAvailable(f"Sorry, {type(node).__name__} is not available")
+
+    def evaluate(self, context: ExpressionContext | None = None) -> Any:
+        names = context if context is not None else dict(simpleeval.DEFAULT_NAMES)
+
+        # The shared evaluator can only have one set of names bound at a time. If it's already in use (eg by another
+        # greenlet) then build a one-off evaluator rather than waiting on it.
+        if not self._lock.acquire(blocking=False):
+            evaluator = get_restricted_evaluator(names=names, required_functions=dict(self._required_functions))
+            return run_evaluation(evaluator, self.statement, previously_parsed=self._parsed)
+
+        try:
+            self._evaluator.names = names
+            return run_evaluation(self._evaluator, self.statement, previously_parsed=self._parsed)
+        finally:
+            self._evaluator.names = None
+            self._lock.release()
+
+
+DEFAULT_STATEMENT_CACHE_SIZE = 4096
+
+
+def _compile_statement(
+    statement: str, required_functions: frozenset[tuple[str, Callable[[Any], Any] | type[Any]]]
+) -> CompiledStatement:
+    return CompiledStatement(statement, dict(required_functions))
+
+
+_cached_compile_statement = lru_cache(maxsize=DEFAULT_STATEMENT_CACHE_SIZE)(_compile_statement)
+
+
+def configure_statement_cache(maxsize: int) -> None:
+    """(Re)create the per-worker caches of compiled statements and interpolation templates with the given bound; this
+    also empties them."""
+    global _cached_compile_statement
+    _cached_compile_statement = lru_cache(maxsize=maxsize)(_compile_statement)
+    configure_interpolation_template_cache(maxsize)
+
+
+def get_statement_cache_info() -> _CacheInfo:
+    """Hit/miss counters and current size of the per-worker cache of compiled statements."""
+    return _cached_compile_statement.cache_info()
+
+
+def compile_statement(
+    statement: str, required_functions: dict[str, Callable[[Any], Any] | type[Any]] | None = None
+) -> CompiledStatement:
+    """
+    Returns a `CompiledStatement` for the statement, reusing a previously compiled one from the per-worker LRU cache
+    where possible. Entries are keyed on the statement text and the set of functions made available to it, as the
+    same statement text can be evaluated with different functions available.
+    """
+    return _cached_compile_statement(str(statement), frozenset((required_functions or {}).items()))
+
+
 def _evaluate_expression_with_context(
     statement: ExpressionStatement,
     context: ExpressionContext | None = None,
@@ -638,12 +732,35 @@ def _evaluate_expression_with_context(
 
     The addition of any new AST nodes should be well-tested and intentional consideration should be given to any
     ways of exploit or misuse.
+
+    Parsed statements are cached per-worker (see `compile_statement`), so repeated evaluations of the same statement
+    only pay for binding the context and walking the tree.
     """
-    evaluator = get_restricted_evaluator(names=context, required_functions=required_functions or {})
+    return compile_statement(statement, required_functions).evaluate(context)
 
-    result = run_evaluation(evaluator, statement)
 
-    return result
+def _lookup_reference_path(context: ExpressionContext, path: tuple[str, ...]) -> Any:
+    """Look up a plain dotted reference directly in the context, returning `NOT_PROVIDED` if it needs evaluating.
+
+    This mirrors simpleeval's attribute handling (real attributes win over dictionary keys), so it only short-cuts
+    plain dictionary lookups; anything else is left to the evaluator so that the result is always the same.
+    """
+    value = context.get(path[0], NOT_PROVIDED)
+    for attr in path[1:]:
+        if value is NOT_PROVIDED or not isinstance(value, dict) or hasattr(value, attr):
+            return NOT_PROVIDED
+        value = value.get(attr, NOT_PROVIDED)
+    return value
+
+
+def _resolve_interpolation_slot(slot: InterpolationSlot, context: ExpressionContext | None) -> Any:
+    if slot.path is not None and context is not None:
+        value = _lookup_reference_path(context, slot.path)
+        if value is not NOT_PROVIDED:
+            return value
+
+    # Unresolved references still go through the evaluator so that they raise the same errors as they always have
+    return _evaluate_expression_with_context(slot.text, context)
 
 
 @overload
@@ -681,9 +798,9 @@ def interpolate(
     if isinstance(text, str):
         text = InterpolationStatement(text)
 
-    def _interpolate(matchobj: re.Match[Any]) -> str:
+    def _render_slot(slot: InterpolationSlot) -> str:
         try:
-            value = _evaluate_expression_with_context(matchobj.group(0), context)
+            value = _resolve_interpolation_slot(slot, context)
             if with_interpolation_highlighting:
                 return f'<span class="app-context-aware-editor--valid-reference">{escape(value)}</span>'
         except (
@@ -692,11 +809,11 @@ def interpolate(
             UndefinedFunctionInExpression,
             UndefinedOperatorInExpression,
         ):
-            value = matchobj.group(0)
+            value = slot.text
 
         return str(value)
 
-    result = text.interpolate(_interpolate)
+    result = text.interpolate(_render_slot)
 
     if with_interpolation_highlighting:
         return Markup(result)
@@ -1,10 +1,12 @@
 import ast
-import re
 from collections import namedtuple
-from functools import cached_property
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from keyword import iskeyword
 from typing import TYPE_CHECKING, Any, Callable, Protocol
 from uuid import UUID
 
+import simpleeval
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
 from sqlalchemy import String, TypeDecorator
@@ -14,6 +16,8 @@ from sqlalchemy.exc import NoResultFound
 from app.common.safe_ids import SafeDidMixin, SafeQidMixin
 
 if TYPE_CHECKING:
+    from functools import _CacheInfo
+
     from app.common.data.models import DataSource, Question
     from app.common.data.types import (
         DataSourceSchemaColumn,
@@ -388,13 +392,97 @@ class InterpolationStatement(ExpressionStatement):
 
         return out
 
-    def interpolate(self, interpolation_function: Callable[[re.Match[Any]], str]) -> str:
-        from app.common.expressions import INTERPOLATE_REGEX
+    @property
+    def template(self) -> InterpolationTemplate:
+        return get_interpolation_template(self)
 
-        return INTERPOLATE_REGEX.sub(
-            interpolation_function,
-            self,
-        )
+    def interpolate(self, render_slot: Callable[[InterpolationSlot], str]) -> str:
+        return self.template.render(render_slot)
+
+
+@dataclass(frozen=True)
+class InterpolationSlot:
+    """A single ``((...))`` block within an interpolation template.
+
+    ``text`` is the whole block including the wrapping parens; it's what gets evaluated, and what gets rendered back
+    out if the block can't be resolved. ``path`` is set when the block is a plain (optionally dotted) reference such as
+    ``((q_abc))`` or ``((d_abc.column))``, so that it can be looked up in a context without a full evaluation.
+    """
+
+    text: str
+    path: tuple[str, ...] | None
+
+
+@dataclass(frozen=True)
+class InterpolationTemplate:
+    """An interpolation statement split into its literal text segments and ``((...))`` slots, in order."""
+
+    segments: tuple[str | InterpolationSlot, ...]
+
+    @property
+    def slots(self) -> list[InterpolationSlot]:
+        return [segment for segment in self.segments if isinstance(segment, InterpolationSlot)]
+
+    def render(self, render_slot: Callable[[InterpolationSlot], str]) -> str:
+        return "".join(segment if isinstance(segment, str) else render_slot(segment) for segment in self.segments)
+
+
+def _reference_path(inner: str) -> tuple[str, ...] | None:
+    """Split a plain dotted reference into its parts, or return None if it needs the full evaluator to resolve it.
+
+    This deliberately excludes anything that simpleeval would treat specially (keywords like ``True``, literals,
+    private or blocked attribute names) so that a direct lookup always gives the same answer as an evaluation.
+    """
+    parts = tuple(inner.strip().split("."))
+    for part in parts:
+        if not part.isidentifier() or iskeyword(part) or part in simpleeval.DISALLOW_METHODS:
+            return None
+        if any(part.startswith(prefix) for prefix in simpleeval.DISALLOW_PREFIXES):
+            return None
+    return parts
+
+
+def _parse_interpolation_template(text: str) -> InterpolationTemplate:
+    from app.common.expressions import INTERPOLATE_REGEX
+
+    segments: list[str | InterpolationSlot] = []
+    position = 0
+    for match in INTERPOLATE_REGEX.finditer(text):
+        if match.start() > position:
+            segments.append(text[position : match.start()])
+        segments.append(InterpolationSlot(text=match.group(0), path=_reference_path(match.group(1))))
+        position = match.end()
+
+    if position < len(text):
+        segments.append(text[position:])
+
+    return InterpolationTemplate(segments=tuple(segments))
+
+
+DEFAULT_INTERPOLATION_TEMPLATE_CACHE_SIZE = 4096
+
+_cached_parse_interpolation_template = lru_cache(maxsize=DEFAULT_INTERPOLATION_TEMPLATE_CACHE_SIZE)(
+    _parse_interpolation_template
+)
+
+
+def configure_interpolation_template_cache(maxsize: int) -> None:
+    """(Re)create the per-worker cache of parsed interpolation templates with the given bound; this also empties it."""
+    global _cached_parse_interpolation_template
+    _cached_parse_interpolation_template = lru_cache(maxsize=maxsize)(_parse_interpolation_template)
+
+
+def get_interpolation_template_cache_info() -> _CacheInfo:
+    return _cached_parse_interpolation_template.cache_info()
+
+
+def get_interpolation_template(text: str) -> InterpolationTemplate:
+    """Returns the parsed template for some interpolation text, reusing a cached parse where possible.
+
+    Question text, hints and guidance are interpolated over and over again (the question page, check your answers,
+    PDF exports, ...) so we only want to tokenise each distinct string once per worker.
+    """
+    return _cached_parse_interpolation_template(str(text))
 
 
 class InterpolationStatementType(TypeDecorator):
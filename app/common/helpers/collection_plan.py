@@ -0,0 +1,104 @@
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from app.common.data.types import ConditionsOperator, NumberTypeEnum, QuestionDataType
+from app.common.helpers.dependency_graph import CollectionDependencyGraph
+
+if TYPE_CHECKING:
+    from app.common.data.models import Collection, Component
+
+
+@dataclass(frozen=True)
+class ComponentPlan:
+    id: uuid.UUID
+    form_id: uuid.UUID
+    parent_id: uuid.UUID | None
+    is_question: bool
+    data_type: QuestionDataType | None
+    number_type: NumberTypeEnum | None
+    add_another_container_id: uuid.UUID | None
+    conditions_operator: ConditionsOperator
+    condition_statements: tuple[str, ...]
+    depends_on_component_ids: frozenset[uuid.UUID]
+
+
+@dataclass(frozen=True)
+class FormPlan:
+    id: uuid.UUID
+    question_ids: tuple[uuid.UUID, ...]
+    component_ids: tuple[uuid.UUID, ...]
+
+
+@dataclass(frozen=True)
+class CollectionPlan:
+    """
+    An immutable, ID-only summary of a collection's schema: its forms and (nested) components in order, add another
+    containers, conditions and references, plus index maps for looking components up without scanning every form.
+
+    It's built once per loaded collection (see `Collection.cached_plan`), so every submission helper for that
+    collection - eg each row of an export - shares it. Callers still load the ORM schema to render pages, but can use
+    the plan's index maps to find things in it, eg `question_positions` gives the index of a form in
+    `collection.forms` and of a question within that form's `cached_questions`.
+    """
+
+    collection_id: uuid.UUID
+    forms: tuple[FormPlan, ...]
+    components: Mapping[uuid.UUID, ComponentPlan]
+    form_positions: Mapping[uuid.UUID, int]
+    question_positions: Mapping[uuid.UUID, tuple[int, int]]
+    dependency_graph: CollectionDependencyGraph
+
+    @classmethod
+    def build(cls, collection: Collection) -> CollectionPlan:
+        forms = []
+        components = {}
+        form_positions = {}
+        question_positions = {}
+
+        for form_index, form in enumerate(collection.forms):
+            form_positions[form.id] = form_index
+            for question_index, question in enumerate(form.cached_questions):
+                question_positions[question.id] = (form_index, question_index)
+
+            for component in form.cached_all_components:
+                components[component.id] = _build_component_plan(component, form_id=form.id)
+
+            forms.append(
+                FormPlan(
+                    id=form.id,
+                    question_ids=tuple(question.id for question in form.cached_questions),
+                    component_ids=tuple(component.id for component in form.cached_all_components),
+                )
+            )
+
+        return cls(
+            collection_id=collection.id,
+            forms=tuple(forms),
+            components=MappingProxyType(components),
+            form_positions=MappingProxyType(form_positions),
+            question_positions=MappingProxyType(question_positions),
+            dependency_graph=CollectionDependencyGraph.build(collection),
+        )
+
+
+def _build_component_plan(component: Component, *, form_id: uuid.UUID) -> ComponentPlan:
+    add_another_container = component.add_another_container
+    return ComponentPlan(
+        id=component.id,
+        form_id=form_id,
+        parent_id=component.parent.id if component.parent else None,
+        is_question=component.is_question,
+        data_type=component.data_type,
+        number_type=component.data_options.number_type if component.data_type == QuestionDataType.NUMBER else None,
+        add_another_container_id=add_another_container.id if add_another_container else None,
+        conditions_operator=component.conditions_operator,
+        condition_statements=tuple(str(condition.statement) for condition in component.conditions),
+        depends_on_component_ids=frozenset(
+            ref.depends_on_component.id
+            for ref in component.owned_component_references
+            if ref.depends_on_component is not None
+        ),
+    )
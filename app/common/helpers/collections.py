@@ -1,16 +1,19 @@
 import csv
 import json
+import multiprocessing
 import uuid
-from collections.abc import Callable, Sequence
+from collections import deque
+from collections.abc import Callable, Hashable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
-from functools import cached_property, lru_cache, partial
+from functools import cached_property, partial
 from io import StringIO
 from itertools import chain
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, NamedTuple, cast
 from uuid import UUID
 
-from flask import current_app, url_for
+from flask import Flask, current_app, url_for
 from pydantic import BaseModel as PydanticBaseModel
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
@@ -36,11 +39,18 @@ from app.common.collections.validation import SubmissionValidator
 from app.common.data import interfaces
 from app.common.data.interfaces.collections import (
     get_all_submissions_with_mode_for_collection,
+    get_changed_submissions_for_collection,
+    get_collection,
+    get_max_add_another_counts_for_collection,
     get_submission,
+    get_submission_ids_with_mode_for_collection,
+    iter_submissions_with_mode_for_collection,
     update_submission,
     update_submission_data,
 )
 from app.common.data.interfaces.grant_recipients import get_grant_recipients
+from app.common.data.interfaces.submission_exports import use_submission_export_snapshot
+from app.common.data.interfaces.submission_pdfs import create_submission_pdf_job
 from app.common.data.models_user import User
 from app.common.data.submission_data_manager import SubmissionDataAddAnotherIndexInvalid, SubmissionDataManager
 from app.common.data.types import (
@@ -58,6 +68,7 @@ from app.common.data.types import (
     RoleEnum,
     SubmissionAssessmentStatusEnum,
     SubmissionEventType,
+    SubmissionExportFormatEnum,
     SubmissionModeEnum,
     SubmissionStatusEnum,
     TasklistSectionStatusEnum,
@@ -72,6 +83,9 @@ from app.common.expressions import (
     evaluate,
     interpolate,
 )
+from app.common.helpers.collection_plan import CollectionPlan
+from app.common.helpers.dependency_graph import CollectionDependencyGraph
+from app.common.helpers.spreadsheets import iter_xlsx, xlsx_row
 from app.common.helpers.submission_events import SubmissionEventHelper
 from app.common.helpers.timeline import TimelineEvent, build_timeline_events
 from app.extensions import notification_service, s3_service
@@ -151,6 +165,37 @@ def _any_data_source_missing_referenced_data(data_sources: Sequence[DataSource],
     )
 
 
+class _EvictableCache[**P, R]:
+    """
+    Memoises `func` in the same way as `lru_cache(maxsize=None)`, but lets callers evict individual entries rather
+    than only being able to clear the whole cache. `key` is called with the same arguments as `func` and should
+    return a hashable that identifies the result.
+    """
+
+    def __init__(self, func: Callable[P, R], key: Callable[P, Hashable]):
+        self._func = func
+        self._key = key
+        self._results: dict[Hashable, R] = {}
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        key = self._key(*args, **kwargs)
+        if key not in self._results:
+            self._results[key] = self._func(*args, **kwargs)
+        return self._results[key]
+
+    def evict(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [key for key in self._results if predicate(key)]:
+            del self._results[key]
+
+    def cache_clear(self) -> None:
+        self._results.clear()
+
+    def prime(self, results: Mapping[Hashable, R]) -> None:
+        """Stores results calculated elsewhere, keyed the same way as `key`, without replacing any already cached."""
+        for key, result in results.items():
+            self._results.setdefault(key, result)
+
+
 class SubmissionHelper:
     """
     This offensively-named class is a helper for the `app.common.data.models.Submission` and associated sub-models.
@@ -175,10 +220,16 @@ class SubmissionHelper:
         self.collection_helper = CollectionHelper(self.collection)
         self.events = SubmissionEventHelper(self.submission)
 
-        self.cached_get_ordered_visible_questions = lru_cache(maxsize=None)(self._get_ordered_visible_questions)
-        self.cached_get_answer_for_question = lru_cache(maxsize=None)(self._get_answer_for_question)
-        self.cached_get_all_questions_are_answered_for_form = lru_cache(maxsize=None)(
-            self._get_all_questions_are_answered_for_form
+        self.cached_get_ordered_visible_questions = _EvictableCache(
+            self._get_ordered_visible_questions,
+            key=lambda parent, *, override_context=None: (parent.id, override_context),
+        )
+        self.cached_get_answer_for_question = _EvictableCache(
+            self._get_answer_for_question,
+            key=lambda question_id, add_another_index=None: (question_id, add_another_index),
+        )
+        self.cached_get_all_questions_are_answered_for_form = _EvictableCache(
+            self._get_all_questions_are_answered_for_form, key=lambda form: form.id
         )
 
     @classmethod
@@ -379,8 +430,46 @@ class SubmissionHelper:
                 if attr in self.__dict__:
                     del self.__dict__[attr]
 
-    def _update_submission_status(self):
-        self.clear_caches()
+    @property
+    def plan(self) -> CollectionPlan:
+        return self.collection.cached_plan
+
+    @property
+    def dependency_graph(self) -> CollectionDependencyGraph:
+        return self.plan.dependency_graph
+
+    def clear_caches_for_components(self, components: Sequence[Component]) -> None:
+        """
+        Clears only the cached results that could have changed because the answers to `components` changed: answers
+        for those components, and visibility/completeness for any forms and groups containing a component that
+        transitively depends on them. Anything we can't place in the collection's dependency graph clears everything.
+        """
+        component_ids = [component.id for component in components]
+        if not self.dependency_graph.contains(component_ids):
+            self.clear_caches()
+            return
+
+        affected_component_ids = self.dependency_graph.get_affected_component_ids(component_ids)
+        affected_container_ids = self.dependency_graph.get_affected_container_ids(component_ids)
+
+        self.cached_get_answer_for_question.evict(lambda key: key[0] in affected_component_ids)
+        self.cached_get_all_questions_are_answered_for_form.evict(lambda key: key in affected_container_ids)
+        # Results calculated against an override context can't be trusted as the context holds the previous answers.
+        self.cached_get_ordered_visible_questions.evict(
+            lambda key: key[0] in affected_container_ids or key[1] is not None
+        )
+
+        # The `@cached_property`s hold expression contexts built from the previous answers, so always rebuild them.
+        for attr, value in self.__class__.__dict__.items():
+            if isinstance(value, cached_property):
+                if attr in self.__dict__:
+                    del self.__dict__[attr]
+
+    def _update_submission_status(self, changed_components: Sequence[Component] | None = None):
+        if changed_components is None:
+            self.clear_caches()
+        else:
+            self.clear_caches_for_components(changed_components)
         update_submission(
             self.submission,
             status=self._calculate_submission_status(),
@@ -398,10 +487,10 @@ class SubmissionHelper:
 
         self._update_submission_status()
 
-    def _sync_submission_data_and_status(self):
+    def _sync_submission_data_and_status(self, changed_components: Sequence[Component] | None = None):
         update_submission_data(self.submission)
 
-        self._update_submission_status()
+        self._update_submission_status(changed_components)
 
     def _calculate_submission_status(self) -> SubmissionStatusEnum:
         submission_state = self.events.submission_state
@@ -608,13 +697,35 @@ class SubmissionHelper:
     def has_allow_validation_enabled(self) -> bool:
         return self.submission.collection.allow_validation
 
+    def _get_planned_form(self, form_index: int) -> Form | None:
+        return self.collection.forms[form_index] if form_index < len(self.collection.forms) else None
+
+    def _get_planned_question(self, question_id: uuid.UUID) -> Question | None:
+        """Looks a question up using the plan's index maps, or returns None if the plan doesn't match the ORM schema."""
+        if (position := self.plan.question_positions.get(question_id)) is None:
+            return None
+
+        form_index, question_index = position
+        if (form := self._get_planned_form(form_index)) is None or question_index >= len(form.cached_questions):
+            return None
+
+        question = form.cached_questions[question_index]
+        return question if question.id == question_id else None
+
     def get_form(self, form_id: uuid.UUID) -> Form:
+        if (form_index := self.plan.form_positions.get(form_id)) is not None:
+            if (form := self._get_planned_form(form_index)) is not None and form.id == form_id:
+                return form
+
         try:
             return next(filter(lambda f: f.id == form_id, self.collection.forms))
         except StopIteration as e:
             raise ValueError(f"Could not find a form with id={form_id} in collection={self.collection.id}") from e
 
     def get_question(self, question_id: uuid.UUID) -> Question:
+        if (question := self._get_planned_question(question_id)) is not None:
+            return question
+
         try:
             return next(
                 filter(
@@ -987,6 +1098,9 @@ class SubmissionHelper:
         return None
 
     def get_form_for_question(self, question_id: UUID) -> Form:
+        if self._get_planned_question(question_id) is not None:
+            return self.collection.forms[self.plan.question_positions[question_id][0]]
+
         for form in self.collection.forms:
             if any(q.id == question_id for q in form.cached_questions):
                 return form
@@ -1034,6 +1148,13 @@ class SubmissionHelper:
         question = self.get_question(question_id)
         return self.submission.data_manager.get(question, add_another_index=add_another_index)
 
+    def preload_answers(self) -> None:
+        """
+        Decodes every answer in the submission in one pass, so that later calls to `cached_get_answer_for_question`
+        (eg for each question when exporting) don't need to each look up and deserialise their own answer.
+        """
+        self.cached_get_answer_for_question.prime(self.submission.data_manager.get_all(self.plan))
+
     def submit_answer_for_question(
         self, question_id: UUID, form: DynamicQuestionForm, user: User, *, add_another_index: int | None = None
     ) -> None:
@@ -1096,7 +1217,7 @@ class SubmissionHelper:
             data.key = key
 
         self.submission.data_manager.set(question, data, add_another_index=add_another_index)
-        self._sync_submission_data_and_status()
+        self._sync_submission_data_and_status(changed_components=[question])
 
         self._emit_submission_events_for_forms_reset_to_in_progress(current_form, current_form_statuses, user)
 
@@ -1118,7 +1239,8 @@ class SubmissionHelper:
         self.submission.data_manager.remove_add_another_entry(
             add_another_container, add_another_index=add_another_index
         )
-        self._sync_submission_data_and_status()
+        # Removing an entry shifts the indexes of every later entry, so treat the whole container as changed.
+        self._sync_submission_data_and_status(changed_components=[add_another_container])
 
         for key in keys_to_delete:
             s3_service.delete_file(key)
@@ -1139,7 +1261,7 @@ class SubmissionHelper:
                 keys_to_delete.append(answer.key)
 
         self.submission.data_manager.remove(question, add_another_index=add_another_index)
-        self._sync_submission_data_and_status()
+        self._sync_submission_data_and_status(changed_components=[question])
 
         for key in keys_to_delete:
             s3_service.delete_file(key)
@@ -1223,6 +1345,10 @@ class SubmissionHelper:
             related_entity_id=self.submission.id,
         )
 
+        # Its PDFs can't change now until it's reopened, so render them ready to be downloaded.
+        if current_app.config["SUBMISSION_PDF_CACHE_ENABLED"]:
+            create_submission_pdf_job(self.submission)
+
         unique_users = set(self._data_providers_for_lifecycle_emails(user)) | set(
             self._certifiers_for_lifecycle_emails(user)
         )
@@ -1396,6 +1522,11 @@ class SubmissionHelper:
             return True
         return False
 
+    def _delete_cached_pdfs(self) -> None:
+        # They're keyed by the latest event so would never be used again, but there's no need to keep them around.
+        if current_app.config["SUBMISSION_PDF_CACHE_ENABLED"]:
+            s3_service.delete_prefix(self.submission.pdfs_s3_key_prefix)
+
     def reopen_submission(self, user: User, reopened_reason: str | None) -> None:
 
         if not AuthorisationHelper.can_request_or_allow_changes(user, self.submission):
@@ -1428,6 +1559,7 @@ class SubmissionHelper:
             submission_data=self.submission.data_manager.data,
             related_entity_id=self.id,
         )
+        self._delete_cached_pdfs()
         for form in self.collection.forms:
             if not self.form_is_managed_by_service(form):
                 self.add_submission_event(
@@ -1479,6 +1611,7 @@ class SubmissionHelper:
             submission_data=self.submission.data_manager.data,
             related_entity_id=self.id,
         )
+        self._delete_cached_pdfs()
         for form in self.collection.forms:
             if (not section_ids or form.id in section_ids) and not self.form_is_managed_by_service(form):
                 self.add_submission_event(
@@ -1732,13 +1865,44 @@ class AllSubmissionsHelper:
     submissions: list[Submission]
     submission_helpers: dict[UUID, SubmissionHelper]
 
-    def __init__(self, collection: Collection, submission_mode: SubmissionModeEnum):
+    def __init__(
+        self,
+        collection: Collection,
+        submission_mode: SubmissionModeEnum,
+        *,
+        stream_submissions: bool = False,
+        export_processes: int = 0,
+        export_snapshot_id: str | None = None,
+    ):
+        """
+        With `stream_submissions`, submissions aren't loaded up front: `submissions` and `submission_helpers` are left
+        empty, and the exports read submissions a chunk at a time instead. Use this for collection-wide exports, with
+        a `collection` loaded with its full schema.
+
+        With `export_processes` as well, exports build their rows in that many separate processes rather than in this
+        one. Starting the processes takes a few seconds, so this is only worth it for very large collections. Each
+        process reads its submissions in a transaction of its own, so pass the `export_snapshot_id` from
+        `begin_submission_export_snapshot` for them to all see the same data as this one. Without it, submissions
+        changed part way through the export can appear as they were before or after the change, depending on which
+        process read them.
+        """
         if submission_mode == SubmissionModeEnum.PREVIEW:
             raise ValueError("Cannot create a collection helper for preview submissions.")
+        if export_processes and not stream_submissions:
+            raise ValueError("Exporting in separate processes needs `stream_submissions`.")
 
         self.collection = collection
         self.submission_mode = submission_mode
-        self.submissions = [s for s in (get_all_submissions_with_mode_for_collection(collection.id, submission_mode))]
+        self.stream_submissions = stream_submissions
+        self.export_processes = export_processes
+        self.export_snapshot_id = export_snapshot_id
+        self.submissions_processed = 0
+        self._max_add_another_counts: dict[UUID, int] | None = None
+        self.submissions = (
+            []
+            if stream_submissions
+            else [s for s in (get_all_submissions_with_mode_for_collection(collection.id, submission_mode))]
+        )
         self.submission_helpers = {s.id: SubmissionHelper(s) for s in self.submissions}
 
         grant_recipient_mode = GrantRecipientModeEnum.from_similar(submission_mode)
@@ -1776,8 +1940,167 @@ class AllSubmissionsHelper:
             for question in sorted(form.cached_questions, key=lambda q: q.order)
         ]
 
-    # todo: split this method up into smaller parts that can be individually tested (i.e submission -> CSV row dict)
-    def generate_csv_content_for_all_submissions(self) -> str:  # noqa: C901
+    def iter_submission_helpers(self) -> Iterator[SubmissionHelper]:
+        """
+        Every submission in the collection, ordered by reference. When streaming, each helper is only valid until
+        the next chunk of submissions is loaded. `submissions_processed` counts how many have been handled so far.
+        """
+        self.submissions_processed = 0
+        if not self.stream_submissions:
+            for helper in sorted(self.submission_helpers.values(), key=lambda helper: helper.reference):
+                yield helper
+                self.submissions_processed += 1
+            return
+
+        for chunk in iter_submissions_with_mode_for_collection(self.collection, self.submission_mode):
+            for submission in chunk:
+                yield SubmissionHelper(submission)
+                self.submissions_processed += 1
+
+    def _get_max_add_another_counts(self, add_another_containers: list[Component]) -> dict[UUID, int]:
+        """
+        The number of columns each add another container needs in the CSV export: the most answers any submission
+        gave to it. If there are no submissions we still want one set of columns.
+        """
+        if self._max_add_another_counts is not None:
+            return self._max_add_another_counts
+
+        if self.stream_submissions:
+            counts = get_max_add_another_counts_for_collection(
+                self.collection.id, self.submission_mode, [container.id for container in add_another_containers]
+            )
+            self._max_add_another_counts = {
+                container_id: 1 if count is None else count for container_id, count in counts.items()
+            }
+            return self._max_add_another_counts
+
+        # A single pass over every submission, rather than one per container.
+        max_counts = {container.id: 0 if self.submission_helpers else 1 for container in add_another_containers}
+        for submission in self.submission_helpers.values():
+            for container in add_another_containers:
+                max_counts[container.id] = max(
+                    max_counts[container.id], submission.get_count_for_add_another(container)
+                )
+        return max_counts
+
+    def _get_csv_question_headers(self) -> list[tuple[Question, str, int | None]]:
+        questions = self.get_all_possible_questions_for_collection()
+        add_another_containers: list[Component] = []
+        for question in questions:
+            if question.add_another_container and question.add_another_container not in add_another_containers:
+                add_another_containers.append(question.add_another_container)
+
+        max_counts = self._get_max_add_another_counts(add_another_containers)
+
+        question_headers: list[tuple[Question, str, int | None]] = []
+        processed_add_another_contexts = []
+        for question in questions:
+            if not question.add_another_container:
+                question_headers.append((question, f"[{question.form.title}] {question.name}", None))
+            elif question.add_another_container not in processed_add_another_contexts:
+                processed_add_another_contexts.append(question.add_another_container)
+
+                for i in range(max_counts[question.add_another_container.id]):
+                    add_another_questions = (
+                        cast("Group", question.add_another_container).cached_questions
+                        if question.add_another_container.is_group
+                        else [cast("Question", question.add_another_container)]
+                    )
+                    for add_another_question in add_another_questions:
+                        assert add_another_question.add_another_container is not None
+                        question_headers.append(
+                            (
+                                add_another_question,
+                                f"[{add_another_question.form.title}]"
+                                f" [{add_another_question.add_another_container.name}]"
+                                f" {add_another_question.name} ({i + 1})",
+                                i,
+                            )
+                        )
+
+        return question_headers
+
+    def _get_csv_row(  # noqa: C901
+        self,
+        submission: SubmissionHelper,
+        question_headers: list[tuple[Question, str, int | None]],
+        *,
+        typed: bool = False,
+    ) -> dict[str, Any]:
+        """
+        One submission's row of the CSV export. With `typed`, values are left as numbers, booleans, dates and datetimes
+        where they can be, rather than formatted as text, for formats that can store them as such.
+        """
+
+        def _datetime(value: datetime) -> datetime | str:
+            return value if typed else value.isoformat(" ", "seconds")
+
+        def _answer(answer: AllAnswerTypes) -> Any:
+            return answer.get_value_for_spreadsheet_export() if typed else answer.get_value_for_text_export()
+
+        submission.preload_answers()
+        submission_csv_data = {
+            "Submission reference": submission.reference,
+            "Grant recipient": (
+                submission.submission.grant_recipient.organisation.name
+                if submission.submission.grant_recipient
+                else None
+            ),
+            "Created by": submission.created_by_email,
+            "Created at": _datetime(submission.created_at_utc),
+            "Status": submission.status,
+            "Submitted at": _datetime(submission.submitted_at_utc) if submission.submitted_at_utc else None,
+        }
+
+        if self.collection.requires_certification:
+            submission_csv_data["Certified by"] = (
+                submission.events.submission_state.certified_by.email
+                if submission.events.submission_state.certified_by
+                else None
+            )
+            submission_csv_data["Certified at"] = (
+                _datetime(submission.events.submission_state.certified_at_utc)
+                if submission.events.submission_state.certified_at_utc
+                else None
+            )
+
+        if self.collection.allow_multiple_submissions:
+            submission_csv_data["Submission name"] = submission.submission_name
+
+        visible_questions = submission.all_visible_questions
+        cached_contexts: dict[str, ExpressionContext] = {}
+        for question, header_string, index in question_headers:
+            if not question.add_another_container:
+                if question.id not in visible_questions.keys():
+                    submission_csv_data[header_string] = NOT_ASKED
+                else:
+                    answer = submission.cached_get_answer_for_question(question.id)
+                    submission_csv_data[header_string] = _answer(answer) if answer is not None else NOT_ANSWERED
+            else:
+                assert index is not None
+                if submission.get_count_for_add_another(question.add_another_container) <= index:
+                    # this submission didn't provide this many answers as so wasn't asked this question
+                    submission_csv_data[header_string] = NOT_ASKED
+                else:
+                    context_key = f"{question.add_another_container.id}{index}"
+                    context = cached_contexts.get(context_key)
+                    if not context:
+                        context = submission.cached_evaluation_context.with_add_another_context(
+                            question.add_another_container,
+                            data_manager=submission.submission.data_manager,
+                            add_another_index=index,
+                        )
+                        cached_contexts[context_key] = context
+
+                    if submission.is_component_visible(question, context):
+                        answer = submission.cached_get_answer_for_question(question.id, add_another_index=index)
+                        submission_csv_data[header_string] = _answer(answer) if answer is not None else NOT_ANSWERED
+                    else:
+                        submission_csv_data[header_string] = NOT_ASKED
+
+        return submission_csv_data
+
+    def _get_csv_headers(self) -> tuple[list[str], list[tuple[Question, str, int | None]]]:
         metadata_headers = (
             ["Submission reference", "Grant recipient"]
             + (["Submission name"] if self.collection.allow_multiple_submissions else [])
@@ -1788,189 +2111,300 @@ class AllSubmissionsHelper:
                 "Submitted at",
             ]
         )
+        question_headers = self._get_csv_question_headers()
+        return metadata_headers + [header_string for (_, header_string, _) in question_headers], question_headers
 
-        question_headers: list[tuple[Question, str, int | None]] = []
-        processed_add_another_contexts = []
-        for question in self.get_all_possible_questions_for_collection():
-            if not question.add_another_container:
-                question_headers.append((question, f"[{question.form.title}] {question.name}", None))
-            else:
-                if question.add_another_container not in processed_add_another_contexts:
-                    processed_add_another_contexts.append(question.add_another_container)
-
-                    # if its an add another question context we need to know the count to make the
-                    # maximum number of headers
-                    counts = [
-                        submission.get_count_for_add_another(question.add_another_container)
-                        for submission in self.submission_helpers.values()
-                    ]
-                    count = max(counts) if counts else 1
-
-                    for i in range(count):
-                        questions = (
-                            cast("Group", question.add_another_container).cached_questions
-                            if question.add_another_container.is_group
-                            else [cast("Question", question.add_another_container)]
-                        )
-                        for add_another_question in questions:
-                            assert add_another_question.add_another_container is not None
-                            question_headers.append(
-                                (
-                                    add_another_question,
-                                    f"[{add_another_question.form.title}]"
-                                    f" [{add_another_question.add_another_container.name}]"
-                                    f" {add_another_question.name} ({i + 1})",
-                                    i,
-                                )
-                            )
+    def _get_submission_serialiser(
+        self,
+        export_format: SubmissionExportFormatEnum,
+        csv_headers: tuple[list[str], list[tuple[Question, str, int | None]]] | None = None,
+    ) -> Callable[[SubmissionHelper], str]:
+        """A function that turns a submission into its line of the CSV export, or its object in the JSON export."""
+        if export_format in {SubmissionExportFormatEnum.JSON, SubmissionExportFormatEnum.NDJSON}:
+            return lambda submission: json.dumps(self._get_json_submission(submission))
+
+        all_headers, question_headers = csv_headers or self._get_csv_headers()
+        if export_format == SubmissionExportFormatEnum.XLSX:
+            return lambda submission: xlsx_row(
+                self._get_csv_row(submission, question_headers, typed=True).get(header) for header in all_headers
+            )
 
-        all_headers = metadata_headers + [header_string for (_, header_string, _) in question_headers]
+        # Each line is written into the same small buffer, and then taken back out of it, so that `csv` handles the
+        # quoting and escaping for us.
+        line = StringIO()
+        csv_writer = csv.DictWriter(line, fieldnames=all_headers)
 
-        csv_output = StringIO()
-        csv_writer = csv.DictWriter(csv_output, fieldnames=all_headers)
-        csv_writer.writeheader()
-        for submission in sorted(
-            [helper for _submission_id, helper in self.submission_helpers.items()], key=lambda helper: helper.reference
-        ):
-            submission_csv_data = {
-                "Submission reference": submission.reference,
-                "Grant recipient": (
-                    submission.submission.grant_recipient.organisation.name
-                    if submission.submission.grant_recipient
-                    else None
-                ),
-                "Created by": submission.created_by_email,
-                "Created at": submission.created_at_utc.isoformat(" ", "seconds"),
-                "Status": submission.status,
-                "Submitted at": submission.submitted_at_utc.isoformat(" ", "seconds")
-                if submission.submitted_at_utc
-                else None,
-            }
+        def _serialise(submission: SubmissionHelper) -> str:
+            csv_writer.writerow(self._get_csv_row(submission, question_headers))
+            value = line.getvalue()
+            line.seek(0)
+            line.truncate()
+            return value
 
-            if self.collection.requires_certification:
-                submission_csv_data["Certified by"] = (
-                    submission.events.submission_state.certified_by.email
-                    if submission.events.submission_state.certified_by
-                    else None
-                )
-                submission_csv_data["Certified at"] = (
-                    submission.events.submission_state.certified_at_utc.isoformat(" ", "seconds")
-                    if submission.events.submission_state.certified_at_utc
-                    else None
-                )
+        return _serialise
 
-            if self.collection.allow_multiple_submissions:
-                submission_csv_data["Submission name"] = submission.submission_name
+    def _iter_serialised_submissions(
+        self,
+        export_format: SubmissionExportFormatEnum,
+        csv_headers: tuple[list[str], list[tuple[Question, str, int | None]]] | None = None,
+    ) -> Iterator[str]:
+        if self.export_processes:
+            yield from self._iter_serialised_submissions_in_processes(export_format)
+            return
+
+        serialise = self._get_submission_serialiser(export_format, csv_headers)
+        for submission in self.iter_submission_helpers():
+            yield serialise(submission)
+
+    def _iter_serialised_submissions_in_processes(self, export_format: SubmissionExportFormatEnum) -> Iterator[str]:
+        """
+        Splits the submissions into partitions, in reference order, and has a pool of processes serialise them. Each
+        process loads its partitions itself, so all that's passed between processes is IDs and serialised output.
+        Results are yielded in the same order as they would be in this process.
+        """
+        self.submissions_processed = 0
+        submission_ids = get_submission_ids_with_mode_for_collection(self.collection.id, self.submission_mode)
+        partitions = [
+            submission_ids[i : i + SUBMISSION_EXPORT_PARTITION_SIZE]
+            for i in range(0, len(submission_ids), SUBMISSION_EXPORT_PARTITION_SIZE)
+        ]
+        serialise_partition = partial(
+            _serialise_submission_partition, self.submission_mode, export_format, self._max_add_another_counts
+        )
+
+        # Only keep a couple of partitions queued up per process, so that finished ones don't pile up in memory if
+        # they're being serialised faster than they're being streamed out.
+        pending: deque[Future[list[str]]] = deque()
+        with create_submission_export_process_pool(
+            self.export_processes, collection_id=self.collection.id, snapshot_id=self.export_snapshot_id
+        ) as pool:
+            try:
+                for partition in partitions:
+                    pending.append(pool.submit(serialise_partition, partition))
+                    if len(pending) >= self.export_processes * 2:
+                        for serialised in pending.popleft().result():
+                            yield serialised
+                            self.submissions_processed += 1
+
+                while pending:
+                    for serialised in pending.popleft().result():
+                        yield serialised
+                        self.submissions_processed += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def iter_csv_content_for_all_submissions(self) -> Iterator[str]:
+        """
+        Generates the CSV export one line at a time, so that it can be streamed to the client without the whole file
+        being held in memory.
+        """
+        csv_headers = self._get_csv_headers()
+
+        header = StringIO()
+        csv.DictWriter(header, fieldnames=csv_headers[0]).writeheader()
+        yield header.getvalue()
+
+        yield from self._iter_serialised_submissions(SubmissionExportFormatEnum.CSV, csv_headers)
+
+    def generate_csv_content_for_all_submissions(self) -> str:
+        return "".join(self.iter_csv_content_for_all_submissions())
+
+    def iter_xlsx_content_for_all_submissions(self) -> Iterator[bytes]:
+        """
+        Generates the same rows as the CSV export as an Excel workbook, with numbers, yes/no answers and dates stored as
+        such rather than as text. Like the CSV export, it's streamed a piece at a time.
+        """
+        csv_headers = self._get_csv_headers()
+        rows = chain(
+            [xlsx_row(csv_headers[0])],
+            self._iter_serialised_submissions(SubmissionExportFormatEnum.XLSX, csv_headers),
+        )
+        return iter_xlsx(rows, sheet_name=self.collection.name)
+
+    def _get_json_submission(self, submission: SubmissionHelper) -> dict[str, Any]:
+        submission.preload_answers()
+        submission_data: dict[str, Any] = {
+            "reference": submission.reference,
+            "grant_recipient": (
+                submission.submission.grant_recipient.organisation.name
+                if submission.submission.grant_recipient
+                else None
+            ),
+        }
+
+        if self.collection.allow_multiple_submissions:
+            submission_data["name"] = submission.submission_name
+
+        submission_data["created_by"] = submission.created_by_email
+        submission_data["created_at_utc"] = submission.created_at_utc.isoformat(" ", "seconds")
+        submission_data["status"] = submission.status
+        submission_data["submitted_at_utc"] = (
+            submission.submitted_at_utc.isoformat(" ", "seconds") if submission.submitted_at_utc else None
+        )
+
+        if self.collection.requires_certification:
+            submission_data["certified_by"] = (
+                submission.events.submission_state.certified_by.email
+                if submission.events.submission_state.certified_by
+                else None
+            )
+            submission_data["certified_at_utc"] = (
+                submission.events.submission_state.certified_at_utc.isoformat(" ", "seconds")
+                if submission.events.submission_state.certified_at_utc
+                else None
+            )
+
+        submission_data["sections"] = []
+
+        for form in submission.get_ordered_visible_forms():
+            task_data: dict[str, Any] = {"name": form.title, "answers": {}}
+
+            add_another_contexts = []
+            for question in submission.cached_get_ordered_visible_questions(form):
+                if question.add_another_container:
+                    if question.add_another_container.id not in add_another_contexts:
+                        add_another_contexts.append(question.add_another_container.id)
+                        task_data["answers"][question.add_another_container.name.lower()] = []
+
+                        for i in range(submission.get_count_for_add_another(question.add_another_container)):
+                            entry = {}
 
-            visible_questions = submission.all_visible_questions
-            cached_contexts: dict[str, ExpressionContext] = {}
-            for question, header_string, index in question_headers:
-                if not question.add_another_container:
-                    if question.id not in visible_questions.keys():
-                        submission_csv_data[header_string] = NOT_ASKED
-                    else:
-                        answer = submission.cached_get_answer_for_question(question.id)
-                        submission_csv_data[header_string] = (
-                            answer.get_value_for_text_export() if answer is not None else NOT_ANSWERED
-                        )
-                else:
-                    assert index is not None
-                    if submission.get_count_for_add_another(question.add_another_container) <= index:
-                        # this submission didn't provide this many answers as so wasn't asked this question
-                        submission_csv_data[header_string] = NOT_ASKED
-                    else:
-                        context_key = f"{question.add_another_container.id}{index}"
-                        context = cached_contexts.get(context_key)
-                        if not context:
                             context = submission.cached_evaluation_context.with_add_another_context(
                                 question.add_another_container,
                                 data_manager=submission.submission.data_manager,
-                                add_another_index=index,
+                                add_another_index=i,
                             )
-                            cached_contexts[context_key] = context
+                            for q in submission.cached_get_ordered_visible_questions(
+                                question.add_another_container, override_context=context
+                            ):
+                                answer = submission.cached_get_answer_for_question(q.id, add_another_index=i)
+                                entry[q.name] = answer.get_value_for_json_export() if answer is not None else None
+                            task_data["answers"][question.add_another_container.name.lower()].append(entry)
+                else:
+                    answer = submission.cached_get_answer_for_question(question.id)
+                    task_data["answers"][question.name] = (
+                        answer.get_value_for_json_export() if answer is not None else None
+                    )
+            submission_data["sections"].append(task_data)
 
-                        if submission.is_component_visible(question, context):
-                            answer = submission.cached_get_answer_for_question(question.id, add_another_index=index)
-                            submission_csv_data[header_string] = (
-                                answer.get_value_for_text_export() if answer is not None else NOT_ANSWERED
-                            )
-                        else:
-                            submission_csv_data[header_string] = NOT_ASKED
+        return submission_data
+
+    def iter_json_content_for_all_submissions(self, *, ndjson: bool = False) -> Iterator[str]:
+        """
+        Generates the JSON export one submission at a time, so that it can be streamed to the client without the whole
+        document being held in memory. The output is the same as `json.dumps({"submissions": [...]})`.
 
-            csv_writer.writerow(submission_csv_data)
+        With `ndjson`, each submission is written as its own JSON object on a separate line instead, without the
+        surrounding document, for tools that load exports a record at a time.
+        """
+        if ndjson:
+            for serialised in self._iter_serialised_submissions(SubmissionExportFormatEnum.JSON):
+                yield serialised + "\n"
+            return
 
-        return csv_output.getvalue()
+        yield '{"submissions": ['
+        for i, serialised in enumerate(self._iter_serialised_submissions(SubmissionExportFormatEnum.JSON)):
+            yield (", " if i else "") + serialised
+        yield "]}"
 
     def generate_json_content_for_all_submissions(self) -> str:
-        submissions_data: dict[str, Any] = {"submissions": []}
-        for submission in self.submission_helpers.values():
-            submission_data: dict[str, Any] = {
-                "reference": submission.reference,
-                "grant_recipient": (
-                    submission.submission.grant_recipient.organisation.name
-                    if submission.submission.grant_recipient
-                    else None
-                ),
-            }
+        return "".join(self.iter_json_content_for_all_submissions())
 
-            if self.collection.allow_multiple_submissions:
-                submission_data["name"] = submission.submission_name
+    def get_json_submission_changes(
+        self,
+        *,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int,
+    ) -> tuple[list[dict[str, Any]], tuple[datetime, UUID] | None]:
+        """
+        A page of the submissions that have changed since `since`, in the same shape as the JSON export, ordered by
+        when they last changed. Also returns what to pass as `after` to get the next page, or None if this is the last.
+        See `get_changed_submissions_for_collection`.
+        """
+        changes = get_changed_submissions_for_collection(
+            self.collection.id, self.submission_mode, since=since, until=until, after=after, limit=limit
+        )
+        positions = {submission_id: position for position, (submission_id, _) in enumerate(changes)}
 
-            submission_data["created_by"] = submission.created_by_email
-            submission_data["created_at_utc"] = submission.created_at_utc.isoformat(" ", "seconds")
-            submission_data["status"] = submission.status
-            submission_data["submitted_at_utc"] = (
-                submission.submitted_at_utc.isoformat(" ", "seconds") if submission.submitted_at_utc else None
-            )
+        page: list[dict[str, Any] | None] = [None] * len(changes)
+        for chunk in iter_submissions_with_mode_for_collection(
+            self.collection, self.submission_mode, submission_ids=list(positions)
+        ):
+            for submission in chunk:
+                page[positions[submission.id]] = self._get_json_submission(SubmissionHelper(submission))
 
-            if self.collection.requires_certification:
-                submission_data["certified_by"] = (
-                    submission.events.submission_state.certified_by.email
-                    if submission.events.submission_state.certified_by
-                    else None
-                )
-                submission_data["certified_at_utc"] = (
-                    submission.events.submission_state.certified_at_utc.isoformat(" ", "seconds")
-                    if submission.events.submission_state.certified_at_utc
-                    else None
-                )
+        next_after = (changes[-1][1], changes[-1][0]) if len(changes) == limit else None
+        # A submission could have been deleted since its ID was read.
+        return [submission for submission in page if submission is not None], next_after
+
+
+# How many submissions each process serialises at a time when exporting in separate processes.
+SUBMISSION_EXPORT_PARTITION_SIZE = 500
+
+_submission_export_process_collection: Collection | None = None
+
+
+def create_submission_export_process_pool(
+    max_workers: int, *, collection_id: UUID, snapshot_id: str | None
+) -> ProcessPoolExecutor:
+    # Processes are spawned rather than forked so that they don't inherit this process's database connections (or,
+    # under gunicorn, its gevent state).
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_submission_export_process,
+        initargs=(collection_id, snapshot_id),
+    )
 
-            submission_data["sections"] = []
-
-            for form in submission.get_ordered_visible_forms():
-                task_data: dict[str, Any] = {"name": form.title, "answers": {}}
-
-                add_another_contexts = []
-                for question in submission.cached_get_ordered_visible_questions(form):
-                    if question.add_another_container:
-                        if question.add_another_container.id not in add_another_contexts:
-                            add_another_contexts.append(question.add_another_container.id)
-                            task_data["answers"][question.add_another_container.name.lower()] = []
-
-                            for i in range(submission.get_count_for_add_another(question.add_another_container)):
-                                entry = {}
-
-                                context = submission.cached_evaluation_context.with_add_another_context(
-                                    question.add_another_container,
-                                    data_manager=submission.submission.data_manager,
-                                    add_another_index=i,
-                                )
-                                for q in submission.cached_get_ordered_visible_questions(
-                                    question.add_another_container, override_context=context
-                                ):
-                                    answer = submission.cached_get_answer_for_question(q.id, add_another_index=i)
-                                    entry[q.name] = answer.get_value_for_json_export() if answer is not None else None
-                                task_data["answers"][question.add_another_container.name.lower()].append(entry)
-                    else:
-                        answer = submission.cached_get_answer_for_question(question.id)
-                        task_data["answers"][question.name] = (
-                            answer.get_value_for_json_export() if answer is not None else None
-                        )
-                submission_data["sections"].append(task_data)
 
-            submissions_data["submissions"].append(submission_data)
+def _init_submission_export_process(collection_id: UUID, snapshot_id: str | None) -> None:
+    # Imported here because `app` imports this module.
+    from app import create_app
 
-        return json.dumps(submissions_data)
+    _start_submission_export_process(create_app(), collection_id, snapshot_id)
+
+
+def _start_submission_export_process(app: Flask, collection_id: UUID, snapshot_id: str | None) -> None:
+    """
+    Loads the collection being exported once for the life of an export process. The app context, and with it the
+    session's transaction, is kept open until the process exits, so that every partition the process serialises
+    shares the collection and reads from the same snapshot.
+    """
+    global _submission_export_process_collection
+
+    app.app_context().push()
+    if snapshot_id is not None:
+        use_submission_export_snapshot(snapshot_id)
+    _submission_export_process_collection = get_collection(collection_id, with_full_schema=True)
+
+
+def _serialise_submission_partition(
+    submission_mode: SubmissionModeEnum,
+    export_format: SubmissionExportFormatEnum,
+    max_add_another_counts: dict[UUID, int] | None,
+    submission_ids: Sequence[UUID],
+) -> list[str]:
+    """
+    Runs in an export process: loads a partition of a collection's submissions and serialises them, using the same
+    add another column counts as the process that's merging the results so that CSV rows line up with its header.
+    """
+    collection = _submission_export_process_collection
+    assert collection is not None, "Only call this from a submission export process pool"
+
+    helper = AllSubmissionsHelper(collection=collection, submission_mode=submission_mode, stream_submissions=True)
+    helper._max_add_another_counts = max_add_another_counts
+    serialise = helper._get_submission_serialiser(export_format)
+
+    return [
+        serialise(SubmissionHelper(submission))
+        for chunk in iter_submissions_with_mode_for_collection(
+            collection, submission_mode, submission_ids=submission_ids
+        )
+        for submission in chunk
+    ]
 
 
 class CollectionHelper:
@@ -0,0 +1,102 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.common.data.models import Collection, Component
+
+
+@dataclass(frozen=True)
+class CollectionDependencyGraph:
+    """
+    A read-only map of which components in a collection depend on which others for their visibility.
+
+    An edge is recorded from D to C when C's visibility could change as a result of D changing, ie when:
+      * C owns a component reference to D (a managed/custom condition, or an interpolation of D's answer); or
+      * one of C's conditions refers to D's answer directly; or
+      * D is the group that contains C, as C is only shown when its parent chain is.
+
+    Following these edges transitively covers the same components that `Component.get_full_condition_chain` walks,
+    but in reverse: from a changed question out to everything that needs re-evaluating. This lets the
+    `SubmissionHelper` keep its cached results for unrelated parts of the collection when a single answer changes.
+
+    It's built as part of a collection's `CollectionPlan`, so it's shared by every submission helper for the same loaded
+    collection but built again for each request. It only holds IDs, not ORM instances.
+    """
+
+    collection_id: uuid.UUID
+    form_ids: Mapping[uuid.UUID, uuid.UUID]
+    ancestor_ids: Mapping[uuid.UUID, tuple[uuid.UUID, ...]]
+    dependents: Mapping[uuid.UUID, frozenset[uuid.UUID]]
+
+    @classmethod
+    def build(cls, collection: Collection) -> CollectionDependencyGraph:
+        form_ids: dict[uuid.UUID, uuid.UUID] = {}
+        ancestor_ids: dict[uuid.UUID, tuple[uuid.UUID, ...]] = {}
+        dependents: defaultdict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+
+        for form in collection.forms:
+            for component in form.cached_all_components:
+                form_ids[component.id] = form.id
+
+                ancestors = []
+                parent = component.parent
+                while parent:
+                    ancestors.append(parent.id)
+                    parent = parent.parent
+                ancestor_ids[component.id] = tuple(ancestors)
+
+                for depends_on_id in _get_depended_on_component_ids(component):
+                    dependents[depends_on_id].add(component.id)
+
+        return cls(
+            collection_id=collection.id,
+            form_ids=form_ids,
+            ancestor_ids=ancestor_ids,
+            dependents={component_id: frozenset(ids) for component_id, ids in dependents.items()},
+        )
+
+    def contains(self, component_ids: Iterable[uuid.UUID]) -> bool:
+        return all(component_id in self.form_ids for component_id in component_ids)
+
+    def get_affected_component_ids(self, component_ids: Iterable[uuid.UUID]) -> frozenset[uuid.UUID]:
+        """Returns the given components plus every component whose visibility transitively depends on them."""
+        affected = set(component_ids)
+        to_visit = list(affected)
+        while to_visit:
+            for dependent_id in self.dependents.get(to_visit.pop(), ()):
+                if dependent_id not in affected:
+                    affected.add(dependent_id)
+                    to_visit.append(dependent_id)
+        return frozenset(affected)
+
+    def get_affected_container_ids(self, component_ids: Iterable[uuid.UUID]) -> frozenset[uuid.UUID]:
+        """Returns the forms and groups containing any of the components affected by a change to `component_ids`."""
+        containers = set()
+        for component_id in self.get_affected_component_ids(component_ids):
+            containers.add(self.form_ids[component_id])
+            containers.update(self.ancestor_ids[component_id])
+        return frozenset(containers)
+
+
+def _get_depended_on_component_ids(component: Component) -> set[uuid.UUID]:
+    depends_on_ids = {
+        ref.depends_on_component.id
+        for ref in component.owned_component_references
+        if ref.depends_on_component is not None
+    }
+
+    # Component references should already cover conditions, but reading the statements as well means we don't rely on
+    # every condition having had its references synced.
+    for condition in component.conditions:
+        for reference in condition.statement.references:
+            if (question_id := reference.question_id) is not None:
+                depends_on_ids.add(question_id)
+
+    if component.parent:
+        depends_on_ids.add(component.parent.id)
+
+    depends_on_ids.discard(component.id)
+    return depends_on_ids
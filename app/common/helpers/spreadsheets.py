@@ -0,0 +1,155 @@
+"""
+A minimal streaming writer for Excel (XLSX) workbooks with a single sheet.
+
+Rows are serialised to SpreadsheetML one at a time and compressed into the workbook's zip as they're written, so a
+large sheet never has to be held in memory. Cells keep their types: numbers, booleans and dates are written as Excel
+numbers, booleans and dates rather than text, so that they don't need converting after opening the file.
+"""
+
+import datetime
+import re
+import zipfile
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from typing import Any
+from xml.sax.saxutils import escape, quoteattr
+
+from app.common.helpers.zips import ChunkBuffer
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Excel's maximum sheet name length.
+_MAX_SHEET_NAME_LENGTH = 31
+
+# Excel counts days from 1900-01-00, but wrongly treats 1900 as a leap year, so for any modern date the epoch is
+# effectively 1899-12-30.
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+# Indexes into `cellXfs` in the styles below.
+_DATE_STYLE = 1
+_DATETIME_STYLE = 2
+
+# Characters that aren't allowed in XML 1.0 documents at all, even escaped.
+_ILLEGAL_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+    "</fills>"
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    "</cellXfs>"
+    "</styleSheet>"
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = "</sheetData></worksheet>"
+
+
+def _workbook(sheet_name: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+
+
+def _excel_date_number(value: datetime.date) -> str:
+    if not isinstance(value, datetime.datetime):
+        return str((value - _EXCEL_EPOCH.date()).days)
+
+    delta = value.replace(tzinfo=None) - _EXCEL_EPOCH
+    return repr(delta.days + delta.seconds / 86_400)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    # `bool` is a subclass of `int`, so this has to come first.
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int | Decimal | float):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime.datetime):
+        return f'<c s="{_DATETIME_STYLE}"><v>{_excel_date_number(value)}</v></c>'
+    if isinstance(value, datetime.date):
+        return f'<c s="{_DATE_STYLE}"><v>{_excel_date_number(value)}</v></c>'
+
+    text = escape(_ILLEGAL_XML_CHARACTERS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def xlsx_row(values: Iterable[Any]) -> str:
+    """Serialises one row of cells, to be passed to `iter_xlsx`."""
+    return "<row>" + "".join(_cell(value) for value in values) + "</row>"
+
+
+def iter_xlsx(rows: Iterable[str], *, sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    """
+    Generates an XLSX workbook with one sheet containing `rows` (each serialised with `xlsx_row`), yielding the file
+    a piece at a time as rows are compressed.
+    """
+    sheet_name = _ILLEGAL_XML_CHARACTERS.sub("", re.sub(r"[\[\]:*?/\\]", " ", sheet_name))[:_MAX_SHEET_NAME_LENGTH]
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", _workbook(sheet_name or "Sheet1"))
+        workbook.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        workbook.writestr("xl/styles.xml", _STYLES)
+
+        with workbook.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_START.encode())
+            for row in rows:
+                sheet.write(row.encode())
+                if chunk := buffer.take():
+                    yield chunk
+            sheet.write(_SHEET_END.encode())
+
+    yield buffer.take()
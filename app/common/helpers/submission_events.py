@@ -281,21 +281,66 @@ def _get_static_data(event_class: type[SubmissionEventBase]) -> dict[str, Any]:
 
 
 class SubmissionEventHelper:
+    """
+    Folds a submission's events into the current state of the submission and each of its forms.
+
+    Events are immutable and only ever appended, so the fold is memoised: each event is reduced once per helper, and
+    events added since the last access (eg by `SubmissionHelper.add_submission_event`) are applied on top of the
+    previous result. If the events have changed in any other way (eg been reloaded) everything is folded again.
+    """
+
     def __init__(self, submission: Submission):
         self.submission = submission
+        self._source_event_ids: list[int] = []
+        self._folded_events: list[SubmissionEvent] = []
+        self._states: dict[UUID, dict[str, Any]] = {}
+        self._submission_state: SubmissionState | None = None
+        self._form_states: dict[UUID, FormState] = {}
 
     @property
     def events(self) -> list[SubmissionEvent]:
         return sorted(self.submission.events, key=lambda x: x.created_at_utc, reverse=False)
 
     def form_state(self, form_id: UUID) -> FormState:
-        return FormState(**self._reduce([e for e in self.events if e.related_entity_id == form_id]))
+        self._fold_new_events()
+        if form_id not in self._form_states:
+            self._form_states[form_id] = FormState(**self._states.get(form_id, {}))
+        return self._form_states[form_id]
 
     @property
     def submission_state(self) -> SubmissionState:
-        return SubmissionState(**self._reduce([e for e in self.events if e.related_entity_id == self.submission.id]))
-
-    def _reduce(self, events: list[SubmissionEvent]) -> dict[str, Any]:
+        self._fold_new_events()
+        if self._submission_state is None:
+            self._submission_state = SubmissionState(**self._states.get(self.submission.id, {}))
+        return self._submission_state
+
+    def _fold_new_events(self) -> None:
+        source_event_ids = [id(event) for event in self.submission.events]
+        if source_event_ids == self._source_event_ids:
+            return
+
+        events = self.events
+        num_folded = len(self._folded_events)
+        if len(events) < num_folded or any(a is not b for a, b in zip(events, self._folded_events, strict=False)):
+            self._states, num_folded = {}, 0
+
+        new_events = events[num_folded:]
+        for event in new_events:
+            self._states[event.related_entity_id] = self._reduce([event], self._states.get(event.related_entity_id))
+
+        changed_entity_ids = {event.related_entity_id for event in new_events}
+        if num_folded == 0 or self.submission.id in changed_entity_ids:
+            self._submission_state = None
+        self._form_states = {
+            form_id: state
+            for form_id, state in self._form_states.items()
+            if num_folded > 0 and form_id not in changed_entity_ids
+        }
+
+        self._source_event_ids = source_event_ids
+        self._folded_events = events
+
+    def _reduce(self, events: list[SubmissionEvent], state: dict[str, Any] | None = None) -> dict[str, Any]:
         """
         An internal method to combine the full list of submission events into one snapshot
         representation, we take all of the data properties from each event in time order where
@@ -319,7 +364,7 @@ class SubmissionEventHelper:
         Because SUBMISSION_SUBMITTED was recorded after SUBMISSION_SENT_FOR_CERTIFICATION the overlapping
         property "is_awaiting_sign_off" will take its value.
         """
-        state: dict[str, Any] = {}
+        state = dict(state or {})
         for event in events:
             event_class = _get_event_class(event.event_type)
             state = state | _get_static_data(event_class) | event.data | self._extract_metadata(event)
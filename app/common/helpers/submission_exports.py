@@ -0,0 +1,391 @@
+import codecs
+import datetime
+import hashlib
+import os
+import tempfile
+import time
+import zipfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, cast
+
+from flask import current_app
+from werkzeug.utils import secure_filename
+
+from app.common.data import interfaces
+from app.common.data.interfaces.collections import get_collection
+from app.common.data.interfaces.submission_exports import (
+    begin_submission_export_snapshot,
+    claim_next_submission_export_job,
+    complete_submission_export_job,
+    fail_submission_export_job,
+    get_submission_export_watermark,
+    update_submission_export_job_progress,
+)
+from app.common.data.types import SubmissionExportFormatEnum, SubmissionModeEnum
+from app.common.helpers.collections import AllSubmissionsHelper, SubmissionHelper
+from app.common.helpers.pdf import render_pdf
+from app.common.helpers.spreadsheets import XLSX_MIMETYPE
+from app.common.helpers.submission_pdfs import render_submission_pdf_html
+from app.common.helpers.zips import iter_zip
+from app.extensions import pdf_renderer, s3_service
+from app.services.pdf_renderer import PdfRendererBusyError
+
+if TYPE_CHECKING:
+    from app.common.data.models import Collection, SubmissionExportJob
+
+# How often a running export job reports how far through it is.
+SUBMISSION_EXPORT_PROGRESS_INTERVAL = 50
+
+# Exports are written to disk once they get bigger than this, rather than being held in memory until they're uploaded.
+SUBMISSION_EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# How long an export of every submission's PDF waits for the renderer to catch up when other requests' PDFs have filled
+# its queue, before giving up.
+SUBMISSION_PDF_EXPORT_BUSY_RETRY_SECONDS = 1
+SUBMISSION_PDF_EXPORT_BUSY_RETRIES = 60
+
+DEFAULT_SUBMISSION_EXPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "funding-service-submission-exports")
+SUBMISSION_EXPORT_CACHE_READ_SIZE = 64 * 1024
+
+SUBMISSION_EXPORT_MIMETYPES = {
+    SubmissionExportFormatEnum.CSV: "text/csv",
+    SubmissionExportFormatEnum.JSON: "application/json",
+    SubmissionExportFormatEnum.NDJSON: "application/x-ndjson",
+    SubmissionExportFormatEnum.XLSX: XLSX_MIMETYPE,
+    SubmissionExportFormatEnum.PDF_ZIP: "application/zip",
+}
+
+
+@dataclass(frozen=True)
+class SubmissionExport:
+    chunks: Iterator[str] | Iterator[bytes]
+    mimetype: str
+    # `None` for binary formats, whose chunks are already bytes.
+    encoding: str | None
+
+    def iter_encoded(self) -> Iterator[bytes]:
+        if self.encoding is None:
+            yield from cast(Iterator[bytes], self.chunks)
+            return
+
+        # An incremental encoder only writes the BOM for `utf-8-sig` once, at the start of the file.
+        encoder = codecs.getincrementalencoder(self.encoding)()
+        for chunk in cast(Iterator[str], self.chunks):
+            if encoded := encoder.encode(chunk):
+                yield encoded
+        if encoded := encoder.encode("", final=True):
+            yield encoded
+
+
+def get_submission_export(helper: AllSubmissionsHelper, export_format: SubmissionExportFormatEnum) -> SubmissionExport:
+    chunks: Iterator[str] | Iterator[bytes]
+    encoding: str | None
+    match export_format:
+        case SubmissionExportFormatEnum.CSV:
+            chunks = helper.iter_csv_content_for_all_submissions()
+            encoding = "utf-8-sig"  # Helps Excel open in UTF-8 mode so that eg `£` doesn't get mangled to `Â£`
+
+        case SubmissionExportFormatEnum.JSON:
+            chunks = helper.iter_json_content_for_all_submissions()
+            encoding = "utf-8"
+
+        case SubmissionExportFormatEnum.NDJSON:
+            chunks = helper.iter_json_content_for_all_submissions(ndjson=True)
+            encoding = "utf-8"
+
+        case SubmissionExportFormatEnum.XLSX:
+            chunks = helper.iter_xlsx_content_for_all_submissions()
+            encoding = None
+
+        case SubmissionExportFormatEnum.PDF_ZIP:
+            chunks = iter_submission_pdfs_zip(helper)
+            encoding = None
+
+    return SubmissionExport(chunks=chunks, mimetype=SUBMISSION_EXPORT_MIMETYPES[export_format], encoding=encoding)
+
+
+def _render_pdf_when_not_busy(html_content: str) -> bytes:
+    for _ in range(SUBMISSION_PDF_EXPORT_BUSY_RETRIES):
+        try:
+            return pdf_renderer.render(html_content)
+        except PdfRendererBusyError:
+            time.sleep(SUBMISSION_PDF_EXPORT_BUSY_RETRY_SECONDS)
+
+    return pdf_renderer.render(html_content)
+
+
+def _get_submission_pdf_filename(submission: SubmissionHelper) -> str:
+    name = submission.reference
+    if grant_recipient := submission.submission.grant_recipient:
+        name = f"{name} - {grant_recipient.organisation.name}"
+    if submission.collection.allow_multiple_submissions:
+        name = f"{name} - {submission.submission_name}"
+    return secure_filename(f"{name}.pdf")
+
+
+def _iter_submission_pdfs(helper: AllSubmissionsHelper) -> Iterator[tuple[str, bytes]]:
+    """
+    Each submission's PDF, in order. With the PDF renderer running, the renderer converts up to its concurrency's worth
+    of pages at once while the next submissions' pages are rendered here, so only that many PDFs are ever in memory.
+    """
+    if not pdf_renderer.enabled:
+        for submission in helper.iter_submission_helpers():
+            yield _get_submission_pdf_filename(submission), render_pdf(render_submission_pdf_html(submission))
+        return
+
+    pending: deque[tuple[str, Future[bytes]]] = deque()
+    with ThreadPoolExecutor(max_workers=pdf_renderer.concurrency, thread_name_prefix="submission-pdfs") as executor:
+        try:
+            for submission in helper.iter_submission_helpers():
+                html_content = render_submission_pdf_html(submission)
+                pending.append(
+                    (_get_submission_pdf_filename(submission), executor.submit(_render_pdf_when_not_busy, html_content))
+                )
+                if len(pending) >= pdf_renderer.concurrency:
+                    filename, future = pending.popleft()
+                    yield filename, future.result()
+
+            while pending:
+                filename, future = pending.popleft()
+                yield filename, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def iter_submission_pdfs_zip(helper: AllSubmissionsHelper) -> Iterator[bytes]:
+    """A zip of every submission's PDF, as they would each be downloaded from the submission's page."""
+    # PDFs are already compressed, so deflating them again would cost time without making the zip any smaller.
+    return iter_zip(_iter_submission_pdfs(helper), compression=zipfile.ZIP_STORED)
+
+
+class SubmissionExportCache:
+    """
+    Keeps recently generated exports on local disk, so that downloading the same export again before any of its
+    submissions have changed is just a file read. Keys should change whenever the export's content would, so entries
+    never need invalidating; see `get_submission_export_cache_key`.
+
+    The cache is shared by every worker on the host. Entries are written to a temporary file and moved into place once
+    complete, and a hit bumps the file's modification time, so that once the directory grows beyond `max_size` the
+    least recently used entries can be removed. A `max_size` of 0 turns the cache off.
+    """
+
+    def __init__(self, directory: str, *, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.export")
+
+    def open(self, key: str) -> Iterator[bytes] | None:
+        path = self._path(key)
+        try:
+            file = open(path, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            return None
+
+        # If the entry is evicted between opening it and here, we can still read it through the open file.
+        with suppress(FileNotFoundError):
+            os.utime(path)
+
+        return self._iter_file(file)
+
+    @staticmethod
+    def _iter_file(file: IO[bytes]) -> Iterator[bytes]:
+        with file:
+            while chunk := file.read(SUBMISSION_EXPORT_CACHE_READ_SIZE):
+                yield chunk
+
+    def write_through(self, key: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Yields `chunks` while also saving them to the cache, as long as they're all generated successfully."""
+        os.makedirs(self.directory, exist_ok=True)
+        file: IO[bytes] | None = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False)  # noqa: SIM115
+        size = 0
+        try:
+            for chunk in chunks:
+                if file is not None:
+                    size += len(chunk)
+                    if size <= self.max_size:
+                        file.write(chunk)
+                    else:
+                        # Too big to ever fit, so don't bother writing the rest of it.
+                        self._discard(file)
+                        file = None
+                yield chunk
+
+        except BaseException:
+            # Including the client going away part way through the download (`GeneratorExit`).
+            if file is not None:
+                self._discard(file)
+            raise
+
+        if file is not None:
+            file.close()
+            # Another worker's eviction may have removed our temporary file while we were writing it.
+            with suppress(FileNotFoundError):
+                os.replace(file.name, self._path(key))
+            self._evict()
+
+    @staticmethod
+    def _discard(file: IO[bytes]) -> None:
+        file.close()
+        with suppress(FileNotFoundError):
+            os.unlink(file.name)
+
+    def _evict(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                with suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+            total_size -= size
+
+
+_submission_export_cache = SubmissionExportCache(DEFAULT_SUBMISSION_EXPORT_CACHE_DIR, max_size=0)
+
+
+def configure_submission_export_cache(directory: str | None, *, max_size: int) -> None:
+    global _submission_export_cache
+    _submission_export_cache = SubmissionExportCache(
+        directory or DEFAULT_SUBMISSION_EXPORT_CACHE_DIR, max_size=max_size
+    )
+
+
+def get_submission_export_cache_key(
+    collection: Collection, submission_mode: SubmissionModeEnum, export_format: SubmissionExportFormatEnum
+) -> str:
+    """
+    A key for everything an export's content depends on: the details of the collection that exports include (its name
+    is the XLSX sheet name, and certification adds columns), plus the watermark of its schema, its submissions and the
+    organisations and users named against them.
+    """
+    watermark = get_submission_export_watermark(collection.id, submission_mode=submission_mode)
+    parts = (
+        collection.id,
+        submission_mode,
+        export_format,
+        collection.name,
+        collection.requires_certification,
+        collection.allow_multiple_submissions,
+        *watermark,
+    )
+    return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def stream_submission_export(
+    collection: Collection, submission_mode: SubmissionModeEnum, export_format: SubmissionExportFormatEnum
+) -> Iterator[bytes]:
+    """
+    Streams an export of every submission, reusing the last one generated if none of them have changed since. The
+    collection's full schema is only loaded if the export needs generating.
+    """
+    cache = _submission_export_cache
+    key = get_submission_export_cache_key(collection, submission_mode, export_format) if cache.enabled else None
+    if key is not None and (cached := cache.open(key)) is not None:
+        return cached
+
+    collection = get_collection(collection.id, with_full_schema=True)
+    helper = AllSubmissionsHelper(collection=collection, submission_mode=submission_mode, stream_submissions=True)
+    chunks = get_submission_export(helper, export_format).iter_encoded()
+    return cache.write_through(key, chunks) if key is not None else chunks
+
+
+def get_submission_export_filename(
+    collection: Collection, submission_mode: SubmissionModeEnum, export_format: SubmissionExportFormatEnum
+) -> str:
+    return f"{collection.name} - {submission_mode.name.lower()}.{export_format}"
+
+
+def get_submission_export_s3_key(job: SubmissionExportJob) -> str:
+    return f"{job.collection.s3_key_prefix(submission_mode=job.submission_mode)}/exports/{job.id}.{job.export_format}"
+
+
+def run_submission_export_job(job: SubmissionExportJob) -> None:
+    export_processes = current_app.config["SUBMISSION_EXPORT_PROCESSES"]
+    # Export processes read their submissions in transactions of their own, so share this one's snapshot with them.
+    snapshot_id = begin_submission_export_snapshot() if export_processes else None
+
+    collection = get_collection(job.collection_id, with_full_schema=True)
+    helper = AllSubmissionsHelper(
+        collection=collection,
+        submission_mode=job.submission_mode,
+        stream_submissions=True,
+        export_processes=export_processes,
+        export_snapshot_id=snapshot_id,
+    )
+    export = get_submission_export(helper, job.export_format)
+    s3_key = get_submission_export_s3_key(job)
+
+    # Progress is also reported on a timer, even if it hasn't changed, so that slow exports aren't mistaken for ones
+    # whose worker has died.
+    heartbeat_seconds = current_app.config["SUBMISSION_EXPORT_JOB_HEARTBEAT_SECONDS"]
+    reported_progress, reported_at = 0, time.monotonic()
+    with tempfile.SpooledTemporaryFile(max_size=SUBMISSION_EXPORT_SPOOL_MAX_SIZE) as file:
+        for chunk in export.iter_encoded():
+            file.write(chunk)
+
+            if (
+                helper.submissions_processed - reported_progress >= SUBMISSION_EXPORT_PROGRESS_INTERVAL
+                or time.monotonic() - reported_at >= heartbeat_seconds
+            ):
+                reported_progress, reported_at = helper.submissions_processed, time.monotonic()
+                update_submission_export_job_progress(job.id, submissions_exported=reported_progress)
+
+            # Let other greenlets run between submissions when we're in a gevent worker.
+            time.sleep(0)
+
+        file.seek(0)
+        s3_service.upload_fileobj(file, s3_key, content_type=export.mimetype)
+
+    if snapshot_id is not None:
+        # The job has had its progress updated since the snapshot was taken, so it can't be updated from within it.
+        interfaces.rollback()
+
+    complete_submission_export_job(job, s3_key=s3_key, submissions_exported=helper.submissions_processed)
+
+
+def process_next_submission_export_job() -> bool:
+    """Claims and runs the next waiting export job, if there is one. Registered as a background job handler."""
+    job = claim_next_submission_export_job(
+        stale_after=datetime.timedelta(seconds=current_app.config["SUBMISSION_EXPORT_JOB_STALE_AFTER_SECONDS"])
+    )
+    if job is None:
+        return False
+
+    if job.attempts > current_app.config["SUBMISSION_EXPORT_JOB_MAX_ATTEMPTS"]:
+        # Every worker that has claimed this job so far has died part way through it (eg by running out of memory), so
+        # give up rather than letting it take down another one.
+        current_app.logger.error(
+            "Submission export job %(job_id)s abandoned after %(attempts)s attempts",
+            dict(job_id=job.id, attempts=job.attempts - 1),
+        )
+        fail_submission_export_job(job)
+        return True
+
+    # Commit the claim straight away so that other workers can see it while this one runs the export.
+    interfaces.commit()
+
+    try:
+        run_submission_export_job(job)
+    except Exception:
+        current_app.logger.exception("Submission export job %(job_id)s failed", dict(job_id=job.id))
+        interfaces.rollback()
+        fail_submission_export_job(job)
+
+    return True
@@ -0,0 +1,126 @@
+"""
+Renders submissions as PDFs, caching the PDFs of submissions that can't change any more.
+
+Once a submission is in an immutable state, its PDF stays the same until it's reopened or has changes requested, both
+of which add events to it. So PDFs are cached in S3 alongside the submission's files, keyed by its latest event, and
+rendered in the background as soon as it's submitted so that even the first download doesn't launch a browser. Cached
+PDFs are deleted when the submission is reopened, rather than being left to linger once they can't be used.
+"""
+
+import enum
+import io
+
+from flask import current_app, has_request_context, render_template, request, url_for
+
+from app.common.data import interfaces
+from app.common.data.interfaces.submission_pdfs import claim_next_submission_pdf_job, delete_submission_pdf_job
+from app.common.helpers.collections import SubmissionHelper
+from app.common.helpers.pdf import render_pdf
+from app.extensions import s3_service
+
+# Bump this when the print template changes in a way that should show in PDFs that have already been cached.
+SUBMISSION_PDF_CACHE_VERSION = 1
+
+
+class SubmissionPdfAudience(enum.StrEnum):
+    """Which service's version of the PDF to render; they're branded differently."""
+
+    DELIVER = "deliver_grant_funding"
+    ACCESS = "access_grant_funding"
+
+
+def render_submission_pdf_html(
+    submission: SubmissionHelper, audience: SubmissionPdfAudience = SubmissionPdfAudience.DELIVER
+) -> str:
+    if audience == SubmissionPdfAudience.DELIVER:
+        context = dict(grant=submission.grant)
+        url_values = dict(grant_id=submission.grant.id, submission_id=submission.id)
+    else:
+        grant_recipient = submission.grant_recipient
+        context = dict(grant_recipient=grant_recipient)
+        url_values = dict(
+            organisation_id=grant_recipient.organisation_id,
+            grant_id=grant_recipient.grant_id,
+            collection_type=submission.collection.type,
+            submission_id=submission.id,
+        )
+
+    def _render() -> str:
+        return render_template(
+            "common/submission_print_baseline.html",
+            submission=submission,
+            interpolate=SubmissionHelper.get_interpolator(
+                collection=submission.collection, submission_helper=submission
+            ),
+            **context,
+        )
+
+    if has_request_context() and request.blueprint == audience:
+        return _render()
+
+    # Outside of one of the service's requests (eg in a background job), render the page as it would be for the route
+    # that downloads it.
+    with current_app.test_request_context(url_for(f"{audience}.export_submission_pdf", **url_values)):
+        return _render()
+
+
+def get_submission_pdf_s3_key(submission: SubmissionHelper, audience: SubmissionPdfAudience) -> str | None:
+    """Where the submission's PDF is cached, or None if it could still change and so can't be."""
+    if not current_app.config["SUBMISSION_PDF_CACHE_ENABLED"] or not submission.in_immutable_state:
+        return None
+
+    if not (events := submission.submission.events):
+        return None
+
+    # Events added in the same transaction share a timestamp, so break ties by ID to pick the same one every time.
+    last_event = max(events, key=lambda event: (event.created_at_utc, event.id))
+    return f"{submission.submission.pdfs_s3_key_prefix}{last_event.id}-{audience}-v{SUBMISSION_PDF_CACHE_VERSION}.pdf"
+
+
+def get_submission_pdf(submission: SubmissionHelper, audience: SubmissionPdfAudience) -> bytes:
+    """The submission's PDF, from the cache if it has one, otherwise rendered (and cached if it can't change)."""
+    s3_key = get_submission_pdf_s3_key(submission, audience)
+    if s3_key is not None and (cached := s3_service.download_file_if_exists(s3_key)) is not None:
+        return cached
+
+    pdf_bytes = render_pdf(render_submission_pdf_html(submission, audience))
+
+    if s3_key is not None:
+        try:
+            s3_service.upload_fileobj(io.BytesIO(pdf_bytes), s3_key, content_type="application/pdf")
+        except Exception:
+            # The PDF is still fine to use; it'll just be rendered again next time.
+            current_app.logger.exception(
+                "Failed to cache PDF for submission %(submission_id)s", dict(submission_id=submission.id)
+            )
+
+    return pdf_bytes
+
+
+def process_next_submission_pdf_job() -> bool:
+    """Claims and runs the next waiting PDF job, if there is one. Registered as a background job handler."""
+    job = claim_next_submission_pdf_job()
+    if job is None:
+        return False
+
+    # Delete the job before rendering so that it isn't kept locked, with a transaction open, while the browser runs. If
+    # the worker dies part way through, the PDFs are rendered when they're first downloaded instead.
+    submission_id = job.submission_id
+    delete_submission_pdf_job(job)
+    interfaces.commit()
+
+    try:
+        submission = SubmissionHelper.load(submission_id)
+        for audience in SubmissionPdfAudience:
+            # Only live and test submissions belong to a grant recipient, who can download them from Access.
+            if audience == SubmissionPdfAudience.ACCESS and submission.submission.grant_recipient is None:
+                continue
+            get_submission_pdf(submission, audience)
+    except Exception:
+        # Not worth retrying: the PDF will be rendered when it's first downloaded instead.
+        current_app.logger.exception(
+            "Failed to render PDFs for submission %(submission_id)s", dict(submission_id=submission_id)
+        )
+        interfaces.rollback()
+
+    return True
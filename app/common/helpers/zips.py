@@ -0,0 +1,40 @@
+"""
+Streams zip files a piece at a time, so that a large one never has to be held in memory. Entries are written with data
+descriptors rather than by seeking back to fill in their headers, which is what lets the output be a plain stream.
+"""
+
+import io
+import zipfile
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+class ChunkBuffer(io.RawIOBase):
+    """A write-only stream that collects whatever is written to it until it's taken."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def take(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+
+def iter_zip(files: Iterable[tuple[str, bytes]], *, compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """Generates a zip of `files` (name and content pairs), yielding it as each file is added."""
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=compression) as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+            if chunk := buffer.take():
+                yield chunk
+
+    yield buffer.take()
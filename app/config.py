@@ -338,6 +338,41 @@ class _SharedConfig(_BaseConfig):
     # Max number of levels of nested groups
     MAX_NESTED_GROUP_LEVELS: int = 1
 
+    # Max number of parsed expression statements to keep in memory per worker
+    EXPRESSION_STATEMENT_CACHE_SIZE: int = 4096
+
+    # Saving answers only writes the paths in the submission data that changed, unless more than this many did, when
+    # rewriting the whole of it is simpler for Postgres than a chain of `jsonb_set` calls.
+    SUBMISSION_DATA_PATCH_MAX_KEYS: int = 20
+
+    # Background jobs (eg submission exports) are run by `flask run-background-jobs` in its own process. Turning this on
+    # polls for them from each web worker instead, which is only suitable for running everything in one process locally.
+    BACKGROUND_JOBS_ENABLED: bool = False
+    BACKGROUND_JOBS_POLL_INTERVAL_SECONDS: int = 5
+
+    # Generated submission exports are cached on local disk (shared by every worker on the host) until their
+    # submissions change, keeping the directory under this many bytes. 0 turns the cache off.
+    SUBMISSION_EXPORT_CACHE_DIR: str | None = None
+    SUBMISSION_EXPORT_CACHE_MAX_SIZE_BYTES: int = 1024 * 1024 * 1024
+
+    # Background submission exports can build their rows in this many separate processes, to use more than one CPU
+    # for very large collections. 0 builds them in the worker itself.
+    SUBMISSION_EXPORT_PROCESSES: int = 0
+
+    # A running export job refreshes its `updated_at_utc` at least this often. One that hasn't been refreshed for
+    # `SUBMISSION_EXPORT_JOB_STALE_AFTER_SECONDS` is assumed to belong to a worker that died, and is claimed again
+    # unless it has already been claimed `SUBMISSION_EXPORT_JOB_MAX_ATTEMPTS` times, in which case it's marked failed.
+    SUBMISSION_EXPORT_JOB_HEARTBEAT_SECONDS: int = 60
+    SUBMISSION_EXPORT_JOB_STALE_AFTER_SECONDS: int = 30 * 60
+    SUBMISSION_EXPORT_JOB_MAX_ATTEMPTS: int = 3
+
+    # Downstream systems (eg the data warehouse) can fetch just the submissions that have changed since they last
+    # looked from the submission changes API, using this token. The API is turned off if it isn't set.
+    SUBMISSION_CHANGES_API_TOKEN: str | None = None
+    # Changes are only returned once they're this old. Timestamps are taken when a transaction starts, so a slow
+    # transaction can commit a change dated before ones that have already been returned.
+    SUBMISSION_CHANGES_SETTLE_SECONDS: int = 300
+
     # Grant setup
     GGIS_TEAM_EMAIL: str = "ggis@communities.gov.uk"
     PIPELINE_GRANTS_SCHEME_FORM_URL: str = "https://forms.office.com.mcas.ms/pages/responsepage.aspx?id=EGg0v32c3kOociSi7zmVqBUKhC0CqZtGmIj1YcYa53xUNTFRWkRXQ1ZJUEJMOTg1UllGWEpCNDQ4NSQlQCN0PWcu&route=shorturl"
@@ -362,6 +397,18 @@ class _SharedConfig(_BaseConfig):
 
     PLAYWRIGHT_BROWSERS_PATH: str | None = None
 
+    # PDFs are rendered by a long-lived browser in a separate process for each worker, which renders this many pages
+    # at once. 0 launches a new browser in the worker itself for every PDF instead, one at a time.
+    PDF_RENDERER_CONCURRENCY: int = 4
+    # Once this many PDFs are waiting for a page (on top of those being rendered), new ones fail rather than queueing.
+    PDF_RENDERER_MAX_QUEUED: int = 16
+    PDF_RENDERER_MAX_RENDERS_PER_BROWSER: int = 500
+    PDF_RENDERER_TIMEOUT_SECONDS: int = 60
+
+    # PDFs of submissions that can't change any more are cached in S3 alongside their files, and rendered in the
+    # background as soon as they're submitted so that the first download doesn't have to wait for a browser either.
+    SUBMISSION_PDF_CACHE_ENABLED: bool = True
+
     # Jira data connector
     JIRA_DATA_CONNECTOR_API_TOKEN: str
 
@@ -415,6 +462,9 @@ class LocalConfig(_SharedConfig):
     # Jira data connector
     JIRA_DATA_CONNECTOR_API_TOKEN: str = "insecure-local-token"  # pragma: allowlist secret
 
+    # Submission changes API
+    SUBMISSION_CHANGES_API_TOKEN: str | None = "insecure-local-token"  # pragma: allowlist secret
+
     ASSETS_VITE_LIVE_ENABLED: bool = True
 
     AWS_S3_BUCKET_NAME: str = "local-bucket"
@@ -439,6 +489,16 @@ class UnitTestConfig(LocalConfig):
 
     AWS_S3_BUCKET_NAME: str = "test-bucket"
 
+    # `now()` is fixed for the whole of a test's transaction, so cache keys can't see changes made during a test.
+    SUBMISSION_EXPORT_CACHE_MAX_SIZE_BYTES: int = 0
+    # Likewise, changes made during a test are dated when it started, so they'd never be old enough to be returned.
+    SUBMISSION_CHANGES_SETTLE_SECONDS: int = 0
+
+    # Render PDFs in the test process, where they can be mocked.
+    PDF_RENDERER_CONCURRENCY: int = 0
+    # Tests that need the PDF cache turn it on themselves, with S3 mocked.
+    SUBMISSION_PDF_CACHE_ENABLED: bool = False
+
 
 class DevConfig(_SharedConfig):
     """
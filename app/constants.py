@@ -6,6 +6,7 @@ DATA_SET_IDENTIFIER_COLUMN_HEADERS = [DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_S
 BRITISH_POUNDS_PREFIX = "£"
 BRITISH_POUNDS_DECIMAL_PLACES = 2
 DATA_SET_PREVIEW_LENGTH = 3
+DATA_SET_MAX_ROWS = 10000
 
 SESSION_DATA_SET_UPLOAD = "data_set_upload"
 SESSION_DATA_SET_REPLACE = "data_set_replace"
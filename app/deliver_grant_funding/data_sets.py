@@ -1,10 +1,15 @@
+import codecs
 import csv
 import io
+import tempfile
 import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from io import StringIO
-from typing import TYPE_CHECKING, Sequence
+from itertools import batched
+from typing import IO, TYPE_CHECKING, Sequence
 
 from charset_normalizer import from_bytes
 from flask import current_app
@@ -37,33 +42,128 @@ if TYPE_CHECKING:
     from app.common.data.models import DataSource, DataSourceOrganisationItem, GrantRecipient
 
 
+# Data sets are read and decoded a chunk at a time, so that a large one never has to be held in memory all at once.
+DATA_SET_CSV_READ_CHUNK_SIZE = 64 * 1024
+
+# Encodings other than UTF-8 are guessed from the start of the file and a few windows from the rest of it, rather
+# than from the whole file.
+DATA_SET_ENCODING_SAMPLE_HEAD_SIZE = 64 * 1024
+DATA_SET_ENCODING_SAMPLE_WINDOWS = 4
+DATA_SET_ENCODING_SAMPLE_WINDOW_SIZE = 16 * 1024
+
+# Rows are checked against their column mappings a batch at a time, a column at a time within each batch.
+DATA_SET_VALIDATION_BATCH_SIZE = 1000
+
+# Data sets downloaded from S3 are kept in memory up to this size, and spill over onto disk beyond it.
+DATA_SET_SPOOL_MAX_SIZE_BYTES = 1024 * 1024
+
+
 class CSVDecodeError(Exception):
     pass
 
 
-def decode_csv_bytes(raw_bytes: bytes) -> str:
+def _guess_csv_encoding(raw_bytes: bytes) -> str | None:
+    best_match = from_bytes(raw_bytes, cp_isolation=["cp1252"]).best() or from_bytes(raw_bytes).best()
+    return best_match.encoding if best_match else None
+
+
+def _decodes_cleanly(stream: IO[bytes], encoding: str) -> bool:
+    stream.seek(0)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        while chunk := stream.read(DATA_SET_CSV_READ_CHUNK_SIZE):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def _read_encoding_sample(stream: IO[bytes]) -> bytes:
+    """The start of the file and a few evenly spread windows from the rest of it, for guessing its encoding from."""
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(0)
+    sample = [stream.read(DATA_SET_ENCODING_SAMPLE_HEAD_SIZE)]
+
+    rest_size = size - DATA_SET_ENCODING_SAMPLE_HEAD_SIZE
+    if rest_size <= DATA_SET_ENCODING_SAMPLE_WINDOWS * DATA_SET_ENCODING_SAMPLE_WINDOW_SIZE:
+        sample.append(stream.read())
+        return b"".join(sample)
+
+    stride = (rest_size - DATA_SET_ENCODING_SAMPLE_WINDOW_SIZE) // DATA_SET_ENCODING_SAMPLE_WINDOWS
+    for window in range(1, DATA_SET_ENCODING_SAMPLE_WINDOWS + 1):
+        # Keep windows on 4 byte boundaries so that they don't start partway through a UTF-16 or UTF-32 character.
+        stream.seek((DATA_SET_ENCODING_SAMPLE_HEAD_SIZE + window * stride) // 4 * 4)
+        sample.append(stream.read(DATA_SET_ENCODING_SAMPLE_WINDOW_SIZE))
+
+    return b"".join(sample)
+
+
+def detect_csv_encoding(stream: IO[bytes]) -> str:
     """
-    Decode uploaded CSV bytes, tolerating files that weren't saved as UTF-8.
+    Work out which encoding an uploaded CSV was saved with, tolerating files that weren't saved as UTF-8.
+
+    Our data set templates are generated as utf-8-sig, so we try that first as it should cover most use cases. The file
+    is checked a chunk at a time so that it never has to be held in memory. If that fails, we try cp1252
+    (Windows-1252) in isolation, since that's what Excel writes when a user picks "CSV (Comma delimited)" instead of
+    "CSV UTF-8" - the most common cause of non-UTF-8 uploads for our users. Only if that also fails do we fall back to
+    best-guess detection, rather than forcing users to re-save their file in a specific format.
 
-    Our data set templates are generated as utf-8-sig, so we try that first as it should cover most use cases.
-    If that fails, we try cp1252 (Windows-1252) in isolation, since that's what Excel writes when a user picks
-    "CSV (Comma delimited)" instead of "CSV UTF-8" - the most common cause of non-UTF-8 uploads for our users. Only if
-    that also fails do we fall back to best-guess detection, rather than forcing users to re-save their file in a
-    specific format.
+    Guessing is slow on large files, so it's done on a sample of the file and then checked by decoding the whole file
+    with the encoding it picked. Only if that doesn't decode cleanly (eg the sample was all ASCII but the rest of the
+    file isn't) do we guess again from the whole file.
     """
     try:
-        return raw_bytes.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        pass
+        if _decodes_cleanly(stream, "utf-8-sig"):
+            return "utf-8-sig"
+
+        encoding = _guess_csv_encoding(_read_encoding_sample(stream))
+        if encoding is not None and _decodes_cleanly(stream, encoding):
+            return encoding
+
+        stream.seek(0)
+        encoding = _guess_csv_encoding(stream.read())
+        if encoding is None:
+            raise CSVDecodeError(
+                "We could not read this file because it is not a valid CSV file, "
+                + "or it may be damaged. Check the file and try again."
+            )
 
-    best_match = from_bytes(raw_bytes, cp_isolation=["cp1252"]).best() or from_bytes(raw_bytes).best()
-    if best_match is None:
-        raise CSVDecodeError(
-            "We could not read this file because it is not a valid CSV file, "
-            + "or it may be damaged. Check the file and try again."
-        )
+        return encoding
+    finally:
+        stream.seek(0)
 
-    return str(best_match)
+
+@contextmanager
+def read_data_set_csv(stream: IO[bytes], encoding: str) -> Iterator[tuple[list[str], Iterator[TUnvalidatedDataSetRow]]]:
+    """
+    Read a data set CSV a row at a time, giving its column names and an iterator over its rows.
+
+    The file is decoded as it's read rather than up front, so only the row being looked at is held in memory. The rows
+    can only be iterated over once, inside the `with` block; read the file again to go over them again. Detecting the
+    encoding means reading the whole file, so do it once with `detect_csv_encoding` and pass it in every time.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = csv.DictReader(text)
+        columns = [fieldname.strip() for fieldname in reader.fieldnames or []]
+        reader.fieldnames = columns
+        yield columns, reader
+    finally:
+        # Hand the stream back rather than letting the wrapper close it, as the caller may still need it (eg to upload).
+        text.detach()
+        stream.seek(0)
+
+
+@contextmanager
+def download_data_set_file(s3_key: str) -> Iterator[IO[bytes]]:
+    """Stream an uploaded data set down from S3 into a temporary file, which is only written to disk if it's large."""
+    with tempfile.SpooledTemporaryFile(max_size=DATA_SET_SPOOL_MAX_SIZE_BYTES) as file:
+        for chunk in s3_service.stream_file(s3_key, chunk_size=DATA_SET_CSV_READ_CHUNK_SIZE):
+            file.write(chunk)
+        file.seek(0)
+        yield file
 
 
 class CellError(BaseModel):
@@ -95,79 +195,84 @@ class BritishPoundsError(CellError):
     table_message: str = "Not valid British pounds"
 
 
-class RowValidationResult(BaseModel):
-    row_number: int
-    cell_errors: list[CellError] = Field(default_factory=list)
+class ColumnValidationResult(BaseModel):
+    # Each kind of error found in the column once, rather than once for every cell it was found in.
+    errors: list[CellError] = Field(default_factory=list)
+    row_numbers: list[int] = Field(default_factory=list)
 
 
 class DataSetValidationResult(BaseModel):
-    row_results: list[RowValidationResult] = Field(default_factory=list)
+    column_results: dict[str, ColumnValidationResult] = Field(default_factory=dict)
 
     @property
     def blocking_errors(self) -> list[CellError]:
-        return [e for r in self.row_results for e in r.cell_errors]
+        return [e for r in self.column_results.values() for e in r.errors]
 
 
-def _validate_decimal(stripped: str, mapping: DataSetColumnMapping, column: str) -> list[CellError]:
-    errors: list[CellError] = []
-    decimal_places = len(stripped.split(".")[1]) if "." in stripped else 0
-    if mapping.max_decimal_places is not None and decimal_places > mapping.max_decimal_places:
-        errors.append(DecimalError(column=column, max_decimal_places=mapping.max_decimal_places))
-    try:
-        Decimal(stripped)
-    except InvalidOperation:
-        errors.append(DataTypeError(column=column, expected_type=NumberTypeEnum.DECIMAL))
-    return errors
+class _NumberColumnValidator:
+    """
+    Checks a number column's cells against its mapping. Everything that depends only on the mapping is worked out once
+    rather than for every cell, and the errors a cell can have are built up front and shared between the cells that
+    have them.
+    """
 
+    def __init__(self, column: str, mapping: DataSetColumnMapping) -> None:
+        self.prefix = mapping.prefix
+        self.suffix = mapping.suffix
+        self.is_integer = mapping.number_type == NumberTypeEnum.INTEGER
+        self.is_decimal = mapping.number_type == NumberTypeEnum.DECIMAL
+        self.parse_as_decimal = bool(self.prefix or self.suffix) or self.is_decimal
+        self.max_decimal_places = mapping.max_decimal_places
+
+        self.affix_errors: list[CellError] = []
+        if self.prefix:
+            self.affix_errors.append(PrefixError(column=column, prefix=self.prefix))
+        if self.suffix:
+            self.affix_errors.append(SuffixError(column=column, suffix=self.suffix))
+        self.integer_type_error = DataTypeError(column=column, expected_type=NumberTypeEnum.INTEGER)
+        self.decimal_type_error = DataTypeError(column=column, expected_type=NumberTypeEnum.DECIMAL)
+        self.decimal_places_error = DecimalError(column=column, max_decimal_places=self.max_decimal_places or 0)
+        self.british_pounds_errors: list[CellError] | None = (
+            [BritishPoundsError(column=column)] if mapping.column_type == "BRITISH_POUNDS" else None
+        )
 
-def validate_csv_cell_against_column_mapping(column: str, value: str, mapping: DataSetColumnMapping) -> list[CellError]:
+    def __call__(self, value: str) -> list[CellError]:
+        stripped = value.strip()
+        if self.prefix:
+            stripped = stripped.removeprefix(self.prefix)
+        if self.suffix:
+            stripped = stripped.removesuffix(self.suffix)
+        stripped = stripped.replace(",", "").strip()
+
+        is_number = True
+        if self.parse_as_decimal:
+            try:
+                Decimal(stripped)
+            except InvalidOperation:
+                is_number = False
+
+        errors: list[CellError] = []
+        if not is_number:
+            errors.extend(self.affix_errors)
+        if self.is_integer and not stripped.lstrip("-").isdigit():
+            errors.append(self.integer_type_error)
+        if self.is_decimal:
+            decimal_places = len(stripped.split(".")[1]) if "." in stripped else 0
+            if self.max_decimal_places is not None and decimal_places > self.max_decimal_places:
+                errors.append(self.decimal_places_error)
+            if not is_number:
+                errors.append(self.decimal_type_error)
+
+        if self.british_pounds_errors is not None and errors:
+            return self.british_pounds_errors
+        return errors
+
+
+def compile_column_validator(column: str, mapping: DataSetColumnMapping) -> Callable[[str], list[CellError]] | None:
+    """Builds a function that checks a cell against the column's mapping, or None if the column can hold anything."""
     if mapping.data_type != QuestionDataType.NUMBER:
-        return []
-
-    errors: list[CellError] = []
-    stripped = value.strip()
-
-    if mapping.prefix:
-        stripped = stripped.removeprefix(mapping.prefix)
-
-    if mapping.suffix:
-        stripped = stripped.removesuffix(mapping.suffix)
-
-    stripped = stripped.replace(",", "").strip()
-
-    if mapping.suffix or mapping.prefix:
-        try:
-            Decimal(stripped)
-        except InvalidOperation:
-            if mapping.prefix:
-                errors.append(PrefixError(column=column, prefix=mapping.prefix))
-            if mapping.suffix:
-                errors.append(SuffixError(column=column, suffix=mapping.suffix))
-
-    if mapping.number_type == NumberTypeEnum.INTEGER:
-        if not stripped.lstrip("-").isdigit():
-            errors.append(DataTypeError(column=column, expected_type=NumberTypeEnum.INTEGER))
-
-    if mapping.number_type == NumberTypeEnum.DECIMAL:
-        errors.extend(_validate_decimal(stripped, mapping, column))
-
-    if mapping.column_type == "BRITISH_POUNDS" and errors:
-        return [BritishPoundsError(column=column)]
-
-    return errors
-
-
-def _validate_row(row: TUnvalidatedDataSetRow, idx: int, data_set: DataSetUploadSessionModel) -> RowValidationResult:
-    result = RowValidationResult(row_number=idx)
-
-    for column in data_set.data_columns:
-        value = row.get(column, "").strip()
-        mapping = data_set.get_column_mapping(column)
-
-        if value and mapping:
-            result.cell_errors.extend(validate_csv_cell_against_column_mapping(column, value, mapping))
-
-    return result
+        return None
+    return _NumberColumnValidator(column, mapping)
 
 
 def validate_data_set_grant_recipients(
@@ -210,13 +315,41 @@ def validate_data_set_grant_recipients(
 
 
 def validate_data_set(
-    data_set: DataSetUploadSessionModel, all_rows: TUnvalidatedDataSetRows
+    data_set: DataSetUploadSessionModel,
+    all_rows: TUnvalidatedDataSetRows,
+    max_errors_per_column: int | None = None,
 ) -> DataSetValidationResult:
+    """
+    Checks the rows against the data set's column mappings, a column at a time over each batch of rows.
+
+    Pass `max_errors_per_column` to stop checking a column once that many of its rows have errors.
+    """
+    validators = {
+        column: validator
+        for column in data_set.data_columns
+        if (mapping := data_set.get_column_mapping(column))
+        and (validator := compile_column_validator(column, mapping)) is not None
+    }
+
     result = DataSetValidationResult()
-    for idx, row in enumerate(all_rows):
-        row_result = _validate_row(row, idx, data_set)
-        if row_result.cell_errors:
-            result.row_results.append(row_result)
+    row_offset = 0
+    for batch in batched(all_rows, DATA_SET_VALIDATION_BATCH_SIZE, strict=False):
+        for column, validator in list(validators.items()):
+            column_result = result.column_results.get(column)
+            for row_number, row in enumerate(batch, start=row_offset):
+                if not (value := row.get(column, "").strip()) or not (errors := validator(value)):
+                    continue
+
+                if column_result is None:
+                    column_result = result.column_results[column] = ColumnValidationResult()
+                column_result.row_numbers.append(row_number)
+                column_result.errors.extend(error for error in errors if error not in column_result.errors)
+
+                if max_errors_per_column is not None and len(column_result.row_numbers) >= max_errors_per_column:
+                    del validators[column]
+                    break
+        row_offset += len(batch)
+
     return result
 
 
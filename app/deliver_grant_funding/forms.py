@@ -1,7 +1,5 @@
-import csv
-import io
 from collections import Counter
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, TypedDict, cast, overload
 from typing import Optional as TOptional
@@ -57,7 +55,7 @@ from app.common.helpers.collections import SubmissionHelper
 from app.common.helpers.feature_flags import FeatureFlags
 from app.common.safe_ids import safe_column_id
 from app.common.utils import comma_join_items, uppercase_first
-from app.constants import DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_SET_IDENTIFIER_COLUMN_HEADERS
+from app.constants import DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_SET_IDENTIFIER_COLUMN_HEADERS, DATA_SET_MAX_ROWS
 from app.deliver_grant_funding.data_sets import (
     BritishPoundsError,
     CellError,
@@ -66,8 +64,9 @@ from app.deliver_grant_funding.data_sets import (
     DecimalError,
     PrefixError,
     SuffixError,
-    decode_csv_bytes,
-    validate_csv_cell_against_column_mapping,
+    compile_column_validator,
+    detect_csv_encoding,
+    read_data_set_csv,
 )
 from app.deliver_grant_funding.session_models import DataSetColumnMapping
 
@@ -1143,6 +1142,16 @@ class CollectionSettingsSelectQuestionForm(FlaskForm):
         ]
 
 
+class _UploadedDataSetRows:
+    """What's needed from an uploaded data set's rows to validate it, gathered in a single pass over the file."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.data_errors: list[CellError] = []
+        self.external_ids: set[str] = set()
+        self.locked_org_rows: dict[str, dict[str, str]] = {}
+
+
 class UploadDataSetForm(FlaskForm):
     name = StringField(
         "Data set name",
@@ -1182,6 +1191,8 @@ class UploadDataSetForm(FlaskForm):
         self.collection = collection
         self.removed_column_errors = {}
         self.changed_column_errors = {}
+        # Set once the file has been read, so that it doesn't need detecting again every time the file is read.
+        self.encoding: str | None = None
 
     def validate_name(self, field: StringField) -> None:
         if field.data and field.data in self._existing_data_source_names:
@@ -1220,24 +1231,22 @@ class UploadDataSetForm(FlaskForm):
             raise ValidationError(f"The CSV file contains duplicate column names: {', '.join(duplicate_originals)}")
 
     @staticmethod
-    def _validate_columns_in_each_row(rows) -> None:
-        if any(None in row or None in row.values() for row in rows):
+    def _validate_columns_in_row(row) -> None:
+        if None in row or None in row.values():
             raise ValidationError("The CSV file contains rows which are longer or shorter than the number of columns")
 
     @staticmethod
-    def _validate_max_rows(rows) -> None:
-        row_count = len(rows)
-        if row_count > 10000:
+    def _validate_max_rows(row_count: int) -> None:
+        if row_count > DATA_SET_MAX_ROWS:
             raise ValidationError("The file must contain no more than 10,000 rows")
 
     @staticmethod
-    def _validate_min_rows(rows) -> None:
-        row_count = len(rows)
+    def _validate_min_rows(row_count: int) -> None:
         if row_count < 1:
             raise ValidationError("The CSV file must contain at least one row of data")
 
     def _validate_data_for_existing_submissions(  # noqa: C901
-        self, existing_datasource: DataSource, rows: list[dict[str, str]]
+        self, existing_datasource: DataSource, locked_org_rows: dict[str, dict[str, str]]
     ) -> None:
         removed_column_errors = {}
         changed_column_errors = {}
@@ -1246,9 +1255,7 @@ class UploadDataSetForm(FlaskForm):
             if not existing_org_item:
                 # Nothing to validate if there was no data for this org in the first place
                 continue
-            new_org_item_row = next(
-                (row for row in rows if row[DATA_SET_EXTERNAL_ID_COLUMN_HEADER] == org.external_id), None
-            )
+            new_org_item_row = locked_org_rows.get(org.external_id)
             if not new_org_item_row:
                 raise ValidationError(f"The file does not contain a row for grant recipient {org.name}")
 
@@ -1300,7 +1307,7 @@ class UploadDataSetForm(FlaskForm):
         if removed_column_errors or changed_column_errors:
             raise StopValidation("There is a problem")
 
-    def _validate_no_dropped_organisation_items(self, rows: list[dict[str, str]]) -> None:
+    def _validate_no_dropped_organisation_items(self, new_external_ids: set[str]) -> None:
         if self.collection.is_editable_for_current_status:
             return
 
@@ -1313,7 +1320,6 @@ class UploadDataSetForm(FlaskForm):
         current_recipient_external_ids = {org.external_id for org in self.all_organisations}
         required_external_ids = existing_item_external_ids.intersection(current_recipient_external_ids)
 
-        new_external_ids = {row.get(DATA_SET_EXTERNAL_ID_COLUMN_HEADER, "").strip() for row in rows}
         missing_external_ids = required_external_ids - new_external_ids
         if not missing_external_ids:
             return
@@ -1364,25 +1370,53 @@ class UploadDataSetForm(FlaskForm):
                 )
         return errors
 
-    def _validate_data_for_existing_columns(
-        self, datasource: DataSource, fieldnames: list[str], rows: list[dict[str, str]]
-    ) -> list[str]:
+    @staticmethod
+    def _compile_existing_column_validators(
+        datasource: DataSource, fieldnames: list[str]
+    ) -> dict[str, Callable[[str], list[CellError]]]:
         safe_ids_to_column_names = {safe_column_id(fieldname): fieldname for fieldname in fieldnames}
-        data_errors = []
+        validators = {}
         for col_safe_id, column_schema in datasource.schema.root.items():  # ty:ignore[unresolved-attribute]
             if col_safe_id in safe_ids_to_column_names.keys():
-                column_mapping = DataSetColumnMapping.build_from_data_source_schema_column(column_schema)
-                for row in rows:
-                    cell_value = row[safe_ids_to_column_names[col_safe_id]]
-                    if cell_value and len(cell_value.strip()) > 0:
-                        data_errors.extend(
-                            validate_csv_cell_against_column_mapping(
-                                safe_ids_to_column_names[col_safe_id],
-                                cell_value,
-                                column_mapping,
-                            )
-                        )
+                column_name = safe_ids_to_column_names[col_safe_id]
+                validator = compile_column_validator(
+                    column_name, DataSetColumnMapping.build_from_data_source_schema_column(column_schema)
+                )
+                if validator is not None:
+                    validators[column_name] = validator
+        return validators
+
+    def _read_rows(self, fieldnames: list[str], reader: Iterator[dict[str, str]]) -> _UploadedDataSetRows:
+        validators = (
+            self._compile_existing_column_validators(self.existing_datasource, fieldnames)
+            if self.existing_datasource
+            else {}
+        )
+        locked_external_ids = {org.external_id for org in self.locked_orgs}
+
+        rows = _UploadedDataSetRows()
+        for row in reader:
+            UploadDataSetForm._validate_columns_in_row(row)
+            rows.count += 1
+            # Stop as soon as there are too many rows, rather than reading the whole of a file that's too big.
+            UploadDataSetForm._validate_max_rows(rows.count)
+
+            for column_name, validator in validators.items():
+                cell_value = row[column_name]
+                if cell_value and len(cell_value.strip()) > 0:
+                    for error in validator(cell_value):
+                        if error not in rows.data_errors:
+                            rows.data_errors.append(error)
+
+            external_id = row.get(DATA_SET_EXTERNAL_ID_COLUMN_HEADER, "")
+            rows.external_ids.add(external_id.strip())
+            if external_id in locked_external_ids:
+                rows.locked_org_rows.setdefault(external_id, row)
 
+        return rows
+
+    @staticmethod
+    def _build_data_error_messages(data_errors: list[CellError]) -> list[str]:
         errors_to_show = set()
         for bp_error in [e for e in data_errors if (isinstance(e, BritishPoundsError))]:
             errors_to_show.add(
@@ -1421,31 +1455,27 @@ class UploadDataSetForm(FlaskForm):
         if not field.data or not hasattr(field.data, "stream"):
             return
 
-        field.data.stream.seek(0)
         try:
             try:
-                content = decode_csv_bytes(field.data.stream.read())
+                self.encoding = detect_csv_encoding(field.data.stream)
             except CSVDecodeError as e:
                 raise ValidationError(str(e)) from e
-            reader = csv.DictReader(io.StringIO(content))
-            fieldnames = [fieldname.strip() for fieldname in reader.fieldnames or []]
-            reader.fieldnames = fieldnames
-            rows = list(reader)
 
-            UploadDataSetForm._validate_minimum_columns(fieldnames)
-            UploadDataSetForm._validate_duplicate_column_names_in_csv(fieldnames)
-            UploadDataSetForm._validate_columns_in_each_row(rows)
-            UploadDataSetForm._validate_max_rows(rows)
-            UploadDataSetForm._validate_min_rows(rows)
+            with read_data_set_csv(field.data.stream, self.encoding) as (fieldnames, reader):
+                UploadDataSetForm._validate_minimum_columns(fieldnames)
+                UploadDataSetForm._validate_duplicate_column_names_in_csv(fieldnames)
+                rows = self._read_rows(fieldnames, reader)
+
+            UploadDataSetForm._validate_min_rows(rows.count)
 
             if self.existing_datasource:
-                errors = self._validate_data_for_existing_columns(self.existing_datasource, fieldnames, rows)
+                errors = UploadDataSetForm._build_data_error_messages(rows.data_errors)
                 errors.extend(self._validate_existing_references(self.existing_datasource, fieldnames))
                 if errors:
                     self.data_errors = errors
                     raise ValidationError(errors[0])
-                self._validate_no_dropped_organisation_items(rows)
-                self._validate_data_for_existing_submissions(self.existing_datasource, rows)
+                self._validate_no_dropped_organisation_items(rows.external_ids)
+                self._validate_data_for_existing_submissions(self.existing_datasource, rows.locked_org_rows)
         finally:
             field.data.stream.seek(0)
 
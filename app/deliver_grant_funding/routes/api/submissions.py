@@ -0,0 +1,95 @@
+import base64
+import binascii
+import datetime
+import json
+import secrets
+import uuid
+from typing import Any
+
+from flask import abort, current_app, jsonify, request
+from flask.typing import ResponseReturnValue
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from app.common.data.interfaces.collections import get_collection
+from app.common.data.types import SubmissionModeEnum
+from app.common.helpers.collections import AllSubmissionsHelper
+from app.deliver_grant_funding.routes.api import deliver_grant_funding_api_blueprint
+
+SUBMISSION_CHANGES_DEFAULT_PAGE_SIZE = 100
+SUBMISSION_CHANGES_MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(after: tuple[datetime.datetime, uuid.UUID]) -> str:
+    return base64.urlsafe_b64encode(json.dumps([after[0].isoformat(), str(after[1])]).encode()).decode()
+
+
+class SubmissionChangesQuery(BaseModel):
+    # Timestamps are compared with the database's, which are in UTC without a timezone.
+    since: datetime.datetime | None = None
+    cursor: tuple[datetime.datetime, uuid.UUID] | None = None
+    limit: int = Field(default=SUBMISSION_CHANGES_DEFAULT_PAGE_SIZE, ge=1, le=SUBMISSION_CHANGES_MAX_PAGE_SIZE)
+
+    @field_validator("since")
+    @classmethod
+    def _as_naive_utc(cls, value: datetime.datetime | None) -> datetime.datetime | None:
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(datetime.UTC).replace(tzinfo=None)
+
+    @field_validator("cursor", mode="before")
+    @classmethod
+    def _decode_cursor(cls, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        try:
+            return json.loads(base64.urlsafe_b64decode(value.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+@deliver_grant_funding_api_blueprint.get(
+    "/collections/<uuid:collection_id>/submissions/<submission_mode:submission_mode>/changes"
+)
+def list_submission_changes(collection_id: uuid.UUID, submission_mode: SubmissionModeEnum) -> ResponseReturnValue:
+    """
+    The submissions that have changed since `since`, in the same shape as the JSON export, so that downstream systems
+    can keep a copy up to date without downloading every submission each time. Without `since`, every submission is
+    returned.
+
+    Results are paginated: while `next_cursor` is set, pass it back as `cursor` to get the next page. Once it's null,
+    save `changed_until_utc` and pass it as `since` next time.
+    """
+    token = current_app.config["SUBMISSION_CHANGES_API_TOKEN"]
+    if (
+        not token
+        or not request.authorization
+        or not request.authorization.token
+        or not secrets.compare_digest(request.authorization.token.encode(), token.encode())
+    ):
+        return jsonify(), 403
+
+    try:
+        query = SubmissionChangesQuery.model_validate(request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"errors": e.errors(include_url=False, include_context=False, include_input=False)}), 400
+
+    if submission_mode == SubmissionModeEnum.PREVIEW:
+        abort(404)
+
+    collection = get_collection(collection_id, with_full_schema=True)
+    helper = AllSubmissionsHelper(collection=collection, submission_mode=submission_mode, stream_submissions=True)
+
+    until = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) - datetime.timedelta(
+        seconds=current_app.config["SUBMISSION_CHANGES_SETTLE_SECONDS"]
+    )
+    submissions, next_after = helper.get_json_submission_changes(
+        since=query.since, until=until, after=query.cursor, limit=query.limit
+    )
+
+    return jsonify(
+        {
+            "submissions": submissions,
+            "next_cursor": _encode_cursor(next_after) if next_after is not None else None,
+            "changed_until_utc": until.isoformat(),
+        }
+    ), 200
@@ -1,11 +1,27 @@
 import csv
 import io
+import unicodedata
 import uuid
-from itertools import groupby
-from typing import TYPE_CHECKING, Any, cast
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Any, cast
+from urllib.parse import quote
 from uuid import UUID
 
-from flask import abort, current_app, flash, g, redirect, render_template, request, send_file, session, url_for
+from flask import (
+    Response,
+    abort,
+    current_app,
+    flash,
+    g,
+    redirect,
+    render_template,
+    request,
+    send_file,
+    session,
+    stream_with_context,
+    url_for,
+)
 from flask.typing import ResponseReturnValue
 from flask_wtf import FlaskForm
 from markupsafe import Markup, escape
@@ -76,6 +92,11 @@ from app.common.data.interfaces.exceptions import (
 from app.common.data.interfaces.grant_recipients import get_grant_recipients_for_collection_with_locked_submissions
 from app.common.data.interfaces.grants import get_all_deliver_grants_by_user, get_grant
 from app.common.data.interfaces.organisations import get_organisations
+from app.common.data.interfaces.submission_exports import (
+    create_submission_export_job,
+    get_latest_submission_export_job,
+    get_submission_export_job,
+)
 from app.common.data.interfaces.user import get_current_user
 from app.common.data.types import (
     CollectionType,
@@ -94,7 +115,10 @@ from app.common.data.types import (
     QuestionPresentationOptions,
     RoleEnum,
     SubmissionEventType,
+    SubmissionExportFormatEnum,
+    SubmissionExportJobStatusEnum,
     SubmissionModeEnum,
+    TUnvalidatedDataSetRow,
     TUnvalidatedDataSetRows,
 )
 from app.common.exceptions import WTFormRenderableException
@@ -112,7 +136,6 @@ from app.common.expressions.references import ExpressionReference, Interpolation
 from app.common.expressions.registry import get_managed_validators_by_data_type, lookup_managed_expression
 from app.common.forms import GenericConfirmDeletionForm, GenericSubmitForm
 from app.common.helpers.collections import (
-    AllSubmissionsHelper,
     CollectionDoesNotAllowReopeningError,
     CollectionDoesNotAllowValidationError,
     CollectionIsNotOpenError,
@@ -122,7 +145,12 @@ from app.common.helpers.collections import (
     SubmissionIsNotSubmittedError,
 )
 from app.common.helpers.feature_flags import FeatureFlags
-from app.common.helpers.pdf import render_pdf
+from app.common.helpers.submission_exports import (
+    SUBMISSION_EXPORT_MIMETYPES,
+    get_submission_export_filename,
+    stream_submission_export,
+)
+from app.common.helpers.submission_pdfs import SubmissionPdfAudience, get_submission_pdf
 from app.common.utils import slugify
 from app.constants import (
     DATA_SET_EXTERNAL_ID_COLUMN_HEADER,
@@ -138,10 +166,12 @@ from app.deliver_grant_funding.data_sets import (
     build_current_data_set_view,
     build_data_display_rows_with_missing_tags,
     build_data_set_upload_s3_key,
-    decode_csv_bytes,
+    detect_csv_encoding,
+    download_data_set_file,
     find_grant_recipient_mismatches,
     format_data_set_csv_data_for_column_type,
     generate_latest_csv_template,
+    read_data_set_csv,
     validate_data_set,
     validate_data_set_grant_recipients,
 )
@@ -3553,6 +3583,10 @@ def list_submissions(
         submission_mode=submission_mode,
         delete_all_form=delete_all_form if submission_mode == SubmissionModeEnum.TEST else None,
         submissions=submissions,
+        export_form=GenericSubmitForm(),
+        latest_export_job=get_latest_submission_export_job(
+            collection.id, submission_mode=submission_mode, requested_by=get_current_user()
+        ),
     )
 
 
@@ -3568,43 +3602,163 @@ def export_collection_submissions(
     submission_mode: SubmissionModeEnum,
     export_format: str,
 ) -> ResponseReturnValue:
-    collection = interfaces.collections.get_collection(
-        collection_id, grant_id=grant_id, type_=collection_type, with_full_schema=True
+    collection = interfaces.collections.get_collection(collection_id, grant_id=grant_id, type_=collection_type)
+    try:
+        # Newline-delimited JSON isn't offered in the UI, but is easier for ETL tools to load a record at a time.
+        submission_export_format = SubmissionExportFormatEnum(export_format.lower())
+    except ValueError:
+        abort(400)
+
+    # Rendering a PDF for every submission takes far too long to do within a request; those are only available as
+    # background exports (see `request_submission_export`).
+    if submission_export_format == SubmissionExportFormatEnum.PDF_ZIP:
+        abort(400)
+
+    emit_metric_count(
+        MetricEventName.SUBMISSIONS_EXPORTED,
+        collection=collection,
+        custom_attributes={MetricAttributeName.FILE_FORMAT: submission_export_format},
     )
-    helper = AllSubmissionsHelper(collection=collection, submission_mode=submission_mode)
+    return _stream_download(
+        stream_with_context(stream_submission_export(collection, submission_mode, submission_export_format)),
+        mimetype=SUBMISSION_EXPORT_MIMETYPES[submission_export_format],
+        download_name=get_submission_export_filename(collection, submission_mode, submission_export_format),
+    )
+
 
-    export_format = export_format.lower()
-    match export_format:
-        case "csv":
-            data = helper.generate_csv_content_for_all_submissions()
-            mimetype = "text/csv"
-            encoding = "utf-8-sig"  # Helps Excel open in UTF-8 mode so that eg `£` doesn't get mangled to `Â£`
+@deliver_grant_funding_blueprint.route(
+    "/grant/<uuid:grant_id>/<collection_type:collection_type>/<uuid:collection_id>/submissions/<submission_mode:submission_mode>/export/<export_format>/background",
+    methods=["POST"],
+)
+@has_deliver_grant_role(RoleEnum.MEMBER)
+@auto_commit_after_request
+def request_submission_export(
+    grant_id: UUID,
+    collection_type: CollectionType,
+    collection_id: UUID,
+    submission_mode: SubmissionModeEnum,
+    export_format: str,
+) -> ResponseReturnValue:
+    collection = interfaces.collections.get_collection(collection_id, grant_id=grant_id, type_=collection_type)
 
-        case "json":
-            data = helper.generate_json_content_for_all_submissions()
-            mimetype = "application/json"
-            encoding = "utf-8"
+    try:
+        submission_export_format = SubmissionExportFormatEnum(export_format.lower())
+    except ValueError:
+        abort(400)
 
-        case _:
-            abort(400)
+    form = GenericSubmitForm()
+    if not form.validate_on_submit():
+        abort(400)
 
-    buffer = io.StringIO()
-    buffer.write(data)
-    buffer.seek(0)
+    create_submission_export_job(
+        collection,
+        submission_mode=submission_mode,
+        export_format=submission_export_format,
+        requested_by=get_current_user(),
+    )
     emit_metric_count(
         MetricEventName.SUBMISSIONS_EXPORTED,
         collection=collection,
-        custom_attributes={MetricAttributeName.FILE_FORMAT: export_format},
+        custom_attributes={MetricAttributeName.FILE_FORMAT: submission_export_format},
     )
-    return send_file(
-        io.BytesIO(buffer.getvalue().encode(encoding)),
-        mimetype=mimetype,
-        as_attachment=True,
-        download_name=f"{collection.name} - {submission_mode.name.lower()}.{export_format}",
-        max_age=0,
+    return redirect(
+        url_for(
+            "deliver_grant_funding.list_submissions",
+            grant_id=grant_id,
+            collection_type=collection_type,
+            collection_id=collection_id,
+            submission_mode=submission_mode,
+        )
     )
 
 
+@deliver_grant_funding_blueprint.route(
+    "/grant/<uuid:grant_id>/<collection_type:collection_type>/<uuid:collection_id>/submissions/<submission_mode:submission_mode>/export-jobs/<uuid:job_id>",
+    methods=["GET"],
+)
+@has_deliver_grant_role(RoleEnum.MEMBER)
+def get_submission_export_job_status(
+    grant_id: UUID,
+    collection_type: CollectionType,
+    collection_id: UUID,
+    submission_mode: SubmissionModeEnum,
+    job_id: UUID,
+) -> ResponseReturnValue:
+    collection = interfaces.collections.get_collection(collection_id, grant_id=grant_id, type_=collection_type)
+    job = get_submission_export_job(job_id, collection_id=collection.id)
+    if job.submission_mode != submission_mode:
+        abort(404)
+
+    return {
+        "status": job.status,
+        "submissions_exported": job.submissions_exported,
+        "total_submissions": job.total_submissions,
+        "download_url": url_for(
+            "deliver_grant_funding.download_submission_export",
+            grant_id=grant_id,
+            collection_type=collection_type,
+            collection_id=collection_id,
+            submission_mode=submission_mode,
+            job_id=job.id,
+        )
+        if job.status == SubmissionExportJobStatusEnum.COMPLETED
+        else None,
+    }
+
+
+@deliver_grant_funding_blueprint.route(
+    "/grant/<uuid:grant_id>/<collection_type:collection_type>/<uuid:collection_id>/submissions/<submission_mode:submission_mode>/export-jobs/<uuid:job_id>/download",
+    methods=["GET"],
+)
+@has_deliver_grant_role(RoleEnum.MEMBER)
+def download_submission_export(
+    grant_id: UUID,
+    collection_type: CollectionType,
+    collection_id: UUID,
+    submission_mode: SubmissionModeEnum,
+    job_id: UUID,
+) -> ResponseReturnValue:
+    collection = interfaces.collections.get_collection(collection_id, grant_id=grant_id, type_=collection_type)
+    job = get_submission_export_job(job_id, collection_id=collection.id)
+    if (
+        job.submission_mode != submission_mode
+        or job.status != SubmissionExportJobStatusEnum.COMPLETED
+        or not job.s3_key
+    ):
+        abort(404)
+
+    return _stream_download(
+        s3_service.stream_file(job.s3_key),
+        mimetype=SUBMISSION_EXPORT_MIMETYPES[job.export_format],
+        download_name=get_submission_export_filename(collection, submission_mode, job.export_format),
+    )
+
+
+def _stream_download(body: Iterator[bytes], *, mimetype: str, download_name: str) -> Response:
+    """
+    Streams a file to the client as it's produced, rather than building it all in memory first as `send_file` needs.
+    Wrap generators that need the request context (eg to use the DB session) in `stream_with_context`.
+    """
+    response = Response(body, mimetype=mimetype)
+
+    # Matches how `send_file` names attachments, including non-ASCII names.
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode("ascii")
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=simple,
+            **{"filename*": f"UTF-8''{quote(download_name, safe='!#$&+^`|~')}"},
+        )
+    else:
+        response.headers.set("Content-Disposition", "attachment", filename=download_name)
+
+    response.cache_control.no_cache = True
+    return response
+
+
 @deliver_grant_funding_blueprint.route(
     "/grant/<uuid:grant_id>/submission/<uuid:submission_id>", methods=["GET", "POST"]
 )
@@ -3669,17 +3823,12 @@ def view_submission(grant_id: UUID, submission_id: UUID) -> ResponseReturnValue:
 def export_submission_pdf(grant_id: UUID, submission_id: UUID) -> ResponseReturnValue:
     helper = SubmissionHelper.load(submission_id)
 
-    html_content = render_template(
-        "common/submission_print_baseline.html",
-        grant=helper.grant,
-        submission=helper,
-        interpolate=SubmissionHelper.get_interpolator(collection=helper.collection, submission_helper=helper),
-    )
+    pdf_bytes = get_submission_pdf(helper, SubmissionPdfAudience.DELIVER)
 
     emit_metric_count(MetricEventName.SUBMISSION_PDF_DOWNLOADED, submission=helper.submission)
 
     return send_file(
-        io.BytesIO(render_pdf(html_content)),
+        io.BytesIO(pdf_bytes),
         mimetype="application/pdf",
         as_attachment=True,
         download_name=secure_filename(f"{helper.collection.grant.name} - {helper.long_collection_name}.pdf"),
@@ -3953,31 +4102,24 @@ def download_latest_data_set_template(
     )
 
 
-def _parse_data_set_csv(file_storage: FileStorage) -> tuple[list[str], TUnvalidatedDataSetRows]:
-    file_storage.stream.seek(0)
-    content = decode_csv_bytes(file_storage.stream.read())
-    file_storage.stream.seek(0)
+@contextmanager
+def _download_uploaded_data_set(data_set_data: DataSetUploadSessionModel) -> Iterator[tuple[IO[bytes], str]]:
+    with download_data_set_file(data_set_data.s3_key) as file:
+        # Sessions from before the encoding was stored in them need it detecting again.
+        yield file, data_set_data.encoding or detect_csv_encoding(file)
 
-    reader = csv.DictReader(io.StringIO(content))
-    columns = [fieldname.strip() for fieldname in reader.fieldnames or []]
-    reader.fieldnames = columns
-    rows: TUnvalidatedDataSetRows = list(reader)
 
-    return columns, rows
+@contextmanager
+def _read_uploaded_data_set_rows(data_set_data: DataSetUploadSessionModel) -> Iterator[TUnvalidatedDataSetRows]:
+    with _download_uploaded_data_set(data_set_data) as (file, encoding), read_data_set_csv(file, encoding) as (_, rows):
+        yield rows
 
 
-def _load_rows(data_set_data: DataSetUploadSessionModel) -> TUnvalidatedDataSetRows:
-    file_bytes = s3_service.download_file(data_set_data.s3_key)
-    file_storage = FileStorage(stream=io.BytesIO(file_bytes), filename=data_set_data.original_filename)
-    _, rows = _parse_data_set_csv(file_storage)
-    return rows
-
-
-def _load_and_validate_data_set(
-    data_set_data: DataSetUploadSessionModel,
-) -> tuple[TUnvalidatedDataSetRows, DataSetValidationResult]:
-    rows = _load_rows(data_set_data)
-    return rows, validate_data_set(data_set_data, rows)
+def _validate_uploaded_data_set(
+    data_set_data: DataSetUploadSessionModel, max_errors_per_column: int | None = None
+) -> DataSetValidationResult:
+    with _read_uploaded_data_set_rows(data_set_data) as rows:
+        return validate_data_set(data_set_data, rows, max_errors_per_column=max_errors_per_column)
 
 
 def _extract_data_set_data_from_session(data_source_id: uuid.UUID | None = None) -> DataSetUploadSessionModel | None:
@@ -4003,18 +4145,14 @@ def _upload_data_set_file(
     return s3_key, secure_filename(file.filename)
 
 
-def _build_upload_data_set_preview_data(data_columns: list[str], rows: list[dict[str, str]]) -> dict[str, list[str]]:
-
-    preview_data: dict[str, list[str]] = {}
-    for column in data_columns:
-        values = []
-        for row in rows:
-            val = row.get(column, "")
-            if val:
+def _build_upload_data_set_preview_data(data_columns: list[str], rows: TUnvalidatedDataSetRows) -> dict[str, list[str]]:
+    preview_data: dict[str, list[str]] = {column: [] for column in data_columns}
+    for row in rows:
+        for column, values in preview_data.items():
+            if len(values) < DATA_SET_PREVIEW_LENGTH and (val := row.get(column, "")):
                 values.append(str(escape(val)))
-            if len(values) == DATA_SET_PREVIEW_LENGTH:
-                break
-        preview_data[column] = values
+        if all(len(values) == DATA_SET_PREVIEW_LENGTH for values in preview_data.values()):
+            break
     return preview_data
 
 
@@ -4036,15 +4174,14 @@ def upload_data_set(grant_id: UUID, collection_type: CollectionType, collection_
 
     if form.validate_on_submit():
         file: FileStorage = form.file.data
-        columns, rows = _parse_data_set_csv(form.file.data)
-
-        data_columns = [col for col in columns if col not in DATA_SET_IDENTIFIER_COLUMN_HEADERS]
+        encoding = cast(str, form.encoding)
+        with read_data_set_csv(file.stream, encoding) as (columns, rows):
+            data_columns = [col for col in columns if col not in DATA_SET_IDENTIFIER_COLUMN_HEADERS]
+            preview_data = _build_upload_data_set_preview_data(data_columns, rows)
 
         data_source_id = uuid.uuid4()
         file_metadata = _upload_data_set_file(grant_id, collection_id, data_source_id, file)
 
-        preview_data = _build_upload_data_set_preview_data(data_columns, rows)
-
         session_data = DataSetUploadSessionModel(
             name=cast(str, form.name.data),
             data_source_type=DataSourceType.GRANT_RECIPIENT,
@@ -4052,13 +4189,15 @@ def upload_data_set(grant_id: UUID, collection_type: CollectionType, collection_
             preview_data=preview_data,
             s3_key=file_metadata[0],
             original_filename=file_metadata[1],
+            encoding=encoding,
             data_source_id=data_source_id,
         )
 
         session[SESSION_DATA_SET_UPLOAD] = session_data.model_dump(mode="json")
 
         grant_recipients = interfaces.grant_recipients.get_grant_recipients(collection.grant, with_organisations=True)
-        gr_errors = validate_data_set_grant_recipients(session_data, grant_recipients, all_rows=rows)
+        with read_data_set_csv(file.stream, encoding) as (_, rows):
+            gr_errors = validate_data_set_grant_recipients(session_data, grant_recipients, all_rows=rows)
         if gr_errors:
             return render_template(
                 "deliver_grant_funding/collections/data_sets/upload_dataset.html",
@@ -4121,22 +4260,25 @@ def replace_data_set(
     gr_errors = []
     if form.validate_on_submit():
         file: FileStorage = form.file.data
-        columns, rows = _parse_data_set_csv(form.file.data)
+        encoding = cast(str, form.encoding)
+        with read_data_set_csv(file.stream, encoding) as (columns, rows):
+            data_columns = [col for col in columns if col not in DATA_SET_IDENTIFIER_COLUMN_HEADERS]
+            preview_data = _build_upload_data_set_preview_data(data_columns, rows)
         file_metadata = _upload_data_set_file(grant_id, collection_id, data_source_id, file)
 
-        data_columns = [col for col in columns if col not in DATA_SET_IDENTIFIER_COLUMN_HEADERS]
-        preview_data = _build_upload_data_set_preview_data(data_columns, rows)
         data_set_session_data = DataSetUploadSessionModel(
             name=form.name.data,  # ty:ignore[invalid-argument-type]
             data_source_id=data_source_id,
             s3_key=file_metadata[0],
             original_filename=file_metadata[1],
+            encoding=encoding,
             data_source_type=data_source.type,
             preview_data=preview_data,
             data_columns=data_columns,
             is_replace=True,
         )
-        gr_errors = validate_data_set_grant_recipients(data_set_session_data, grant_recipients, all_rows=rows)
+        with read_data_set_csv(file.stream, encoding) as (_, rows):
+            gr_errors = validate_data_set_grant_recipients(data_set_session_data, grant_recipients, all_rows=rows)
         if not gr_errors:
             session[SESSION_DATA_SET_REPLACE] = data_set_session_data.model_dump(mode="json")
             return redirect(
@@ -4187,7 +4329,7 @@ def _save_replaced_data_set_and_redirect(
     data_set_data: DataSetUploadSessionModel,
     rows: TUnvalidatedDataSetRows | None = None,
 ) -> ResponseReturnValue:
-    replace_uploaded_data_source(
+    summary = replace_uploaded_data_source(
         data_source=existing_datasource,
         new_columns=data_set_data.column_mappings,
         all_headers=data_set_data.data_columns,
@@ -4197,6 +4339,17 @@ def _save_replaced_data_set_and_redirect(
         user=get_current_user(),
         name=data_set_data.name if data_set_data.name != existing_datasource.name else NOT_PROVIDED,
     )
+    current_app.logger.info(
+        "Replaced data set %(data_source_id)s: %(added)s rows added, %(updated)s updated, %(removed)s removed and "
+        "%(unchanged)s unchanged",
+        dict(
+            data_source_id=str(existing_datasource.id),
+            added=summary.added,
+            updated=summary.updated,
+            removed=summary.removed,
+            unchanged=summary.unchanged,
+        ),
+    )
 
     del session[SESSION_DATA_SET_REPLACE]
     s3_service.update_file_tags(data_set_data.s3_key, {"status": DataSourceFileTagEnum.IN_USE})
@@ -4289,11 +4442,14 @@ def map_data_set_columns(  # noqa: C901
         )
 
         if form.has_british_pounds_columns():
-            rows, validation_result = _load_and_validate_data_set(data_set_data)
-            british_pounds_errors = [e for e in validation_result.blocking_errors if isinstance(e, BritishPoundsError)]
-            if british_pounds_errors:
-                errors = sorted(british_pounds_errors, key=lambda e: e.column)
-                column_errors = {col: list(errs) for col, errs in groupby(errors, key=lambda e: e.column)}
+            # British pounds columns only ever have the one error, so there's no need to check past the first bad row.
+            validation_result = _validate_uploaded_data_set(data_set_data, max_errors_per_column=1)
+            column_errors = {
+                column: british_pounds_errors
+                for column, column_result in validation_result.column_results.items()
+                if (british_pounds_errors := [e for e in column_result.errors if isinstance(e, BritishPoundsError)])
+            }
+            if column_errors:
                 form.columns.errors = form.build_british_pounds_form_errors(column_errors)  # ty: ignore[invalid-argument-type]
                 return render_template(
                     "deliver_grant_funding/collections/data_sets/map_columns.html",
@@ -4394,11 +4550,12 @@ def map_data_set_number_columns(
             data_set_data.model_dump(mode="json")
         )
 
-        rows, validation_result = _load_and_validate_data_set(data_set_data)
+        validation_result = _validate_uploaded_data_set(data_set_data)
 
         if validation_result.blocking_errors:
-            errors = sorted(validation_result.blocking_errors, key=lambda e: e.column)
-            column_errors = {col: list(errs) for col, errs in groupby(errors, key=lambda e: e.column)}
+            column_errors = {
+                column: column_result.errors for column, column_result in validation_result.column_results.items()
+            }
             form.columns.errors = form.build_number_column_form_errors(column_errors)
         else:
             return redirect(
@@ -4465,7 +4622,6 @@ def confirm_data_set(  # noqa: C901
                 )
             )
 
-    rows = _load_rows(data_set_data)
     if not form.is_submitted():
         columns_to_display_in_formatting = []
         columns_to_display_in_formatting.extend(data_set_data.column_mappings)
@@ -4480,40 +4636,44 @@ def confirm_data_set(  # noqa: C901
             )
 
         grant_recipients = interfaces.grant_recipients.get_grant_recipients(collection.grant, with_organisations=True)
-        missing_data_rows = build_data_display_rows_with_missing_tags(
-            data_set_data.data_columns, rows, grant_recipients, include_all_grant_recipients=True
-        )
-        formatted_data_rows: list[dict[str, str | None]] = []
-        for row in rows:
-            formatted_row = {
-                column_def.column_name: format_data_set_csv_data_for_column_type(
-                    column_def, row[column_def.column_name]
+        with _download_uploaded_data_set(data_set_data) as (file, encoding):
+            with read_data_set_csv(file, encoding) as (_, rows):
+                missing_data_rows = build_data_display_rows_with_missing_tags(
+                    data_set_data.data_columns, rows, grant_recipients, include_all_grant_recipients=True
                 )
-                for column_def in columns_to_display_in_formatting
-            }
-            formatted_data_rows.append(formatted_row)
+            with read_data_set_csv(file, encoding) as (_, rows):
+                formatted_data_rows: list[dict[str, str | None]] = [
+                    {
+                        column_def.column_name: format_data_set_csv_data_for_column_type(
+                            column_def, row[column_def.column_name]
+                        )
+                        for column_def in columns_to_display_in_formatting
+                    }
+                    for row in rows
+                ]
 
     if form.validate_on_submit():
-        if data_set_data.is_replace:
-            return _save_replaced_data_set_and_redirect(
+        with _read_uploaded_data_set_rows(data_set_data) as rows:
+            if data_set_data.is_replace:
+                return _save_replaced_data_set_and_redirect(
+                    grant_id=grant_id,
+                    collection=collection,
+                    data_set_data=data_set_data,
+                    existing_datasource=existing_datasource,  # ty:ignore[invalid-argument-type]
+                    rows=rows,
+                )
+            data_source = create_uploaded_data_source(
+                name=data_set_data.name,
+                data_source_type=data_set_data.data_source_type,
                 grant_id=grant_id,
-                collection=collection,
-                data_set_data=data_set_data,
-                existing_datasource=existing_datasource,  # ty:ignore[invalid-argument-type]
-                rows=rows,
+                collection_id=collection.id,
+                column_mappings=data_set_data.column_mappings,
+                all_rows=rows,
+                user=user,
+                s3_key=data_set_data.s3_key,
+                original_filename=data_set_data.original_filename,
+                data_source_id=data_set_data.data_source_id,
             )
-        data_source = create_uploaded_data_source(
-            name=data_set_data.name,
-            data_source_type=data_set_data.data_source_type,
-            grant_id=grant_id,
-            collection_id=collection.id,
-            column_mappings=data_set_data.column_mappings,
-            all_rows=rows,
-            user=user,
-            s3_key=data_set_data.s3_key,
-            original_filename=data_set_data.original_filename,
-            data_source_id=data_set_data.data_source_id,
-        )
 
         s3_service.update_file_tags(data_set_data.s3_key, {"status": DataSourceFileTagEnum.IN_USE})
 
@@ -4551,7 +4711,6 @@ def confirm_data_set(  # noqa: C901
         session_data=data_set_data,
         form=form,
         columns_to_display_in_formatting=columns_to_display_in_formatting,
-        all_rows=rows,
         missing_data_rows=missing_data_rows,
         formatted_data_rows=formatted_data_rows,
     )
@@ -4593,9 +4752,9 @@ def confirm_data_set_grant_recipients(
                 )
             )
 
-    rows = _load_rows(data_set_data)
     grant_recipients = interfaces.grant_recipients.get_grant_recipients(collection.grant, with_organisations=True)
-    gr_mismatches = find_grant_recipient_mismatches(rows, grant_recipients)
+    with _read_uploaded_data_set_rows(data_set_data) as rows:
+        gr_mismatches = find_grant_recipient_mismatches(rows, grant_recipients)
 
     if not gr_mismatches:
         return redirect(
@@ -4673,10 +4832,18 @@ def data_set_missing_data(
                 )
             )
 
-    rows = _load_rows(data_set_data)
-
     grant_recipients = interfaces.grant_recipients.get_grant_recipients(collection.grant, with_organisations=True)
-    missing_data_rows = build_data_display_rows_with_missing_tags(data_set_data.data_columns, rows, grant_recipients)
+    with _download_uploaded_data_set(data_set_data) as (file, encoding):
+        with read_data_set_csv(file, encoding) as (_, rows):
+            missing_data_rows = build_data_display_rows_with_missing_tags(
+                data_set_data.data_columns, rows, grant_recipients
+            )
+
+        # Only hold on to the rows that are shown, rather than the whole data set.
+        rows_with_missing_data: dict[int, TUnvalidatedDataSetRow] = {}
+        if missing_data_row_numbers := {row.row_number for row in missing_data_rows if row.row_number is not None}:
+            with read_data_set_csv(file, encoding) as (_, rows):
+                rows_with_missing_data = {idx: row for idx, row in enumerate(rows) if idx in missing_data_row_numbers}
 
     if not missing_data_rows:
         return redirect(
@@ -4714,7 +4881,7 @@ def data_set_missing_data(
         session_data=data_set_data,
         form=form,
         missing_data_rows=missing_data_rows,
-        all_rows=rows,
+        all_rows=rows_with_missing_data,
     )
 
 
@@ -250,6 +250,8 @@ class DataSetUploadSessionModel(BaseModel):
     data_source_id: UUID4
     original_filename: str
     s3_key: str
+    # Detected when the file is uploaded, so it isn't detected again each time the file is read back from S3.
+    encoding: str | None = None
     preview_data: TDataSetPreviewData
     column_mappings: list[DataSetColumnMapping] = Field(default_factory=list)
     has_missing_data: bool = False
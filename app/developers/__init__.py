@@ -5,4 +5,5 @@ developers_blueprint = Blueprint(
 )
 
 
+from app.developers import benchmarks as benchmarks  # noqa: E402, F401
 from app.developers import commands as commands  # noqa: E402, F401
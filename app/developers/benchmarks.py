@@ -0,0 +1,533 @@
+"""
+Microbenchmarks for hot paths in the form runner and exports. These are intended to be run by hand when working on
+performance-sensitive code, eg `flask developers benchmark-expressions`, to compare a new implementation against the
+path it replaces. They don't touch the database unless stated otherwise.
+"""
+
+import decimal
+import io
+import time
+import timeit
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from types import MappingProxyType
+from typing import Any
+
+import click
+from charset_normalizer import from_bytes
+from flask import current_app
+from pydantic import TypeAdapter
+from sqlalchemy import text
+
+from app.common.collections.types import DecimalAnswer, IntegerAnswer, TextSingleLineAnswer, YesNoAnswer
+from app.common.data.interfaces.collections import get_collection, update_submission_data
+from app.common.data.interfaces.data_sets import create_uploaded_data_source
+from app.common.data.models_user import User
+from app.common.data.submission_data_manager import deserialise_all
+from app.common.data.types import (
+    ConditionsOperator,
+    DataSourceType,
+    NumberTypeEnum,
+    QuestionDataType,
+    SubmissionExportFormatEnum,
+    SubmissionModeEnum,
+)
+from app.common.expressions import (
+    ExpressionContext,
+    compile_statement,
+    configure_statement_cache,
+    get_restricted_evaluator,
+    get_statement_cache_info,
+    run_evaluation,
+)
+from app.common.helpers.collection_plan import CollectionPlan, ComponentPlan
+from app.common.helpers.collections import AllSubmissionsHelper
+from app.common.helpers.dependency_graph import CollectionDependencyGraph
+from app.common.helpers.pdf import render_pdf_with_new_browser
+from app.common.helpers.submission_exports import get_submission_export
+from app.common.safe_ids import safe_column_id
+from app.constants import DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER
+from app.deliver_grant_funding.data_sets import (
+    DATA_SET_CSV_READ_CHUNK_SIZE,
+    CellError,
+    detect_csv_encoding,
+    validate_data_set,
+)
+from app.deliver_grant_funding.session_models import DataSetColumnMapping, DataSetUploadSessionModel
+from app.developers import developers_blueprint
+from app.extensions import db, pdf_renderer
+
+
+def _report(label: str, baseline: float, candidate: float, iterations: int) -> None:
+    click.echo(f"{label}:")
+    click.echo(f"  baseline:  {baseline / iterations * 1_000_000:10.2f}µs per iteration")
+    click.echo(f"  candidate: {candidate / iterations * 1_000_000:10.2f}µs per iteration")
+    click.echo(f"  speedup:   {baseline / candidate:10.2f}x")
+
+
+def _time(fn: Callable[[], Any], iterations: int) -> float:
+    # Take the best of a few runs to smooth out noise from GC and other processes.
+    return min(timeit.repeat(fn, number=iterations, repeat=3))
+
+
+@developers_blueprint.cli.command(
+    "benchmark-expressions", help="Compare evaluating expressions with and without the compiled statement cache"
+)
+@click.option("--iterations", default=1_000, show_default=True, help="Number of passes over all statements")
+@click.option("--statements", "num_statements", default=200, show_default=True, help="Distinct statements per pass")
+def benchmark_expressions(iterations: int, num_statements: int) -> None:
+    context = ExpressionContext(
+        submission_data={f"q_{i:032x}": Decimal(i) for i in range(num_statements)}
+        | {f"q_bool_{i:032x}": bool(i % 2) for i in range(num_statements)}
+    )
+    required_functions: dict[str, Callable[[Any], Any] | type[Any]] = {"Decimal": decimal.Decimal}
+
+    # Roughly the shape of the managed conditions and interpolations evaluated when rendering a large tasklist.
+    statements = [
+        f"q_{i:032x} > Decimal('{i // 2}')" if i % 3 else f"q_bool_{i:032x} is True" for i in range(num_statements)
+    ]
+    interpolations = [f"((q_{i:032x}))" for i in range(num_statements)]
+
+    def legacy() -> None:
+        for statement in statements:
+            evaluator = get_restricted_evaluator(names=context, required_functions=dict(required_functions))
+            run_evaluation(evaluator, statement)
+        for interpolation in interpolations:
+            evaluator = get_restricted_evaluator(names=context, required_functions={})
+            run_evaluation(evaluator, interpolation)
+
+    def compiled() -> None:
+        for statement in statements:
+            compile_statement(statement, required_functions).evaluate(context)
+        for interpolation in interpolations:
+            compile_statement(interpolation).evaluate(context)
+
+    configure_statement_cache(maxsize=num_statements * 2)
+
+    _report(
+        f"Evaluating {num_statements} conditions and {num_statements} interpolations",
+        _time(legacy, iterations),
+        _time(compiled, iterations),
+        iterations,
+    )
+
+    cache_info = get_statement_cache_info()
+    click.echo(f"  cache:     {cache_info.hits} hits, {cache_info.misses} misses, {cache_info.currsize} entries")
+
+
+@developers_blueprint.cli.command(
+    "benchmark-answer-deserialisation",
+    help="Compare deserialising answers with a new TypeAdapter per answer against the prebuilt adapters",
+)
+@click.option("--iterations", default=100, show_default=True, help="Number of passes over the submission")
+@click.option("--questions", "num_questions", default=200, show_default=True, help="Top-level questions")
+@click.option("--entries", "num_entries", default=50, show_default=True, help="Entries in an add another group")
+def benchmark_answer_deserialisation(iterations: int, num_questions: int, num_entries: int) -> None:
+    form_id, group_id = uuid.uuid4(), uuid.uuid4()
+
+    def _question(
+        data_type: QuestionDataType,
+        number_type: NumberTypeEnum | None = None,
+        add_another_container_id: uuid.UUID | None = None,
+    ) -> ComponentPlan:
+        return ComponentPlan(
+            id=uuid.uuid4(),
+            form_id=form_id,
+            parent_id=add_another_container_id,
+            is_question=True,
+            data_type=data_type,
+            number_type=number_type,
+            add_another_container_id=add_another_container_id,
+            conditions_operator=ConditionsOperator.ALL,
+            condition_statements=(),
+            depends_on_component_ids=frozenset(),
+        )
+
+    group = ComponentPlan(
+        id=group_id,
+        form_id=form_id,
+        parent_id=None,
+        is_question=False,
+        data_type=None,
+        number_type=None,
+        add_another_container_id=group_id,
+        conditions_operator=ConditionsOperator.ALL,
+        condition_statements=(),
+        depends_on_component_ids=frozenset(),
+    )
+
+    # A mix of answer types roughly in line with a typical monitoring report.
+    answer_types: list[tuple[QuestionDataType, NumberTypeEnum | None, type[Any], Any]] = [
+        (QuestionDataType.TEXT_SINGLE_LINE, None, TextSingleLineAnswer, "Some text"),
+        (QuestionDataType.NUMBER, NumberTypeEnum.INTEGER, IntegerAnswer, {"value": 1000, "prefix": "£"}),
+        (QuestionDataType.NUMBER, NumberTypeEnum.DECIMAL, DecimalAnswer, {"value": "12.5"}),
+        (QuestionDataType.YES_NO, None, YesNoAnswer, True),
+    ]
+    questions = [_question(*answer_types[i % len(answer_types)][:2]) for i in range(num_questions)]
+    group_questions = [_question(data_type, number_type, group_id) for data_type, number_type, _, _ in answer_types]
+
+    data: dict[str, Any] = {
+        str(question.id): answer_types[i % len(answer_types)][3] for i, question in enumerate(questions)
+    }
+    data[str(group_id)] = [
+        {str(question.id): raw for question, (_, _, _, raw) in zip(group_questions, answer_types, strict=True)}
+        for _ in range(num_entries)
+    ]
+
+    plan = CollectionPlan(
+        collection_id=uuid.uuid4(),
+        forms=(),
+        components=MappingProxyType({c.id: c for c in [*questions, group, *group_questions]}),
+        form_positions=MappingProxyType({}),
+        question_positions=MappingProxyType({}),
+        dependency_graph=CollectionDependencyGraph(
+            collection_id=uuid.uuid4(), form_ids={}, ancestor_ids={}, dependents={}
+        ),
+    )
+
+    # The previous implementation: look up each answer and build a new adapter for its type every time.
+    answers = [answer_types[i % len(answer_types)][2:] for i in range(num_questions)]
+    answers += [(answer_type, raw) for _ in range(num_entries) for (_, _, answer_type, raw) in answer_types]
+
+    def legacy() -> None:
+        for answer_type, raw in answers:
+            TypeAdapter(answer_type).validate_python(raw)
+
+    def bulk() -> None:
+        deserialise_all(plan, data)
+
+    legacy_time, bulk_time = _time(legacy, iterations), _time(bulk, iterations)
+    _report(f"Deserialising a submission with {len(answers)} answers", legacy_time, bulk_time, iterations)
+    click.echo(f"  per answer: {legacy_time / iterations / len(answers) * 1_000_000:10.2f}µs baseline")
+    click.echo(f"  per answer: {bulk_time / iterations / len(answers) * 1_000_000:10.2f}µs candidate")
+
+
+@developers_blueprint.cli.command(
+    "benchmark-submission-data-writes",
+    help="Compare WAL volume and latency of saving answers with `update_submission_data` when it rewrites the whole "
+    "of the submission data against when it patches the changed paths. Uses the database, in a transaction that is "
+    "rolled back.",
+)
+@click.option("--iterations", default=500, show_default=True, help="Number of answers to save")
+@click.option("--questions", "num_questions", default=500, show_default=True, help="Answers already in the submission")
+@click.option("--answer-size", default=100, show_default=True, help="Characters in each answer")
+def benchmark_submission_data_writes(iterations: int, num_questions: int, answer_size: int) -> None:
+    # As in `benchmark-data-set-writes`, the submission is built with the test factories.
+    from tests.models import _QuestionFactory, _SubmissionFactory
+
+    def _time_writes(max_patch_keys: int) -> tuple[int, float]:
+        question = _QuestionFactory.build(data_type=QuestionDataType.TEXT_SINGLE_LINE)
+        submission = _SubmissionFactory.build(
+            collection=question.form.collection,
+            _data={str(uuid.uuid4()): "x" * answer_size for _ in range(num_questions)},
+        )
+        patch_max_keys = current_app.config["SUBMISSION_DATA_PATCH_MAX_KEYS"]
+        elapsed = 0.0
+        try:
+            db.session.add(submission)
+            db.session.flush()
+            current_app.config["SUBMISSION_DATA_PATCH_MAX_KEYS"] = max_patch_keys
+
+            start_lsn = db.session.scalar(text("SELECT pg_current_wal_insert_lsn()"))
+            for i in range(iterations):
+                start = time.perf_counter()
+                submission.data_manager.set(question, TextSingleLineAnswer(f"answer {i}".ljust(answer_size)))
+                update_submission_data(submission)
+                db.session.flush()
+                elapsed += time.perf_counter() - start
+            wal_bytes = db.session.scalar(
+                text("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), :start_lsn)"), {"start_lsn": start_lsn}
+            )
+        finally:
+            current_app.config["SUBMISSION_DATA_PATCH_MAX_KEYS"] = patch_max_keys
+            db.session.rollback()
+        return int(wal_bytes), elapsed
+
+    # With no changes allowed to be patched, every save rewrites the whole of the submission data, as it used to.
+    full_wal, full_time = _time_writes(max_patch_keys=0)
+    patch_wal, patch_time = _time_writes(max_patch_keys=current_app.config["SUBMISSION_DATA_PATCH_MAX_KEYS"])
+
+    _report(
+        f"Saving {iterations} answers to a submission with {num_questions} answers", full_time, patch_time, iterations
+    )
+    click.echo(f"  WAL:       {full_wal / iterations:10.0f} bytes per write (baseline)")
+    click.echo(f"  WAL:       {patch_wal / iterations:10.0f} bytes per write (candidate)")
+
+
+@developers_blueprint.cli.command(
+    "benchmark-submission-export-processes",
+    help="Compare exporting a collection's test submissions in this process against a pool of processes. Uses the "
+    "database: seed a large collection first, eg with `flask developers seed-grants-many-submissions --submissions "
+    "10000`, and pass its ID.",
+)
+@click.argument("collection_id", type=click.UUID)
+@click.option("--processes", default=4, show_default=True, help="Processes to build rows in")
+@click.option(
+    "--export-format",
+    type=click.Choice([export_format.value for export_format in SubmissionExportFormatEnum]),
+    default=SubmissionExportFormatEnum.CSV.value,
+    show_default=True,
+)
+def benchmark_submission_export_processes(collection_id: uuid.UUID, processes: int, export_format: str) -> None:
+    collection = get_collection(collection_id, with_full_schema=True)
+
+    def _export(export_processes: int) -> tuple[float, bytes, int]:
+        helper = AllSubmissionsHelper(
+            collection=collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            stream_submissions=True,
+            export_processes=export_processes,
+        )
+        start = time.perf_counter()
+        content = b"".join(get_submission_export(helper, SubmissionExportFormatEnum(export_format)).iter_encoded())
+        return time.perf_counter() - start, content, helper.submissions_processed
+
+    # Each run goes through every submission once, so unlike the other benchmarks these aren't repeated. The candidate
+    # includes the time taken to start its processes.
+    baseline_time, baseline, num_submissions = _export(0)
+    candidate_time, candidate, _ = _export(processes)
+    assert candidate == baseline, "Exporting in separate processes should give exactly the same output"
+
+    _report(
+        f"Exporting {num_submissions} submissions as {export_format} in {processes} processes (per submission)",
+        baseline_time,
+        candidate_time,
+        num_submissions,
+    )
+
+
+@developers_blueprint.cli.command(
+    "benchmark-pdf-rendering",
+    help="Compare rendering PDFs with a new browser each time against this worker's long-lived PDF renderer. Needs "
+    "Playwright's Chromium installed and PDF_RENDERER_CONCURRENCY set above 0.",
+)
+@click.option("--pdfs", "num_pdfs", default=50, show_default=True, help="Number of PDFs to render")
+@click.option("--requests", "num_requests", default=8, show_default=True, help="PDFs requested at the same time")
+@click.option("--rows", "num_rows", default=200, show_default=True, help="Table rows in each PDF")
+def benchmark_pdf_rendering(num_pdfs: int, num_requests: int, num_rows: int) -> None:
+    if not pdf_renderer.enabled:
+        raise click.ClickException("Set PDF_RENDERER_CONCURRENCY above 0 to use the PDF renderer")
+
+    # Roughly the size of a long submission's PDF: a heading and a table of questions and answers.
+    html_content = (
+        "<html><body><h1>Benchmark submission</h1><table>"
+        + "".join(f"<tr><th>Question {i}</th><td>{'Answer ' * 20}{i}</td></tr>" for i in range(num_rows))
+        + "</table></body></html>"
+    )
+
+    app = current_app._get_current_object()
+
+    def _render_all(render: Callable[[str], bytes]) -> float:
+        def _render_in_app_context(html: str) -> bytes:
+            with app.app_context():
+                return render(html)
+
+        # Requests arrive together, as they would from several users at once. Rendering with a new browser each time
+        # only does one at a time per worker, so the baseline is effectively serial.
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_requests) as executor:
+            pdfs = list(executor.map(_render_in_app_context, [html_content] * num_pdfs))
+        assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if not pdf_renderer.is_healthy():
+        raise click.ClickException("The PDF renderer didn't start")
+    click.echo(f"Started the PDF renderer in {time.perf_counter() - start:.2f}s")
+
+    baseline = _render_all(render_pdf_with_new_browser)
+    candidate = _render_all(pdf_renderer.render)
+
+    _report(f"Rendering {num_pdfs} PDFs, {num_requests} at a time (per PDF)", baseline, candidate, num_pdfs)
+    click.echo(
+        f"  throughput: {num_pdfs / baseline:.1f} PDFs/s (baseline), {num_pdfs / candidate:.1f} PDFs/s (candidate)"
+    )
+
+
+@developers_blueprint.cli.command(
+    "benchmark-data-set-encoding-detection",
+    help="Compare guessing the encoding of a non-UTF-8 data set from the whole file against guessing from a sample",
+)
+@click.option("--iterations", default=5, show_default=True, help="Number of times to read each file")
+@click.option("--rows", "num_rows", default=50_000, show_default=True, help="Rows in the data set")
+@click.option("--columns", "num_columns", default=20, show_default=True, help="Data columns in the data set")
+def benchmark_data_set_encoding_detection(iterations: int, num_rows: int, num_columns: int) -> None:
+    # Roughly a data set with accented names, notes and amounts in pounds, as Excel writes it when it's saved as
+    # "CSV (Comma delimited)" (cp1252) or "Unicode Text" (UTF-16).
+    header = ",".join(
+        [DATA_SET_EXTERNAL_ID_COLUMN_HEADER, DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER, "Notes"]
+        + [f"Column {column}" for column in range(num_columns)]
+    )
+    rows = [
+        f"E{row:06},Café Zürich {row},Résumé of spend – “capital” works {row},"
+        + ",".join(f"£{row * column}.00" if column % 4 == 0 else str(row * column) for column in range(num_columns))
+        for row in range(num_rows)
+    ]
+    content = "\r\n".join([header, *rows]) + "\r\n"
+
+    # The previous implementation: decode the whole file at once, guessing its encoding from all of it.
+    def legacy(raw_bytes: bytes) -> str:
+        try:
+            return raw_bytes.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            pass
+
+        best_match = from_bytes(raw_bytes, cp_isolation=["cp1252"]).best() or from_bytes(raw_bytes).best()
+        assert best_match is not None
+        return str(best_match)
+
+    def sampled(raw_bytes: bytes) -> str:
+        stream = io.BytesIO(raw_bytes)
+        text = io.TextIOWrapper(stream, encoding=detect_csv_encoding(stream), newline="")
+        chunks = []
+        while chunk := text.read(DATA_SET_CSV_READ_CHUNK_SIZE):
+            chunks.append(chunk)
+        text.detach()
+        return "".join(chunks)
+
+    for encoding in ["cp1252", "utf-16"]:
+        raw_bytes = content.encode(encoding)
+        assert legacy(raw_bytes) == sampled(raw_bytes) == content
+
+        _report(
+            f"Decoding a {len(raw_bytes) / 1024 / 1024:.1f}MB {encoding} data set "
+            f"(detected as {detect_csv_encoding(io.BytesIO(raw_bytes))})",
+            _time(partial(legacy, raw_bytes), iterations),
+            _time(partial(sampled, raw_bytes), iterations),
+            iterations,
+        )
+
+
+@developers_blueprint.cli.command(
+    "benchmark-data-set-writes",
+    help="Compare writing a data set's rows as an ORM object each against multi-row INSERTs. Uses the database, in a "
+    "transaction that is rolled back.",
+)
+@click.option("--iterations", default=3, show_default=True, help="Number of times to write the data set")
+@click.option("--rows", "num_rows", default=10_000, show_default=True, help="Rows in the data set")
+@click.option("--columns", "num_columns", default=20, show_default=True, help="Data columns in the data set")
+def benchmark_data_set_writes(iterations: int, num_rows: int, num_columns: int) -> None:
+    # The models can't be imported here, so the previous implementation's ORM objects are built with the test
+    # factories, as `seed-grants-many-submissions` does.
+    from tests.models import _DataSourceFactory, _DataSourceOrganisationItemFactory
+
+    column_names = [f"Column {column}" for column in range(num_columns)]
+    column_mappings = [DataSetColumnMapping(column_name=name, column_type="TEXT") for name in column_names]
+    rows = [
+        {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: f"E{row:06}", DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: f"Recipient {row}"}
+        | {name: f"Value {row}-{column}" for column, name in enumerate(column_names)}
+        for row in range(num_rows)
+    ]
+
+    # The previous implementation: an ORM object per row, added to the session and flushed.
+    def legacy(user: User) -> None:
+        data_source = _DataSourceFactory.build(name="Benchmark", type=DataSourceType.GRANT_RECIPIENT, created_by=user)
+        db.session.add(data_source)
+        for row in rows:
+            db.session.add(
+                _DataSourceOrganisationItemFactory.build(
+                    data_source=data_source,
+                    external_id=row[DATA_SET_EXTERNAL_ID_COLUMN_HEADER],
+                    _data={safe_column_id(name): row[name] for name in column_names},
+                )
+            )
+        db.session.flush()
+
+    def bulk(user: User) -> None:
+        create_uploaded_data_source(
+            name="Benchmark",
+            data_source_type=DataSourceType.GRANT_RECIPIENT,
+            grant_id=None,
+            collection_id=None,
+            column_mappings=column_mappings,
+            all_rows=iter(rows),
+            user=user,
+            s3_key="benchmark.csv",
+            original_filename="benchmark.csv",
+            data_source_id=uuid.uuid4(),
+        )
+
+    def _time_writes(write: Callable[[User], None]) -> float:
+        elapsed = 0.0
+        try:
+            for _ in range(iterations):
+                user = User(email=f"benchmark-{uuid.uuid4()}@communities.gov.uk")
+                db.session.add(user)
+                db.session.flush()
+
+                start = time.perf_counter()
+                write(user)
+                elapsed += time.perf_counter() - start
+
+                db.session.rollback()
+        finally:
+            db.session.rollback()
+        return elapsed
+
+    _report(
+        f"Writing a data set of {num_rows} rows with {num_columns} columns",
+        _time_writes(legacy),
+        _time_writes(bulk),
+        iterations,
+    )
+
+
+@developers_blueprint.cli.command(
+    "benchmark-data-set-validation",
+    help="Compare checking a data set's cells a row at a time against compiled validators a column at a time",
+)
+@click.option("--iterations", default=5, show_default=True, help="Number of times to check the data set")
+@click.option("--rows", "num_rows", default=10_000, show_default=True, help="Rows in the data set")
+@click.option("--columns", "num_columns", default=20, show_default=True, help="Number columns in the data set")
+def benchmark_data_set_validation(iterations: int, num_rows: int, num_columns: int) -> None:
+    # A mix of the number columns that get checked, with a few bad values scattered through them.
+    column_mappings = [
+        DataSetColumnMapping(column_name=f"Pounds {column}", column_type="BRITISH_POUNDS")
+        if column % 3 == 0
+        else DataSetColumnMapping(column_name=f"Rate {column}", column_type="DECIMAL", suffix="%", max_decimal_places=2)
+        if column % 3 == 1
+        else DataSetColumnMapping(column_name=f"Count {column}", column_type="INTEGER")
+        for column in range(num_columns)
+    ]
+    values = {"BRITISH_POUNDS": "£1,234.50", "DECIMAL": "12.5%", "INTEGER": "1,200"}
+    rows = [
+        {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: f"E{row:06}", DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: f"Recipient {row}"}
+        | {
+            mapping.column_name: "n/a" if (row + column) % 97 == 0 else values[mapping.column_type]
+            for column, mapping in enumerate(column_mappings)
+        }
+        for row in range(num_rows)
+    ]
+    data_set = DataSetUploadSessionModel(
+        name="Benchmark",
+        data_source_type=DataSourceType.GRANT_RECIPIENT,
+        data_columns=[mapping.column_name for mapping in column_mappings],
+        preview_data={},
+        column_mappings=column_mappings,
+        data_source_id=uuid.uuid4(),
+        original_filename="benchmark.csv",
+        s3_key="benchmark.csv",
+    )
+
+    from tests.benchmark_baselines import legacy_validate_data_set
+
+    def legacy() -> set[tuple[type[CellError], str]]:
+        return {(type(e), e.column) for _, errors in legacy_validate_data_set(data_set, rows) for e in errors}
+
+    assert legacy() == {(type(e), e.column) for e in validate_data_set(data_set, rows).blocking_errors}
+
+    _report(
+        f"Checking a data set of {num_rows} rows with {num_columns} number columns",
+        _time(legacy, iterations),
+        _time(partial(validate_data_set, data_set, rows), iterations),
+        iterations,
+    )
+    _report(
+        "Stopping after 10 errors per column",
+        _time(legacy, iterations),
+        _time(partial(validate_data_set, data_set, rows, max_errors_per_column=10), iterations),
+        iterations,
+    )
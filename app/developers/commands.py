@@ -520,11 +520,12 @@ def seed_grants(file: Path, s3_key: str | None = None) -> None:  # noqa: C901
 
 
 @developers_blueprint.cli.command(
-    "seed-grants-many-submissions", help="Load grants with 100 random submissions into the database"
+    "seed-grants-many-submissions", help="Load grants with many (by default 100) random submissions into the database"
 )
-def seed_grants_many_submissions() -> None:
+@click.option("--submissions", "num_submissions", default=100, show_default=True, help="Submissions per grant")
+def seed_grants_many_submissions(num_submissions: int) -> None:
     """
-    This uses the test factories to seed 100 submissions for each of two test grants - one with conditional questions,
+    This uses the test factories to seed submissions for each of two test grants - one with conditional questions,
     and one without. This is useful for testing the performance of the application with a large number of submissions.
 
     Note: It may fail due to conflicts on the user email in the database, as faker seems to have a fixed set of
@@ -534,8 +535,8 @@ def seed_grants_many_submissions() -> None:
     from tests.models import _CollectionFactory, _GrantFactory
 
     grant_names = [
-        "Test Grant with 100 submissions - non-conditional questions",
-        "Test Grant with 100 submissions - conditional questions",
+        f"Test Grant with {num_submissions} submissions - non-conditional questions",
+        f"Test Grant with {num_submissions} submissions - conditional questions",
     ]
     for name in grant_names:
         try:
@@ -545,18 +546,21 @@ def seed_grants_many_submissions() -> None:
         except NoResultFound:
             pass
 
-    grant = _GrantFactory.create(name="Test Grant with 100 submissions - non-conditional questions")
-    _CollectionFactory.create(
+    grant = _GrantFactory.create(name=grant_names[0])
+    collection = _CollectionFactory.create(
         grant=grant,
-        name="Test Collection with 100 submissions",
-        create_completed_submissions_each_question_type__test=100,
+        name=f"Test Collection with {num_submissions} submissions",
+        create_completed_submissions_each_question_type__test=num_submissions,
     )
-    grant = _GrantFactory.create(name="Test Grant with 100 submissions - conditional questions")
-    _CollectionFactory.create(
+    click.echo(f"{grant.name}: collection {collection.id}")
+
+    grant = _GrantFactory.create(name=grant_names[1])
+    collection = _CollectionFactory.create(
         grant=grant,
-        name="Test Collection with 100 submissions",
-        create_completed_submissions_conditional_question_random__test=100,
+        name=f"Test Collection with {num_submissions} submissions",
+        create_completed_submissions_conditional_question_random__test=num_submissions,
     )
+    click.echo(f"{grant.name}: collection {collection.id}")
 
 
 def add_all_components_flat(component: Component, users: set[User], grant_export: GrantExport) -> None:
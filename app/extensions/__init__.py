@@ -7,17 +7,21 @@ from flask_talisman import Talisman
 from app.common.data.models_user import User
 from app.common.markdown import FlaskGOVUKMarkdown
 from app.extensions.auto_commit_after_request import AutoCommitAfterRequestExtension
+from app.extensions.background_jobs import BackgroundJobsExtension
 from app.extensions.flask_assets_vite import FlaskAssetsViteExtension
 from app.extensions.psycopg_citext import PsycopgCitextExtension
 from app.extensions.record_sqlalchemy_queries import RecordSqlalchemyQueriesExtension
 from app.services.notify import NotificationService
+from app.services.pdf_renderer import PdfRendererService
 from app.services.s3 import S3Service
 
 db = SQLAlchemy(engine_options={"echo": False, "connect_args": {"prepare_threshold": None}})
 auto_commit_after_request = AutoCommitAfterRequestExtension(db=db)
+background_jobs = BackgroundJobsExtension(db=db)
 migrate = Migrate()
 notification_service = NotificationService()
 s3_service = S3Service()
+pdf_renderer = PdfRendererService()
 talisman = Talisman()
 flask_assets_vite = FlaskAssetsViteExtension()
 login_manager = LoginManager()
@@ -45,10 +49,12 @@ def register_signals(app: Flask) -> None:
 __all__ = [
     "db",
     "auto_commit_after_request",
+    "background_jobs",
     "migrate",
     "toolbar",
     "notification_service",
     "s3_service",
+    "pdf_renderer",
     "talisman",
     "flask_assets_vite",
     "login_manager",
@@ -0,0 +1,90 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from flask import Flask
+from flask_sqlalchemy_lite import SQLAlchemy
+
+type BackgroundJobHandler = Callable[[], bool]
+
+
+class BackgroundJobsExtension:
+    """
+    Runs work that's too slow to do within a request (eg exporting every submission in a large collection) outside of
+    the web workers, so that it doesn't need any services beyond Postgres.
+
+    Jobs are rows in the database, and each registered handler claims and runs at most one of them each time it's
+    called, returning whether it found one. Handlers must claim jobs with `SELECT ... FOR UPDATE SKIP LOCKED` so that
+    the same job is never picked up by two workers. Each call happens in its own app context, and the session is
+    committed afterwards (or rolled back if the handler raised).
+
+    Jobs are run by a dedicated process started with `flask run-background-jobs`. `BACKGROUND_JOBS_ENABLED` instead
+    polls from a thread in each web worker, which is only meant for running everything in one process locally: under
+    gevent that thread is a greenlet, and CPU-heavy jobs would hold up the worker's requests.
+    """
+
+    def __init__(self, db: SQLAlchemy):
+        self._db = db
+        self._handlers: list[BackgroundJobHandler] = []
+        self._worker: threading.Thread | None = None
+        self._worker_pid: int | None = None
+        self._worker_lock = threading.Lock()
+        self._app: Flask | None = None
+        self._logger = logging.getLogger(__name__)
+        self.poll_interval: float = 5
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["fs_background_jobs"] = self
+        self._app = app
+        self._logger = app.logger
+        self.poll_interval = app.config["BACKGROUND_JOBS_POLL_INTERVAL_SECONDS"]
+
+        @app.cli.command("run-background-jobs", help="Run background jobs (eg submission exports) until stopped")
+        def run_background_jobs() -> None:
+            self._logger.info("Polling for background jobs every %(interval)ss", dict(interval=self.poll_interval))
+            self.run_forever()
+
+        if app.config["BACKGROUND_JOBS_ENABLED"]:
+            # Started lazily from the first request so that each gunicorn worker polls from its own process.
+            app.before_request(self.ensure_running)
+
+    def register(self, handler: BackgroundJobHandler) -> None:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def ensure_running(self) -> None:
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+                return
+
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self.run_forever, name="background-jobs", daemon=True)
+            self._worker.start()
+
+    def run_pending(self) -> bool:
+        """Gives every handler one chance to run a job, returning whether any of them did."""
+        assert self._app is not None, "BackgroundJobsExtension.init_app must be called before running jobs"
+
+        found_job = False
+        for handler in self._handlers:
+            with self._app.app_context():
+                try:
+                    found_job = handler() or found_job
+                    self._db.session.commit()
+                except Exception:
+                    self._db.session.rollback()
+                    self._logger.exception("Background job handler %(handler)s failed", dict(handler=handler))
+
+        return found_job
+
+    def run_forever(self) -> None:
+        """Polls for jobs until the process is stopped."""
+        while True:
+            # Keep going straight away while there's work queued up; only wait when there's nothing to do.
+            if not self.run_pending():
+                time.sleep(self.poll_interval)
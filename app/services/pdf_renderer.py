@@ -0,0 +1,358 @@
+"""
+Renders PDFs with a long-lived Chromium, rather than launching a new browser for every PDF.
+
+Each web worker starts its own renderer process the first time it needs one, and talks to it over a Unix socket. The
+renderer keeps a browser running with a pool of warm contexts, renders up to `PDF_RENDERER_CONCURRENCY` pages at once,
+and relaunches the browser after `PDF_RENDERER_MAX_RENDERS_PER_BROWSER` renders so that Chromium's memory use doesn't
+creep up over the life of the worker.
+
+Playwright is driven with its async API inside the renderer, so none of it runs in the worker. That matters under
+gevent, where Playwright's sync API can't run in more than one greenlet at a time; talking to the renderer is just
+socket I/O, which greenlets can share.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from flask import Flask
+
+if TYPE_CHECKING:
+    from multiprocessing.context import SpawnProcess
+
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+PDF_OPTIONS: dict[str, Any] = {
+    "format": "A4",
+    "print_background": True,
+    "scale": 0.9,
+    "margin": {"top": "5mm", "bottom": "5mm", "left": "5mm", "right": "5mm"},
+}
+
+# How long to wait for a new renderer process to launch its browser and start accepting requests.
+PDF_RENDERER_STARTUP_TIMEOUT_SECONDS = 30
+
+# Every message is a one byte type followed by the length of its payload.
+_HEADER = struct.Struct("!BI")
+
+
+class _Request(IntEnum):
+    RENDER = 1
+    PING = 2
+
+
+class _Response(IntEnum):
+    OK = 0
+    ERROR = 1
+    BUSY = 2
+
+
+class PdfRendererError(Exception):
+    pass
+
+
+class PdfRendererBusyError(PdfRendererError):
+    """Raised when the renderer already has as many PDFs queued up as it's allowed, rather than waiting for it."""
+
+
+class PdfRendererService:
+    def __init__(self) -> None:
+        self.concurrency = 0
+        self._process: SpawnProcess | None = None
+        self._process_pid: int | None = None
+        self._socket_path: str | None = None
+        self._process_lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["pdf_renderer"] = self
+        self._logger = app.logger
+        self.concurrency = app.config["PDF_RENDERER_CONCURRENCY"]
+        self._max_queued = app.config["PDF_RENDERER_MAX_QUEUED"]
+        self._max_renders_per_browser = app.config["PDF_RENDERER_MAX_RENDERS_PER_BROWSER"]
+        self._timeout = app.config["PDF_RENDERER_TIMEOUT_SECONDS"]
+        self._browsers_path = app.config["PLAYWRIGHT_BROWSERS_PATH"]
+        self._http_credentials = (
+            {"username": app.config["BASIC_AUTH_USERNAME"], "password": app.config["BASIC_AUTH_PASSWORD"]}
+            if app.config["BASIC_AUTH_ENABLED"]
+            else None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.concurrency > 0
+
+    def render(self, html_content: str) -> bytes:
+        response, payload = self._request(_Request.RENDER, html_content.encode())
+        if response == _Response.BUSY:
+            raise PdfRendererBusyError("Too many PDFs are already waiting to be rendered")
+        if response == _Response.ERROR:
+            raise PdfRendererError(payload.decode())
+
+        return payload
+
+    def is_healthy(self) -> bool:
+        """Whether this worker's renderer is running and its browser is connected, starting it if it isn't yet."""
+        try:
+            return self._request(_Request.PING, b"")[0] == _Response.OK
+        except OSError, PdfRendererError:
+            return False
+
+    def stop(self) -> None:
+        with self._process_lock:
+            if self._process is not None and self._process_pid == os.getpid():
+                self._process.terminate()
+                self._process.join(timeout=5)
+            self._process = None
+            self._process_pid = None
+            self._socket_path = None
+
+    def _request(self, request: _Request, payload: bytes) -> tuple[_Response, bytes]:
+        try:
+            return _send(self._ensure_running(), request, payload, timeout=self._timeout)
+        except ConnectionRefusedError, FileNotFoundError:
+            # The renderer has gone away since it was last checked on; start a new one and try again once.
+            self._logger.warning("PDF renderer was not running, restarting it")
+            self.stop()
+            return _send(self._ensure_running(), request, payload, timeout=self._timeout)
+
+    def _is_running(self) -> bool:
+        # After a fork the process belongs to the parent, so each gunicorn worker starts its own.
+        return self._process_pid == os.getpid() and self._process is not None and self._process.is_alive()
+
+    def _ensure_running(self) -> str:
+        if self._is_running():
+            assert self._socket_path is not None
+            return self._socket_path
+
+        with self._process_lock:
+            if self._is_running():
+                assert self._socket_path is not None
+                return self._socket_path
+
+            socket_path = os.path.join(tempfile.gettempdir(), f"fs-pdf-renderer-{uuid.uuid4().hex[:12]}.sock")
+            # Spawned rather than forked, so that the renderer doesn't inherit gevent's monkeypatching or the
+            # worker's database connections.
+            process = multiprocessing.get_context("spawn").Process(
+                target=_run_renderer,
+                kwargs=dict(
+                    socket_path=socket_path,
+                    parent_pid=os.getpid(),
+                    concurrency=self.concurrency,
+                    max_queued=self._max_queued,
+                    max_renders_per_browser=self._max_renders_per_browser,
+                    http_credentials=self._http_credentials,
+                    browsers_path=self._browsers_path,
+                ),
+                name="pdf-renderer",
+                daemon=True,
+            )
+            process.start()
+            self._wait_until_ready(process, socket_path)
+
+            self._process, self._process_pid, self._socket_path = process, os.getpid(), socket_path
+            return socket_path
+
+    def _wait_until_ready(self, process: SpawnProcess, socket_path: str) -> None:
+        deadline = time.monotonic() + PDF_RENDERER_STARTUP_TIMEOUT_SECONDS
+        while process.is_alive() and time.monotonic() < deadline:
+            with contextlib.suppress(ConnectionRefusedError, FileNotFoundError):
+                response, _ = _send(socket_path, _Request.PING, b"", timeout=PDF_RENDERER_STARTUP_TIMEOUT_SECONDS)
+                if response == _Response.OK:
+                    return
+            time.sleep(0.05)
+
+        process.terminate()
+        raise PdfRendererError("PDF renderer did not start")
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            raise PdfRendererError("PDF renderer closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _send(socket_path: str, request: _Request, payload: bytes, *, timeout: float) -> tuple[_Response, bytes]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(_HEADER.pack(request, len(payload)) + payload)
+        response, length = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+        return _Response(response), _recv_exactly(sock, length)
+
+
+class _BrowserPool:
+    """
+    Runs in the renderer process: hands out warm browser contexts to render pages in, and replaces the browser once
+    it's rendered enough pages. A replaced browser is closed once the pages it's still rendering have finished.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        *,
+        concurrency: int,
+        max_renders_per_browser: int,
+        http_credentials: dict[str, str] | None,
+    ):
+        self._playwright = playwright
+        self._pages = asyncio.Semaphore(concurrency)
+        self._max_renders_per_browser = max_renders_per_browser
+        self._http_credentials = http_credentials
+        self._launch_lock = asyncio.Lock()
+        self._browser: Browser | None = None
+        self._browser_renders = 0
+        self._in_flight: defaultdict[Browser, int] = defaultdict(int)
+        self._idle_contexts: defaultdict[Browser, list[BrowserContext]] = defaultdict(list)
+
+    async def get_browser(self) -> Browser:
+        async with self._launch_lock:
+            if (
+                self._browser is None
+                or not self._browser.is_connected()
+                or self._browser_renders >= self._max_renders_per_browser
+            ):
+                retired, self._browser = self._browser, await self._playwright.chromium.launch()
+                self._browser_renders = 0
+                if retired is not None:
+                    await self._close_if_idle(retired)
+
+            return self._browser
+
+    async def render(self, html_content: str) -> bytes:
+        async with self._pages:
+            browser = await self.get_browser()
+            self._browser_renders += 1
+            self._in_flight[browser] += 1
+            try:
+                context = (
+                    self._idle_contexts[browser].pop()
+                    if self._idle_contexts[browser]
+                    else await browser.new_context(java_script_enabled=False, http_credentials=self._http_credentials)
+                )
+                try:
+                    page = await context.new_page()
+                    try:
+                        await page.set_content(html_content, wait_until="load")
+                        pdf_bytes = await page.pdf(**PDF_OPTIONS)
+                    finally:
+                        await page.close()
+                except BaseException:
+                    # Don't put a context back in the pool if something went wrong while using it.
+                    with contextlib.suppress(Exception):
+                        await context.close()
+                    raise
+
+                self._idle_contexts[browser].append(context)
+                return pdf_bytes
+            finally:
+                self._in_flight[browser] -= 1
+                if browser is not self._browser:
+                    await self._close_if_idle(browser)
+
+    async def _close_if_idle(self, browser: Browser) -> None:
+        if self._in_flight[browser]:
+            return
+
+        self._in_flight.pop(browser, None)
+        self._idle_contexts.pop(browser, None)
+        with contextlib.suppress(Exception):
+            await browser.close()
+
+
+def _run_renderer(
+    *,
+    socket_path: str,
+    parent_pid: int,
+    concurrency: int,
+    max_queued: int,
+    max_renders_per_browser: int,
+    http_credentials: dict[str, str] | None,
+    browsers_path: str | None,
+) -> None:
+    if browsers_path is not None:
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = browsers_path
+
+    asyncio.run(
+        _serve(
+            socket_path=socket_path,
+            parent_pid=parent_pid,
+            concurrency=concurrency,
+            max_queued=max_queued,
+            max_renders_per_browser=max_renders_per_browser,
+            http_credentials=http_credentials,
+        )
+    )
+
+
+async def _serve(
+    *,
+    socket_path: str,
+    parent_pid: int,
+    concurrency: int,
+    max_queued: int,
+    max_renders_per_browser: int,
+    http_credentials: dict[str, str] | None,
+) -> None:
+    from playwright.async_api import async_playwright
+
+    logger = logging.getLogger(__name__)
+    accepted = 0
+
+    async with async_playwright() as playwright:
+        pool = _BrowserPool(
+            playwright,
+            concurrency=concurrency,
+            max_renders_per_browser=max_renders_per_browser,
+            http_credentials=http_credentials,
+        )
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal accepted
+            try:
+                request, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                payload = await reader.readexactly(length)
+
+                if request == _Request.PING:
+                    browser = await pool.get_browser()
+                    response, body = (_Response.OK if browser.is_connected() else _Response.ERROR), b""
+                elif accepted >= concurrency + max_queued:
+                    response, body = _Response.BUSY, b""
+                else:
+                    accepted += 1
+                    try:
+                        response, body = _Response.OK, await pool.render(payload.decode())
+                    except Exception as e:
+                        logger.exception("Failed to render PDF")
+                        response, body = _Response.ERROR, repr(e).encode()
+                    finally:
+                        accepted -= 1
+
+                writer.write(_HEADER.pack(response, len(body)) + body)
+                await writer.drain()
+            except asyncio.IncompleteReadError, ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        async with server:
+            # Stop when the worker that started us has gone, so that renderers (and their browsers) aren't left behind.
+            while os.getppid() == parent_pid:
+                await asyncio.sleep(1)
@@ -1,6 +1,9 @@
+from collections.abc import Iterator
+from typing import IO
 from urllib.parse import urlencode
 
 import boto3
+from botocore.exceptions import ClientError
 from flask import Flask
 from types_boto3_s3.type_defs import TagTypeDef
 from werkzeug.datastructures import FileStorage
@@ -24,11 +27,26 @@ class S3Service:
             extra_args["Tagging"] = urlencode(tags)
         self._bucket.upload_fileobj(Fileobj=file.stream, Key=key, ExtraArgs=extra_args if extra_args else None)
 
+    def upload_fileobj(self, fileobj: IO[bytes], key: str, *, content_type: str) -> None:
+        # Large files are sent as a multipart upload, a part at a time, rather than being read into memory.
+        self._bucket.upload_fileobj(Fileobj=fileobj, Key=key, ExtraArgs={"ContentType": content_type})
+
     def download_file(self, key: str) -> bytes:
         # prefer using `generate_and_give_access_to_url` instead of this method, at the time of writing
         # there is a signature conflict generating URLs which we should further investigate when there's time
         return self._bucket.Object(key).get()["Body"].read()
 
+    def download_file_if_exists(self, key: str) -> bytes | None:
+        try:
+            return self.download_file(key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchKey":
+                return None
+            raise
+
+    def stream_file(self, key: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        return self._bucket.Object(key).get()["Body"].iter_chunks(chunk_size=chunk_size)
+
     def generate_and_give_access_to_url(self, answer: FileUploadAnswer) -> str:
         raise NotImplementedError("Signed URLs failing on signature mismatch")
 
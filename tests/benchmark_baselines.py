@@ -0,0 +1,77 @@
+"""
+Pinned copies of implementations that have since been replaced, kept so that the benchmarks in
+`app/developers/benchmarks.py` can time a new implementation against the code it replaced. These are not used by the
+app and should not be changed to track it - they are only removed along with the benchmark that uses them.
+"""
+
+import decimal
+from decimal import Decimal
+
+from app.common.data.types import NumberTypeEnum, QuestionDataType
+from app.deliver_grant_funding.data_sets import (
+    BritishPoundsError,
+    CellError,
+    DataTypeError,
+    DecimalError,
+    PrefixError,
+    SuffixError,
+)
+from app.deliver_grant_funding.session_models import DataSetColumnMapping, DataSetUploadSessionModel
+
+
+# Data set validation as it was before validators were compiled once per column: each cell's mapping is looked up and
+# checked from scratch, a row at a time.
+def legacy_validate_data_set_cell(  # noqa: C901
+    column: str, value: str, mapping: DataSetColumnMapping
+) -> list[CellError]:
+    if mapping.data_type != QuestionDataType.NUMBER:
+        return []
+
+    errors: list[CellError] = []
+    stripped = value.strip()
+    if mapping.prefix:
+        stripped = stripped.removeprefix(mapping.prefix)
+    if mapping.suffix:
+        stripped = stripped.removesuffix(mapping.suffix)
+    stripped = stripped.replace(",", "").strip()
+
+    if mapping.suffix or mapping.prefix:
+        try:
+            Decimal(stripped)
+        except decimal.InvalidOperation:
+            if mapping.prefix:
+                errors.append(PrefixError(column=column, prefix=mapping.prefix))
+            if mapping.suffix:
+                errors.append(SuffixError(column=column, suffix=mapping.suffix))
+
+    if mapping.number_type == NumberTypeEnum.INTEGER and not stripped.lstrip("-").isdigit():
+        errors.append(DataTypeError(column=column, expected_type=NumberTypeEnum.INTEGER))
+
+    if mapping.number_type == NumberTypeEnum.DECIMAL:
+        decimal_places = len(stripped.split(".")[1]) if "." in stripped else 0
+        if mapping.max_decimal_places is not None and decimal_places > mapping.max_decimal_places:
+            errors.append(DecimalError(column=column, max_decimal_places=mapping.max_decimal_places))
+        try:
+            Decimal(stripped)
+        except decimal.InvalidOperation:
+            errors.append(DataTypeError(column=column, expected_type=NumberTypeEnum.DECIMAL))
+
+    if mapping.column_type == "BRITISH_POUNDS" and errors:
+        return [BritishPoundsError(column=column)]
+    return errors
+
+
+def legacy_validate_data_set(
+    data_set: DataSetUploadSessionModel, rows: list[dict[str, str]]
+) -> list[tuple[int, list[CellError]]]:
+    results = []
+    for idx, row in enumerate(rows):
+        cell_errors = []
+        for column in data_set.data_columns:
+            value = row.get(column, "").strip()
+            mapping = data_set.get_column_mapping(column)
+            if value and mapping:
+                cell_errors.extend(legacy_validate_data_set_cell(column, value, mapping))
+        if cell_errors:
+            results.append((idx, cell_errors))
+    return results
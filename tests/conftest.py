@@ -233,6 +233,7 @@ class MockS3ServiceCalls:
     def __init__(self) -> None:
         self.upload_file_calls: list[_Call] = []
         self.download_file_calls: list[_Call] = []
+        self.stream_file_calls: list[_Call] = []
         self.delete_file_calls: list[_Call] = []
         self.delete_prefix_calls: list[_Call] = []
         self.update_file_tags: list[_Call] = []
@@ -242,6 +243,7 @@ class MockS3ServiceCalls:
         return (
             self.upload_file_calls
             + self.download_file_calls
+            + self.stream_file_calls
             + self.delete_file_calls
             + self.delete_prefix_calls
             + self.update_file_tags
@@ -260,6 +262,10 @@ def mock_s3_service_calls(mocker: MockerFixture) -> Generator[MockS3ServiceCalls
         tracker.download_file_calls.append(mocker.call(*args, **kwargs))
         return b"mocked file content"
 
+    def _track_stream_file(*args, **kwargs):
+        tracker.stream_file_calls.append(mocker.call(*args, **kwargs))
+        return iter([b"mocked file content"])
+
     def _track_delete_file(*args, **kwargs):
         tracker.delete_file_calls.append(mocker.call(*args, **kwargs))
         return None
@@ -280,6 +286,10 @@ def mock_s3_service_calls(mocker: MockerFixture) -> Generator[MockS3ServiceCalls
         "app.services.s3.S3Service.download_file",
         side_effect=_track_download_file,
     )
+    mocker.patch(
+        "app.services.s3.S3Service.stream_file",
+        side_effect=_track_stream_file,
+    )
     mocker.patch(
         "app.services.s3.S3Service.delete_file",
         side_effect=_track_delete_file,
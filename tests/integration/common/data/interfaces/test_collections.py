@@ -2,10 +2,11 @@ import datetime
 import uuid
 
 import pytest
-from sqlalchemy import Date, func, select
+from sqlalchemy import Date, Text, func, inspect, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
-from app.common.collections.types import EmailAnswer, SingleChoiceFromListAnswer, TextSingleLineAnswer
+from app.common.collections.types import EmailAnswer, FileUploadAnswer, SingleChoiceFromListAnswer, TextSingleLineAnswer
 from app.common.data.interfaces import collections
 from app.common.data.interfaces.collections import (
     AddAnotherDependencyException,
@@ -34,6 +35,7 @@ from app.common.data.interfaces.collections import (
     delete_form,
     delete_question,
     get_all_submissions_with_mode_for_collection,
+    get_changed_submissions_for_collection,
     get_collection,
     get_collection_by_slug,
     get_collections_by_status_excluding_draft_grants,
@@ -42,6 +44,7 @@ from app.common.data.interfaces.collections import (
     get_expression_by_id,
     get_form_by_id,
     get_group_by_id,
+    get_max_add_another_counts_for_collection,
     get_overdue_open_collections_excluding_draft_grants,
     get_question_by_id,
     get_referenced_data_source_items_by_managed_expression,
@@ -50,6 +53,7 @@ from app.common.data.interfaces.collections import (
     get_submissions_by_grant_recipient_collection,
     group_name_exists,
     is_component_dependency_order_valid,
+    iter_submissions_with_mode_for_collection,
     move_component_down,
     move_component_up,
     move_form_down,
@@ -3320,6 +3324,76 @@ class TestUpdateSubmissionData:
             "Added_email_6@email.com"
         )
 
+    def test_update_submission_data_only_patches_changed_keys(self, db_session, factories):
+        form = factories.form.create()
+        question1 = factories.question.create(form=form)
+        question2 = factories.question.create(form=form, data_type=QuestionDataType.FILE_UPLOAD)
+        question3 = factories.question.create(form=form)
+        submission = factories.submission.create(collection=form.collection)
+        submission.data_manager.set(question2, FileUploadAnswer(filename="file.txt", size=10, mime_type="text/plain"))
+        update_submission_data(submission)
+
+        # Answered by another request since this submission was loaded
+        db_session.execute(
+            update(Submission)
+            .where(Submission.id == submission.id)
+            .values({Submission._data: Submission._data.op("||")(func.jsonb_build_object(str(question3.id), "other"))})
+            .execution_options(synchronize_session=False)
+        )
+
+        submission.data_manager.set(question1, TextSingleLineAnswer("answer"))
+        submission.data_manager.remove(question2)
+        update_submission_data(submission)
+
+        assert submission._data == {str(question1.id): "answer", str(question3.id): "other"}
+        assert not inspect(submission).attrs._data.history.has_changes()
+        assert db_session.scalar(select(Submission._data).where(Submission.id == submission.id)) == submission._data
+
+    def test_update_submission_data_only_patches_changed_add_another_entries(self, db_session, factories):
+        group = factories.group.create(add_another=True)
+        question = factories.question.create(form=group.form, parent=group)
+        submission = factories.submission.create(
+            collection=group.form.collection,
+            _data={str(group.id): [{str(question.id): "a"}, {str(question.id): "b"}]},
+        )
+
+        # The second entry was changed by another request since this submission was loaded
+        db_session.execute(
+            update(Submission)
+            .where(Submission.id == submission.id)
+            .values(
+                {
+                    Submission._data: func.jsonb_set(
+                        Submission._data,
+                        literal([str(group.id), "1", str(question.id)], ARRAY(Text)),
+                        literal("other", JSONB),
+                    )
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        submission.data_manager.set(question, TextSingleLineAnswer("changed"), add_another_index=0)
+        update_submission_data(submission)
+
+        assert submission._data == {str(group.id): [{str(question.id): "changed"}, {str(question.id): "other"}]}
+        assert db_session.scalar(select(Submission._data).where(Submission.id == submission.id)) == submission._data
+
+    def test_update_submission_data_rewrites_everything_for_lots_of_changes(
+        self, app, db_session, factories, monkeypatch
+    ):
+        monkeypatch.setitem(app.config, "SUBMISSION_DATA_PATCH_MAX_KEYS", 2)
+        form = factories.form.create()
+        questions = factories.question.create_batch(3, form=form)
+        submission = factories.submission.create(collection=form.collection)
+
+        for question in questions:
+            submission.data_manager.set(question, TextSingleLineAnswer(question.name))
+        update_submission_data(submission)
+
+        assert submission._data == {str(question.id): question.name for question in questions}
+        assert db_session.scalar(select(Submission._data).where(Submission.id == submission.id)) == submission._data
+
 
 class TestAddSubmissionEvent:
     def test_add_submission_event(self, db_session, factories):
@@ -3348,6 +3422,25 @@ class TestAddSubmissionEvent:
         assert from_db.events[1].related_entity_id == submission.id
         assert from_db.events[1].data == {}
 
+    def test_add_submission_event_records_last_event_at_utc(self, db_session, factories):
+        user = factories.user.create()
+        form = factories.form.create()
+        submission = factories.submission.create(collection=form.collection)
+        assert submission.last_event_at_utc is None
+
+        _add_submission_event(
+            submission,
+            user=user,
+            event_type=SubmissionEventType.FORM_RUNNER_FORM_COMPLETED,
+            related_entity_id=form.id,
+        )
+        _add_submission_event(submission, user=user, event_type=SubmissionEventType.SUBMISSION_SUBMITTED)
+
+        db_session.expire_all()
+        from_db = get_submission(submission.id)
+
+        assert from_db.last_event_at_utc == max(event.created_at_utc for event in from_db.events)
+
     def test_add_certification_and_submission_event(self, db_session, factories):
         user = factories.user.create()
         form = factories.form.create()
@@ -5552,6 +5645,139 @@ class TestGetSubmissions:
         assert len(iterate_queries) == baseline
 
 
+class TestIterSubmissionsWithModeForCollection:
+    def test_yields_chunks_in_reference_order(self, db_session, factories):
+        collection = factories.collection.create()
+        for reference in ["TEST-003", "TEST-001", "TEST-002"]:
+            factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE, reference=reference)
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST, reference="TEST-000")
+
+        chunks = iter_submissions_with_mode_for_collection(collection, SubmissionModeEnum.LIVE, chunk_size=2)
+
+        first_chunk = next(chunks)
+        assert [submission.reference for submission in first_chunk] == ["TEST-001", "TEST-002"]
+        assert all(submission in db_session for submission in first_chunk)
+
+        second_chunk = next(chunks)
+        assert [submission.reference for submission in second_chunk] == ["TEST-003"]
+        assert not any(submission in db_session for submission in first_chunk)
+
+        assert next(chunks, None) is None
+
+    def test_loads_events_and_reuses_the_collection(self, db_session, factories, track_sql_queries):
+        collection = factories.collection.create()
+        user = factories.user.create()
+        for _ in range(3):
+            submission = factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+            _add_submission_event(submission, user=user, event_type=SubmissionEventType.SUBMISSION_SUBMITTED)
+        collection = get_collection(collection.id, with_full_schema=True)
+
+        with track_sql_queries() as queries:
+            for chunk in iter_submissions_with_mode_for_collection(collection, SubmissionModeEnum.LIVE, chunk_size=2):
+                for submission in chunk:
+                    assert submission.collection is collection
+                    assert submission.events[0].created_by.id == user.id
+
+        # Two chunks, each with a batch load for events and data sources
+        assert len(queries) <= 6
+
+
+class TestGetChangedSubmissionsForCollection:
+    @staticmethod
+    def _set_updated_at(db_session, submission, updated_at):
+        db_session.execute(update(Submission).where(Submission.id == submission.id).values(updated_at_utc=updated_at))
+
+    def test_returns_submissions_changed_since_in_the_order_they_changed(self, db_session, factories):
+        collection = factories.collection.create()
+        unchanged, updated, with_new_event = factories.submission.create_batch(
+            3, collection=collection, mode=SubmissionModeEnum.LIVE
+        )
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+        self._set_updated_at(db_session, unchanged, datetime.datetime(2025, 10, 1))
+        self._set_updated_at(db_session, updated, datetime.datetime(2025, 10, 20))
+        self._set_updated_at(db_session, with_new_event, datetime.datetime(2025, 10, 1))
+        factories.submission_event.create(
+            submission=with_new_event,
+            created_by=with_new_event.created_by,
+            created_at_utc=datetime.datetime(2025, 11, 1, 12),
+        )
+
+        changes = get_changed_submissions_for_collection(
+            collection.id,
+            SubmissionModeEnum.LIVE,
+            since=datetime.datetime(2025, 10, 15),
+            until=datetime.datetime(2025, 12, 1),
+            limit=10,
+        )
+
+        assert changes == [
+            (updated.id, datetime.datetime(2025, 10, 20)),
+            (with_new_event.id, datetime.datetime(2025, 11, 1, 12)),
+        ]
+
+    def test_excludes_changes_after_until(self, db_session, factories):
+        collection = factories.collection.create()
+        submission = factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+        self._set_updated_at(db_session, submission, datetime.datetime(2025, 10, 20))
+
+        assert (
+            get_changed_submissions_for_collection(
+                collection.id, SubmissionModeEnum.LIVE, since=None, until=datetime.datetime(2025, 10, 1), limit=10
+            )
+            == []
+        )
+
+    def test_pages_through_submissions_that_changed_at_the_same_time(self, db_session, factories):
+        collection = factories.collection.create()
+        submissions = factories.submission.create_batch(5, collection=collection, mode=SubmissionModeEnum.LIVE)
+        for submission in submissions:
+            self._set_updated_at(db_session, submission, datetime.datetime(2025, 10, 20))
+
+        pages = []
+        after = None
+        while True:
+            page = get_changed_submissions_for_collection(
+                collection.id,
+                SubmissionModeEnum.LIVE,
+                since=datetime.datetime(2025, 10, 1),
+                until=datetime.datetime(2025, 12, 1),
+                after=after,
+                limit=2,
+            )
+            if not page:
+                break
+            pages.append(page)
+            after = (page[-1][1], page[-1][0])
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [submission_id for page in pages for submission_id, _ in page] == sorted(
+            submission.id for submission in submissions
+        )
+
+
+class TestGetMaxAddAnotherCountsForCollection:
+    def test_counts_entries(self, db_session, factories):
+        group = factories.group.create(add_another=True)
+        other_group = factories.group.create(add_another=True, form=group.form)
+        question = factories.question.create(form=group.form, parent=group)
+        for num_answers in [2, 4]:
+            factories.submission.create(
+                collection=group.form.collection,
+                mode=SubmissionModeEnum.LIVE,
+                answers=[
+                    FactoryAnswer(question, TextSingleLineAnswer(f"answer {i}"), add_another_index=i)
+                    for i in range(num_answers)
+                ],
+            )
+
+        assert get_max_add_another_counts_for_collection(
+            group.form.collection.id, SubmissionModeEnum.LIVE, [group.id, other_group.id]
+        ) == {group.id: 4, other_group.id: 0}
+        assert get_max_add_another_counts_for_collection(
+            group.form.collection.id, SubmissionModeEnum.TEST, [group.id]
+        ) == {group.id: None}
+
+
 class TestGetSubmissionListForCollection:
     def test_single_submission_collection_returns_a_row_per_grant_recipient(self, db_session, factories):
         collection = factories.collection.create()
@@ -12,6 +12,7 @@ from app.common.data.interfaces.collections import (
     get_question_by_id,
 )
 from app.common.data.interfaces.data_sets import (
+    DataSourceReplacementSummary,
     create_uploaded_data_source,
     delete_data_source,
     get_collection_ids_with_missing_data_data_sets,
@@ -20,6 +21,7 @@ from app.common.data.interfaces.data_sets import (
     get_referenced_grant_recipient_data_sources_for_collection,
     replace_uploaded_data_source,
 )
+from app.common.data.interfaces.exceptions import DuplicateDataSourceItemError
 from app.common.data.models import (
     ComponentReference,
     DataSource,
@@ -310,6 +312,46 @@ class TestCreateUploadedDataSourceGrantRecipient:
         org_item = db_session.query(DataSourceOrganisationItem).filter_by(data_source_id=data_source.id).one()
         assert org_item._data["c_notes"] is None
 
+    def test_writes_rows_in_batches_as_they_are_read(self, db_session, factories, mocker):
+        mocker.patch("app.common.data.interfaces.data_sets.DATA_SET_ORGANISATION_ITEMS_BATCH_SIZE", 2)
+        grant = factories.grant.create()
+        collection = factories.collection.create(grant=grant)
+        user = factories.user.create()
+        data_source_id = uuid.uuid4()
+        items_written_before_each_row = []
+
+        def _rows():
+            for i in range(5):
+                with db_session.no_autoflush:
+                    items_written_before_each_row.append(
+                        db_session.scalar(
+                            select(func.count())
+                            .select_from(DataSourceOrganisationItem)
+                            .where(DataSourceOrganisationItem.data_source_id == data_source_id)
+                        )
+                    )
+                yield {
+                    DATA_SET_EXTERNAL_ID_COLUMN_HEADER: f"E{i}",
+                    DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: f"Recipient {i}",
+                    "Notes": f"Row {i}",
+                }
+
+        data_source = create_uploaded_data_source(
+            name="Test Batched Rows",
+            data_source_type=DataSourceType.GRANT_RECIPIENT,
+            grant_id=grant.id,
+            collection_id=collection.id,
+            column_mappings=[DataSetColumnMapping(column_name="Notes", column_type="TEXT")],
+            all_rows=_rows(),
+            user=user,
+            data_source_id=data_source_id,
+            original_filename="test.csv",
+            s3_key="data-set-uploads/test.csv",
+        )
+
+        assert items_written_before_each_row == [0, 0, 2, 2, 4]
+        assert len(data_source.organisation_items) == 5
+
 
 class TestCreateUploadedDataSourceErrors:
     def test_raises_error_for_unsupported_type(self, db_session, factories):
@@ -355,6 +397,28 @@ class TestCreateUploadedDataSourceErrors:
                 s3_key="data-set-uploads/test.csv",
             )
 
+    def test_raises_error_for_duplicate_external_ids(self, db_session, factories):
+        grant = factories.grant.create()
+        collection = factories.collection.create(grant=grant)
+        user = factories.user.create()
+
+        with pytest.raises(DuplicateDataSourceItemError):
+            create_uploaded_data_source(
+                name="Test Duplicates",
+                data_source_type=DataSourceType.GRANT_RECIPIENT,
+                grant_id=grant.id,
+                collection_id=collection.id,
+                column_mappings=[DataSetColumnMapping(column_name="Notes", column_type="TEXT")],
+                all_rows=[
+                    {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Notes": "First"},
+                    {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Notes": "Second"},
+                ],
+                user=user,
+                data_source_id=uuid.uuid4(),
+                original_filename="test.csv",
+                s3_key="data-set-uploads/test.csv",
+            )
+
 
 class TestCreateUploadedDataSourceSchemaOptions:
     def test_number_columns_have_presentation_and_data_options(self, db_session, factories):
@@ -1010,7 +1074,7 @@ class TestReplaceUploadedDataSource:
 
         from_db = get_data_source(data_source.id, with_organisation_items=True)
         assert len(from_db.organisation_items) == 3
-        assert {oi.id for oi in from_db.organisation_items}.isdisjoint({oi_id1, oi_id2, oi_id3})
+        assert {oi.id for oi in from_db.organisation_items} == {oi_id1, oi_id2, oi_id3}
 
         oi_1 = from_db.get_filtered_organisation_item(gr1.organisation.external_id)
         assert oi_1.data["c_whole_number"].get_value_for_evaluation() == 111
@@ -1028,6 +1092,74 @@ class TestReplaceUploadedDataSource:
         assert oi_3.data["c_just_text"] is None
         assert oi_3.data["c_british_pounds"].get_value_for_interpolation() == "£2.30"
 
+    def test_replace_data_source_only_writes_changed_rows(self, factories):
+        collection = factories.collection.create()
+        data_source = create_uploaded_data_source(
+            name="Test Replace",
+            data_source_type=DataSourceType.GRANT_RECIPIENT,
+            grant_id=collection.grant.id,
+            collection_id=collection.id,
+            column_mappings=[DataSetColumnMapping(column_name="Notes", column_type="TEXT")],
+            all_rows=[
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Notes": "Unchanged"},
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E2", "Notes": "Before"},
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E3", "Notes": "Removed"},
+            ],
+            user=factories.user.create(),
+            data_source_id=uuid.uuid4(),
+            original_filename="test.csv",
+            s3_key="data-set-uploads/test.csv",
+        )
+        original_ids = {oi.external_id: oi.id for oi in data_source.organisation_items}
+
+        summary = replace_uploaded_data_source(
+            data_source=data_source,
+            new_columns=[],
+            all_headers=["Notes"],
+            all_rows=[
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Notes": "Unchanged"},
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E2", "Notes": "After"},
+                {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E4", "Notes": "Added"},
+            ],
+            s3_key="file_key",
+            original_filename="file.csv",
+            user=factories.user.create(),
+        )
+
+        assert summary == DataSourceReplacementSummary(added=1, updated=1, removed=1, unchanged=1)
+
+        from_db = get_data_source(data_source.id, with_organisation_items=True)
+        assert {oi.external_id: oi._data["c_notes"] for oi in from_db.organisation_items} == {
+            "E1": "Unchanged",
+            "E2": "After",
+            "E4": "Added",
+        }
+        assert from_db.get_filtered_organisation_item("E1").id == original_ids["E1"]
+        assert from_db.get_filtered_organisation_item("E2").id == original_ids["E2"]
+
+    def test_replace_data_source_raises_error_for_duplicate_external_ids(self, factories):
+        collection = factories.collection.create()
+        data_source = factories.data_source.create(
+            grant=collection.grant,
+            collection=collection,
+            create_gr_org_items=True,
+            type=DataSourceType.GRANT_RECIPIENT,
+        )
+
+        with pytest.raises(DuplicateDataSourceItemError):
+            replace_uploaded_data_source(
+                data_source=data_source,
+                new_columns=[],
+                all_headers=["Allocation"],
+                all_rows=[
+                    {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Allocation": "111"},
+                    {DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E1", "Allocation": "222"},
+                ],
+                s3_key="file_key",
+                original_filename="file.csv",
+                user=factories.user.create(),
+            )
+
     def test_replace_data_source_updates_column_order(self, factories):
         collection = factories.collection.create()
         data_source = factories.data_source.create(
@@ -1078,11 +1210,11 @@ class TestReplaceUploadedDataSource:
             data_source=data_source,
             _data={"c_whole_number": 111, "c_decimal_number": "1.1", "c_just_text": "first version 1"},
         ).id
-        oi_id2 = factories.data_source_organisation_item.create(
+        factories.data_source_organisation_item.create(
             external_id=gr2.organisation.external_id,
             data_source=data_source,
             _data={"c_whole_number": 222, "c_decimal_number": "2.1", "c_just_text": "first version 2"},
-        ).id
+        )
 
         assert len(get_data_source(data_source.id, with_organisation_items=True).organisation_items) == 2
 
@@ -1105,7 +1237,7 @@ class TestReplaceUploadedDataSource:
 
         from_db = get_data_source(data_source.id, with_organisation_items=True)
         assert len(from_db.organisation_items) == 1
-        assert {oi.id for oi in from_db.organisation_items}.isdisjoint({oi_id1, oi_id2})
+        assert {oi.id for oi in from_db.organisation_items} == {oi_id1}
 
         oi_1 = from_db.get_filtered_organisation_item(gr1.organisation.external_id)
         assert oi_1 is not None
@@ -1155,7 +1287,7 @@ class TestReplaceUploadedDataSource:
 
         from_db = get_data_source(data_source.id, with_organisation_items=True)
         assert len(from_db.organisation_items) == 2
-        assert {oi.id for oi in from_db.organisation_items}.isdisjoint({oi_id1})
+        assert oi_id1 in {oi.id for oi in from_db.organisation_items}
 
         oi_1 = from_db.get_filtered_organisation_item(gr1.organisation.external_id)
         assert oi_1.data["c_whole_number"].get_value_for_evaluation() == 111
@@ -1426,7 +1558,7 @@ class TestReplaceUploadedDataSource:
 
         from_db = get_data_source(data_source.id, with_organisation_items=True)
         assert len(from_db.organisation_items) == 2
-        assert {oi.id for oi in from_db.organisation_items}.isdisjoint({oi_id1, oi_id2})
+        assert {oi.id for oi in from_db.organisation_items} == {oi_id1, oi_id2}
         assert len(from_db.schema.root.items()) == 6  # 6 original - 1 removed + 1 added
         assert set(from_db.schema.root.keys()) == {
             "c_new_text_column",
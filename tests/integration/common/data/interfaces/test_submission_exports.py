@@ -0,0 +1,263 @@
+import datetime
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import NoResultFound
+
+from app.common.data.interfaces.submission_exports import (
+    claim_next_submission_export_job,
+    complete_submission_export_job,
+    create_submission_export_job,
+    fail_submission_export_job,
+    get_latest_submission_export_job,
+    get_submission_export_job,
+    get_submission_export_watermark,
+    use_submission_export_snapshot,
+)
+from app.common.data.models import SubmissionExportJob
+from app.common.data.types import (
+    ExpressionType,
+    SubmissionExportFormatEnum,
+    SubmissionExportJobStatusEnum,
+    SubmissionModeEnum,
+)
+
+STALE_AFTER = datetime.timedelta(minutes=30)
+
+
+def _create_job(collection, user, submission_mode=SubmissionModeEnum.LIVE):
+    return create_submission_export_job(
+        collection,
+        submission_mode=submission_mode,
+        export_format=SubmissionExportFormatEnum.CSV,
+        requested_by=user,
+    )
+
+
+class TestCreateSubmissionExportJob:
+    def test_creates_pending_job(self, db_session, factories):
+        user = factories.user.create()
+        collection = factories.collection.create()
+
+        job = _create_job(collection, user)
+
+        from_db = db_session.get(SubmissionExportJob, job.id)
+        assert from_db.status == SubmissionExportJobStatusEnum.PENDING
+        assert from_db.submissions_exported == 0
+        assert from_db.total_submissions is None
+        assert from_db.s3_key is None
+        assert from_db.requested_by == user
+
+
+class TestGetSubmissionExportJob:
+    def test_gets_job_for_collection(self, db_session, factories):
+        user = factories.user.create()
+        collection = factories.collection.create()
+        job = _create_job(collection, user)
+
+        assert get_submission_export_job(job.id, collection_id=collection.id) == job
+
+    def test_raises_for_job_from_another_collection(self, db_session, factories):
+        user = factories.user.create()
+        job = _create_job(factories.collection.create(), user)
+
+        with pytest.raises(NoResultFound):
+            get_submission_export_job(job.id, collection_id=factories.collection.create().id)
+
+
+class TestGetLatestSubmissionExportJob:
+    def test_returns_none_when_no_jobs(self, db_session, factories):
+        user = factories.user.create()
+        collection = factories.collection.create()
+
+        assert (
+            get_latest_submission_export_job(collection.id, submission_mode=SubmissionModeEnum.LIVE, requested_by=user)
+            is None
+        )
+
+    @pytest.mark.freeze_time("2025-01-02 12:00:00")
+    def test_returns_most_recent_job_for_user_and_mode(self, db_session, factories, time_freezer):
+        user, other_user = factories.user.create_batch(2)
+        collection = factories.collection.create()
+
+        _create_job(collection, user)
+        time_freezer.update_frozen_time(datetime.timedelta(minutes=1))
+        latest = _create_job(collection, user)
+        time_freezer.update_frozen_time(datetime.timedelta(minutes=1))
+        _create_job(collection, other_user)
+        _create_job(collection, user, submission_mode=SubmissionModeEnum.TEST)
+
+        assert (
+            get_latest_submission_export_job(collection.id, submission_mode=SubmissionModeEnum.LIVE, requested_by=user)
+            == latest
+        )
+
+
+class TestClaimNextSubmissionExportJob:
+    def test_returns_none_when_nothing_to_do(self, db_session):
+        assert claim_next_submission_export_job(stale_after=STALE_AFTER) is None
+
+    @pytest.mark.freeze_time("2025-01-02 12:00:00")
+    def test_claims_oldest_pending_job(self, db_session, factories, time_freezer):
+        user = factories.user.create()
+        collection = factories.collection.create()
+        factories.submission.create_batch(3, collection=collection, mode=SubmissionModeEnum.LIVE)
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+
+        oldest = _create_job(collection, user)
+        time_freezer.update_frozen_time(datetime.timedelta(minutes=1))
+        _create_job(collection, user)
+
+        job = claim_next_submission_export_job(stale_after=STALE_AFTER)
+
+        assert job == oldest
+        assert job.status == SubmissionExportJobStatusEnum.IN_PROGRESS
+        assert job.total_submissions == 3
+        assert job.attempts == 1
+
+    def test_does_not_claim_finished_or_recently_claimed_jobs(self, db_session, factories):
+        user = factories.user.create()
+        collection = factories.collection.create()
+
+        completed = _create_job(collection, user)
+        complete_submission_export_job(completed, s3_key="key", submissions_exported=0)
+        failed = _create_job(collection, user)
+        fail_submission_export_job(failed)
+        in_progress = _create_job(collection, user)
+        in_progress.status = SubmissionExportJobStatusEnum.IN_PROGRESS
+        db_session.flush()
+
+        assert claim_next_submission_export_job(stale_after=STALE_AFTER) is None
+
+    def test_reclaims_stale_in_progress_job(self, db_session, factories):
+        user = factories.user.create()
+        collection = factories.collection.create()
+        job = _create_job(collection, user)
+        job.status = SubmissionExportJobStatusEnum.IN_PROGRESS
+        job.submissions_exported = 10
+        job.attempts = 1
+        db_session.flush()
+        db_session.execute(
+            update(SubmissionExportJob)
+            .where(SubmissionExportJob.id == job.id)
+            .values(updated_at_utc=SubmissionExportJob.updated_at_utc - STALE_AFTER * 2)
+        )
+
+        claimed = claim_next_submission_export_job(stale_after=STALE_AFTER)
+
+        assert claimed == job
+        assert claimed.submissions_exported == 0
+        assert claimed.attempts == 2
+
+
+class TestFinishSubmissionExportJob:
+    def test_complete(self, db_session, factories):
+        user = factories.user.create()
+        job = _create_job(factories.collection.create(), user)
+
+        complete_submission_export_job(job, s3_key="some/key.csv", submissions_exported=5)
+
+        db_session.expire_all()
+        from_db = db_session.get(SubmissionExportJob, job.id)
+        assert from_db.status == SubmissionExportJobStatusEnum.COMPLETED
+        assert from_db.s3_key == "some/key.csv"
+        assert from_db.submissions_exported == 5
+        assert from_db.completed_at_utc is not None
+
+    def test_fail(self, db_session, factories):
+        user = factories.user.create()
+        job = _create_job(factories.collection.create(), user)
+
+        fail_submission_export_job(job)
+
+        db_session.expire_all()
+        from_db = db_session.get(SubmissionExportJob, job.id)
+        assert from_db.status == SubmissionExportJobStatusEnum.FAILED
+        assert from_db.s3_key is None
+        assert from_db.completed_at_utc is not None
+
+
+class TestGetSubmissionExportWatermark:
+    def test_changes_when_submissions_change(self, db_session, factories):
+        collection = factories.collection.create()
+        submission = factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+
+        watermarks = [get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE)]
+
+        other_submission = factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        factories.submission_event.create(submission=submission, created_by=submission.created_by)
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        db_session.delete(other_submission)
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        assert len(set(watermarks)) == len(watermarks)
+
+    def test_changes_when_organisations_or_users_in_the_export_change(self, db_session, factories):
+        collection = factories.collection.create()
+        submission = factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+        certifier = factories.user.create()
+        factories.submission_event.create(submission=submission, created_by=certifier)
+        later = datetime.datetime(2030, 1, 1)
+
+        watermarks = [get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE)]
+
+        submission.grant_recipient.organisation.name = "Renamed organisation"
+        submission.grant_recipient.organisation.updated_at_utc = later
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        submission.created_by.email = "renamed-creator@example.com"
+        submission.created_by.updated_at_utc = later
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        certifier.email = "renamed-certifier@example.com"
+        certifier.updated_at_utc = later
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        assert len(set(watermarks)) == len(watermarks)
+
+    def test_changes_when_the_collection_schema_changes(self, db_session, factories):
+        question = factories.question.create()
+        collection = question.form.collection
+        later = datetime.datetime(2030, 1, 1)
+
+        watermarks = [get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE)]
+
+        other_question = factories.question.create(form=question.form)
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        question.name = "Renamed question"
+        question.updated_at_utc = later
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        factories.expression.create(question=other_question, type_=ExpressionType.CONDITION, statement="False")
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        db_session.delete(other_question)
+        db_session.flush()
+        watermarks.append(get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE))
+
+        assert len(set(watermarks)) == len(watermarks)
+
+    def test_does_not_change_for_other_submission_modes(self, db_session, factories):
+        collection = factories.collection.create()
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.LIVE)
+        watermark = get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE)
+
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+
+        assert get_submission_export_watermark(collection.id, submission_mode=SubmissionModeEnum.LIVE) == watermark
+
+
+class TestUseSubmissionExportSnapshot:
+    def test_rejects_anything_but_a_snapshot_id(self, db_session):
+        with pytest.raises(ValueError):
+            use_submission_export_snapshot("00000003-0000001B-1'; DROP TABLE submission; --")
@@ -2,11 +2,14 @@ import csv
 import json
 import logging
 import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import date, datetime
 from decimal import Decimal
-from io import StringIO
+from io import BytesIO, StringIO
 from unittest import mock
+from xml.etree import ElementTree
 
 import pytest
 
@@ -45,6 +48,7 @@ from app.common.exceptions import SubmissionAnswerConflict
 from app.common.expressions import ExpressionContext
 from app.common.expressions.managed import GreaterThan, IsYes
 from app.common.expressions.references import ExpressionReference, InterpolationStatement
+from app.common.helpers import collections as collections_helpers
 from app.common.helpers.collections import (
     AllSubmissionsHelper,
     CollectionDoesNotAllowValidationError,
@@ -3321,6 +3325,22 @@ class TestSubmissionsHelper:
         assert live_submissions_helper.submission_mode == SubmissionModeEnum.LIVE
         assert len(live_submissions_helper.submissions) == 3
 
+    def test_iter_csv_content_yields_header_then_one_line_per_submission(self, factories):
+        collection = factories.collection.create(
+            create_completed_submissions_each_question_type__test=2,
+            create_completed_submissions_each_question_type__use_random_data=True,
+        )
+        subs_helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        lines = list(subs_helper.iter_csv_content_for_all_submissions())
+
+        assert len(lines) == 3
+        assert lines[0].startswith("Submission reference,")
+        assert "".join(lines) == subs_helper.generate_csv_content_for_all_submissions()
+        assert [row["Submission reference"] for row in csv.DictReader(StringIO("".join(lines)))] == sorted(
+            helper.reference for helper in subs_helper.submission_helpers.values()
+        )
+
     @pytest.mark.freeze_time("2025-03-01 13:30:00")
     def test_generate_csv_content_check_correct_rows_for_multiple_simple_submissions_every_question_type(
         self, factories
@@ -3603,6 +3623,154 @@ class TestSubmissionsHelper:
         assert rows[1]["[Test form] [Test group] Test question (2)"] == "NOT_ASKED"
         assert rows[1]["[Test form] [Test group] Test question (3)"] == "NOT_ASKED"
 
+    def test_streamed_exports_match_eager_exports(self, factories):
+        group = factories.group.create(add_another=True, name="Test group", form__title="Test form")
+        question = factories.question.create(form=group.form, parent=group, name="Test question")
+        for reference, num_answers in [("TEST-002", 1), ("TEST-001", 3), ("TEST-003", 0)]:
+            factories.submission.create(
+                collection=group.form.collection,
+                mode=SubmissionModeEnum.TEST,
+                reference=reference,
+                answers=[
+                    FactoryAnswer(question, TextSingleLineAnswer(f"answer {i}"), add_another_index=i)
+                    for i in range(num_answers)
+                ],
+            )
+
+        eager_helper = AllSubmissionsHelper(collection=group.form.collection, submission_mode=SubmissionModeEnum.TEST)
+        streamed_helper = AllSubmissionsHelper(
+            collection=group.form.collection, submission_mode=SubmissionModeEnum.TEST, stream_submissions=True
+        )
+
+        assert streamed_helper.submission_helpers == {}
+        assert (
+            streamed_helper.generate_csv_content_for_all_submissions()
+            == eager_helper.generate_csv_content_for_all_submissions()
+        )
+        assert (
+            streamed_helper.generate_json_content_for_all_submissions()
+            == eager_helper.generate_json_content_for_all_submissions()
+        )
+
+    def test_exports_built_in_separate_processes_match_exports_built_in_process(self, app, factories, monkeypatch):
+        # The export processes can't see this test's uncommitted data, so stand in for them with a single thread that
+        # shares its connection.
+        monkeypatch.setattr(collections_helpers, "_submission_export_process_collection", None)
+        monkeypatch.setattr(
+            collections_helpers,
+            "create_submission_export_process_pool",
+            lambda max_workers, *, collection_id, snapshot_id: ThreadPoolExecutor(
+                1,
+                initializer=collections_helpers._start_submission_export_process,
+                initargs=(app, collection_id, snapshot_id),
+            ),
+        )
+        monkeypatch.setattr(collections_helpers, "SUBMISSION_EXPORT_PARTITION_SIZE", 2)
+
+        group = factories.group.create(add_another=True, name="Test group", form__title="Test form")
+        question = factories.question.create(form=group.form, parent=group, name="Test question")
+        for reference, num_answers in [
+            ("TEST-002", 1),
+            ("TEST-001", 3),
+            ("TEST-005", 0),
+            ("TEST-004", 2),
+            ("TEST-003", 1),
+        ]:
+            factories.submission.create(
+                collection=group.form.collection,
+                mode=SubmissionModeEnum.TEST,
+                reference=reference,
+                answers=[
+                    FactoryAnswer(question, TextSingleLineAnswer(f"answer {i}"), add_another_index=i)
+                    for i in range(num_answers)
+                ],
+            )
+
+        def _helper(export_processes: int) -> AllSubmissionsHelper:
+            return AllSubmissionsHelper(
+                collection=group.form.collection,
+                submission_mode=SubmissionModeEnum.TEST,
+                stream_submissions=True,
+                export_processes=export_processes,
+            )
+
+        in_processes_helper = _helper(1)
+        assert in_processes_helper.generate_csv_content_for_all_submissions() == (
+            _helper(0).generate_csv_content_for_all_submissions()
+        )
+        assert in_processes_helper.submissions_processed == 5
+        assert in_processes_helper.generate_json_content_for_all_submissions() == (
+            _helper(0).generate_json_content_for_all_submissions()
+        )
+
+    def test_exporting_in_separate_processes_needs_streamed_submissions(self, factories):
+        collection = factories.collection.create()
+
+        with pytest.raises(ValueError):
+            AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST, export_processes=2)
+
+    def test_streamed_csv_export_with_no_submissions_has_one_set_of_add_another_columns(self, factories):
+        group = factories.group.create(add_another=True, name="Test group", form__title="Test form")
+        factories.question.create(form=group.form, parent=group, name="Test question")
+
+        subs_helper = AllSubmissionsHelper(
+            collection=group.form.collection, submission_mode=SubmissionModeEnum.TEST, stream_submissions=True
+        )
+        reader = csv.DictReader(StringIO(subs_helper.generate_csv_content_for_all_submissions()))
+
+        assert "[Test form] [Test group] Test question (1)" in reader.fieldnames
+        assert "[Test form] [Test group] Test question (2)" not in reader.fieldnames
+
+    @pytest.mark.freeze_time("2025-03-01 13:30:00")
+    def test_xlsx_content_keeps_answer_types(self, factories):
+        factories.data_source_item.reset_sequence()
+        collection = factories.collection.create(
+            create_completed_submissions_each_question_type__test=1,
+            create_completed_submissions_each_question_type__use_random_data=False,
+        )
+        subs_helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        workbook = zipfile.ZipFile(BytesIO(b"".join(subs_helper.iter_xlsx_content_for_all_submissions())))
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+        namespaces = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        header_cells, row_cells = [
+            row.findall("main:c", namespaces) for row in sheet.iterfind("main:sheetData/main:row", namespaces)
+        ]
+        csv_header = next(csv.reader(StringIO(subs_helper.generate_csv_content_for_all_submissions())))
+        row = dict(zip(csv_header, row_cells, strict=True))
+
+        assert [cell.findtext("main:is/main:t", namespaces=namespaces) for cell in header_cells] == csv_header
+        assert row["Created at"].get("s") == "2"
+        assert row["Created at"].findtext("main:v", namespaces=namespaces) == "45717.5625"
+        assert row["[Export test form] Airspeed velocity"].findtext("main:v", namespaces=namespaces) == "123"
+        assert row["[Export test form] Dog price"].findtext("main:v", namespaces=namespaces) == "456.78"
+        assert row["[Export test form] Like cheese"].get("t") == "b"
+        assert row["[Export test form] Like cheese"].findtext("main:v", namespaces=namespaces) == "1"
+        assert row["[Export test form] Last cheese purchase date"].get("s") == "1"
+        assert row["[Export test form] Last cheese purchase date"].findtext("main:v", namespaces=namespaces) == "45658"
+        assert (
+            row["[Export test form] Favourite cheeses"].findtext("main:is/main:t", namespaces=namespaces)
+            == "Cheddar\nStilton"
+        )
+
+    def test_iter_json_content_yields_one_submission_at_a_time(self, factories):
+        collection = factories.collection.create(
+            create_completed_submissions_each_question_type__test=3,
+            create_completed_submissions_each_question_type__use_random_data=True,
+        )
+        subs_helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        chunks = list(subs_helper.iter_json_content_for_all_submissions())
+        ndjson_lines = list(subs_helper.iter_json_content_for_all_submissions(ndjson=True))
+
+        assert len(chunks) == 5
+        document = json.loads("".join(chunks))
+        assert len(document["submissions"]) == 3
+        assert "".join(chunks) == json.dumps(document)
+
+        assert all(line.endswith("\n") for line in ndjson_lines)
+        assert [json.loads(line) for line in ndjson_lines] == document["submissions"]
+
     def test_generate_json_content_for_all_submissions_all_question_types_appear_correctly(self, factories):
         factories.data_source_item.reset_sequence()
         collection = factories.collection.create(
@@ -0,0 +1,219 @@
+import io
+import zipfile
+
+import pytest
+
+from app.common.data.interfaces.submission_exports import create_submission_export_job
+from app.common.data.types import SubmissionExportFormatEnum, SubmissionExportJobStatusEnum, SubmissionModeEnum
+from app.common.helpers import submission_exports
+from app.common.helpers.collections import AllSubmissionsHelper
+from app.common.helpers.submission_exports import (
+    configure_submission_export_cache,
+    get_submission_export,
+    get_submission_export_cache_key,
+    process_next_submission_export_job,
+    stream_submission_export,
+)
+from app.extensions import pdf_renderer
+
+
+@pytest.fixture
+def submission_export_cache(tmp_path):
+    configure_submission_export_cache(str(tmp_path), max_size=1024 * 1024)
+    yield
+    configure_submission_export_cache(None, max_size=0)
+
+
+class TestGetSubmissionExport:
+    def test_csv_is_encoded_with_a_single_bom(self, factories):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=3)
+        helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        export = get_submission_export(helper, SubmissionExportFormatEnum.CSV)
+        content = b"".join(export.iter_encoded())
+
+        assert export.mimetype == "text/csv"
+        assert content.startswith(b"\xef\xbb\xbf")
+        assert content.count(b"\xef\xbb\xbf") == 1
+        assert content.decode("utf-8-sig") == helper.generate_csv_content_for_all_submissions()
+
+    def test_pdf_zip_has_a_pdf_for_each_submission(self, factories, mocker):
+        render_pdf = mocker.patch.object(submission_exports, "render_pdf", return_value=b"%PDF-1.7")
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=3)
+        helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        export = get_submission_export(helper, SubmissionExportFormatEnum.PDF_ZIP)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(export.iter_encoded())))
+
+        references = sorted(submission.reference for submission in collection.test_submissions)
+        assert export.mimetype == "application/zip"
+        assert all(name.startswith(reference) for name, reference in zip(archive.namelist(), references, strict=True))
+        assert all(name.endswith(".pdf") for name in archive.namelist())
+        assert {archive.read(name) for name in archive.namelist()} == {b"%PDF-1.7"}
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+        assert render_pdf.call_count == 3
+
+    def test_pdf_zip_converts_several_pdfs_at_once_with_the_renderer(self, factories, mocker):
+        mocker.patch.object(pdf_renderer, "concurrency", 2)
+        render = mocker.patch.object(
+            pdf_renderer, "render", side_effect=lambda html_content: f"%PDF {len(html_content)}".encode()
+        )
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=5)
+        helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+
+        archive = zipfile.ZipFile(
+            io.BytesIO(b"".join(get_submission_export(helper, SubmissionExportFormatEnum.PDF_ZIP).iter_encoded()))
+        )
+
+        references = sorted(submission.reference for submission in collection.test_submissions)
+        assert all(name.startswith(reference) for name, reference in zip(archive.namelist(), references, strict=True))
+        assert render.call_count == 5
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+
+class TestProcessNextSubmissionExportJob:
+    def test_returns_false_when_no_jobs(self, db_session):
+        assert process_next_submission_export_job() is False
+
+    def test_exports_submissions_to_s3(self, db_session, factories, mocker):
+        uploaded = {}
+
+        def _upload_fileobj(fileobj, key, *, content_type):
+            uploaded.update(content=fileobj.read(), key=key, content_type=content_type)
+
+        mocker.patch("app.services.s3.S3Service.upload_fileobj", side_effect=_upload_fileobj)
+        user = factories.user.create()
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=3)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.NDJSON,
+            requested_by=user,
+        )
+
+        assert process_next_submission_export_job() is True
+
+        assert job.status == SubmissionExportJobStatusEnum.COMPLETED
+        assert job.total_submissions == 3
+        assert job.submissions_exported == 3
+        assert (
+            job.s3_key == f"{collection.s3_key_prefix(submission_mode=SubmissionModeEnum.TEST)}/exports/{job.id}.ndjson"
+        )
+        assert uploaded["key"] == job.s3_key
+        assert uploaded["content_type"] == "application/x-ndjson"
+
+        helper = AllSubmissionsHelper(collection=collection, submission_mode=SubmissionModeEnum.TEST)
+        assert uploaded["content"].decode() == "".join(helper.iter_json_content_for_all_submissions(ndjson=True))
+
+    def test_marks_job_as_failed_if_export_raises(self, db_session, factories, mocker):
+        mocker.patch("app.services.s3.S3Service.upload_fileobj", side_effect=RuntimeError("S3 is down"))
+        user = factories.user.create()
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=1)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=user,
+        )
+
+        assert process_next_submission_export_job() is True
+
+        assert job.status == SubmissionExportJobStatusEnum.FAILED
+        assert job.s3_key is None
+
+    def test_gives_up_on_job_that_has_used_all_its_attempts(self, app, db_session, factories, mocker):
+        run = mocker.patch.object(submission_exports, "run_submission_export_job")
+        user = factories.user.create()
+        collection = factories.collection.create()
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=user,
+        )
+        job.attempts = app.config["SUBMISSION_EXPORT_JOB_MAX_ATTEMPTS"]
+        db_session.flush()
+
+        assert process_next_submission_export_job() is True
+
+        assert job.status == SubmissionExportJobStatusEnum.FAILED
+        assert run.call_count == 0
+
+    def test_reports_progress_on_a_timer(self, app, db_session, factories, mocker):
+        mocker.patch("app.services.s3.S3Service.upload_fileobj")
+        update_progress = mocker.patch.object(submission_exports, "update_submission_export_job_progress")
+        mocker.patch.dict(app.config, {"SUBMISSION_EXPORT_JOB_HEARTBEAT_SECONDS": 0})
+        user = factories.user.create()
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=3)
+        create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.NDJSON,
+            requested_by=user,
+        )
+
+        assert process_next_submission_export_job() is True
+
+        assert update_progress.call_count >= 3
+
+
+class TestStreamSubmissionExport:
+    def test_second_export_is_served_from_cache(self, db_session, factories, mocker, submission_export_cache):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=2)
+        spy = mocker.spy(submission_exports, "get_submission_export")
+
+        first = b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+        second = b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+
+        assert first == second
+        assert spy.call_count == 1
+
+    def test_export_is_regenerated_when_submissions_change(
+        self, db_session, factories, mocker, submission_export_cache
+    ):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=1)
+        spy = mocker.spy(submission_exports, "get_submission_export")
+
+        first = b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+        second = b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+
+        assert first != second
+        assert spy.call_count == 2
+
+    def test_cache_key_depends_on_format_and_schema(self, db_session, factories):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=1)
+        csv_key = get_submission_export_cache_key(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV)
+        json_key = get_submission_export_cache_key(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.JSON)
+
+        factories.question.create(form=collection.forms[0])
+
+        assert len({csv_key, json_key}) == 2
+        assert get_submission_export_cache_key(
+            collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV
+        ) not in {csv_key, json_key}
+
+    def test_cache_key_depends_on_exported_collection_details(self, db_session, factories):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=1)
+        keys = [get_submission_export_cache_key(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.XLSX)]
+
+        collection.name = "Renamed collection"
+        keys.append(
+            get_submission_export_cache_key(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.XLSX)
+        )
+
+        collection.requires_certification = not collection.requires_certification
+        keys.append(
+            get_submission_export_cache_key(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.XLSX)
+        )
+
+        assert len(set(keys)) == len(keys)
+
+    def test_not_cached_when_disabled(self, db_session, factories, mocker):
+        collection = factories.collection.create(create_completed_submissions_each_question_type__test=1)
+        spy = mocker.spy(submission_exports, "get_submission_export")
+
+        b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+        b"".join(stream_submission_export(collection, SubmissionModeEnum.TEST, SubmissionExportFormatEnum.CSV))
+
+        assert spy.call_count == 2
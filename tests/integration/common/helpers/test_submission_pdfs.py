@@ -0,0 +1,157 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.common.data.models import SubmissionPdfJob
+from app.common.helpers import submission_pdfs
+from app.common.helpers.collections import SubmissionHelper
+from app.common.helpers.submission_pdfs import (
+    SubmissionPdfAudience,
+    get_submission_pdf,
+    get_submission_pdf_s3_key,
+    process_next_submission_pdf_job,
+)
+
+
+@pytest.fixture
+def submission_pdf_cache(app, monkeypatch, mocker):
+    monkeypatch.setitem(app.config, "SUBMISSION_PDF_CACHE_ENABLED", True)
+    cached = {}
+
+    def _upload_fileobj(fileobj, key, *, content_type):
+        cached[key] = fileobj.read()
+
+    def _delete_prefix(prefix):
+        for key in [key for key in cached if key.startswith(prefix)]:
+            del cached[key]
+
+    mocker.patch("app.services.s3.S3Service.download_file_if_exists", side_effect=cached.get)
+    mocker.patch("app.services.s3.S3Service.upload_fileobj", side_effect=_upload_fileobj)
+    mocker.patch("app.services.s3.S3Service.delete_prefix", side_effect=_delete_prefix)
+    return cached
+
+
+@pytest.fixture
+def render_pdf(mocker):
+    return mocker.patch.object(submission_pdfs, "render_pdf", return_value=b"%PDF-1.7")
+
+
+class TestGetSubmissionPdf:
+    def test_submitted_submission_pdf_is_cached(self, submission_submitted, submission_pdf_cache, render_pdf):
+        helper = SubmissionHelper(submission_submitted)
+
+        assert get_submission_pdf(helper, SubmissionPdfAudience.DELIVER) == b"%PDF-1.7"
+        assert get_submission_pdf(helper, SubmissionPdfAudience.DELIVER) == b"%PDF-1.7"
+
+        assert render_pdf.call_count == 1
+        assert list(submission_pdf_cache) == [get_submission_pdf_s3_key(helper, SubmissionPdfAudience.DELIVER)]
+        assert next(iter(submission_pdf_cache)).startswith(submission_submitted.pdfs_s3_key_prefix)
+
+    def test_each_service_has_its_own_pdf(self, submission_submitted, submission_pdf_cache, render_pdf):
+        helper = SubmissionHelper(submission_submitted)
+
+        get_submission_pdf(helper, SubmissionPdfAudience.DELIVER)
+        get_submission_pdf(helper, SubmissionPdfAudience.ACCESS)
+
+        assert render_pdf.call_count == 2
+        assert "MHCLG Deliver grant funding" in render_pdf.call_args_list[0].args[0]
+        assert "MHCLG Access grant funding" in render_pdf.call_args_list[1].args[0]
+        assert len(submission_pdf_cache) == 2
+
+    def test_submission_that_can_still_change_is_not_cached(
+        self, submission_in_progress, submission_pdf_cache, render_pdf
+    ):
+        helper = SubmissionHelper(submission_in_progress)
+
+        get_submission_pdf(helper, SubmissionPdfAudience.DELIVER)
+        get_submission_pdf(helper, SubmissionPdfAudience.DELIVER)
+
+        assert get_submission_pdf_s3_key(helper, SubmissionPdfAudience.DELIVER) is None
+        assert render_pdf.call_count == 2
+        assert submission_pdf_cache == {}
+
+    def test_reopening_deletes_cached_pdfs(
+        self,
+        submission_submitted,
+        grant_team_user,
+        submission_pdf_cache,
+        render_pdf,
+        mock_notification_service_calls,
+    ):
+        helper = SubmissionHelper(submission_submitted)
+        get_submission_pdf(helper, SubmissionPdfAudience.DELIVER)
+
+        helper.reopen_submission(user=grant_team_user, reopened_reason="Please update the answers")
+
+        assert submission_pdf_cache == {}
+        assert get_submission_pdf_s3_key(helper, SubmissionPdfAudience.DELIVER) is None
+
+
+class TestProcessNextSubmissionPdfJob:
+    def test_returns_false_when_no_jobs(self, db_session):
+        assert process_next_submission_pdf_job() is False
+
+    def test_submitting_renders_pdfs_in_the_background(
+        self,
+        submission_ready_to_submit,
+        data_provider_user,
+        submission_pdf_cache,
+        render_pdf,
+        mock_notification_service_calls,
+        db_session,
+    ):
+        submission_ready_to_submit.collection.requires_certification = False
+        helper = SubmissionHelper(submission_ready_to_submit)
+        helper.submit(user=data_provider_user)
+        db_session.commit()
+
+        assert process_next_submission_pdf_job() is True
+        assert process_next_submission_pdf_job() is False
+
+        assert render_pdf.call_count == 2
+        assert set(submission_pdf_cache) == {
+            get_submission_pdf_s3_key(helper, SubmissionPdfAudience.DELIVER),
+            get_submission_pdf_s3_key(helper, SubmissionPdfAudience.ACCESS),
+        }
+
+    def test_failed_job_is_not_retried(
+        self,
+        submission_ready_to_submit,
+        data_provider_user,
+        submission_pdf_cache,
+        render_pdf,
+        mock_notification_service_calls,
+        db_session,
+    ):
+        render_pdf.side_effect = RuntimeError("Browser crashed")
+        submission_ready_to_submit.collection.requires_certification = False
+        SubmissionHelper(submission_ready_to_submit).submit(user=data_provider_user)
+        db_session.commit()
+
+        assert process_next_submission_pdf_job() is True
+        assert process_next_submission_pdf_job() is False
+        assert submission_pdf_cache == {}
+
+    def test_job_is_deleted_before_rendering(
+        self,
+        submission_ready_to_submit,
+        data_provider_user,
+        submission_pdf_cache,
+        render_pdf,
+        mock_notification_service_calls,
+        db_session,
+    ):
+        submission_ready_to_submit.collection.requires_certification = False
+        SubmissionHelper(submission_ready_to_submit).submit(user=data_provider_user)
+        db_session.commit()
+        jobs_while_rendering = []
+
+        def _render_pdf(html_content):
+            # Rolling back would bring the job back if deleting it hadn't been committed yet.
+            db_session.rollback()
+            jobs_while_rendering.append(db_session.scalar(select(func.count()).select_from(SubmissionPdfJob)))
+            return b"%PDF-1.7"
+
+        render_pdf.side_effect = _render_pdf
+
+        assert process_next_submission_pdf_job() is True
+        assert jobs_while_rendering == [0, 0]
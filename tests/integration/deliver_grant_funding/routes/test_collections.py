@@ -1,9 +1,11 @@
 import csv
 import datetime
 import io
+import json
 import logging
 import re
 import uuid
+import zipfile
 from copy import deepcopy
 from datetime import date
 from decimal import Decimal
@@ -24,6 +26,10 @@ from app.common.data.interfaces.collections import (
     update_submission_data,
 )
 from app.common.data.interfaces.data_sets import get_data_source
+from app.common.data.interfaces.submission_exports import (
+    complete_submission_export_job,
+    create_submission_export_job,
+)
 from app.common.data.models import (
     Collection,
     DataSource,
@@ -34,6 +40,7 @@ from app.common.data.models import (
     Question,
     Submission,
     SubmissionEvent,
+    SubmissionExportJob,
 )
 from app.common.data.types import (
     CollectionType,
@@ -52,6 +59,8 @@ from app.common.data.types import (
     QuestionPresentationOptions,
     SubmissionAssessmentStatusEnum,
     SubmissionEventType,
+    SubmissionExportFormatEnum,
+    SubmissionExportJobStatusEnum,
     SubmissionModeEnum,
     SubmissionStatusEnum,
     TasklistSectionStatusEnum,
@@ -9900,12 +9909,15 @@ class TestExportCollectionSubmissions:
         )
         assert response.status_code == 200
         assert response.mimetype == "text/csv"
+        assert response.is_streamed
+        assert response.headers["Content-Disposition"] == 'attachment; filename="Test Report - test.csv"'
         # relying on testing for the internal implementation that we're generating a good CSV
-        assert response.content_length > 0
+        assert len(response.data) > 0
         assert len(response.text.splitlines()) == 2  # Header + 1 submission
 
         # Check that it begins with the UTF-8-BOM, which provides better signalling to MS Excel to open in UTF-8 mode.
         assert response.data[:3] == bytes.fromhex("efbbbf")
+        assert response.data.count(bytes.fromhex("efbbbf")) == 1
 
     def test_json_download(self, authenticated_grant_member_client, factories, db_session):
         collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
@@ -9928,9 +9940,74 @@ class TestExportCollectionSubmissions:
         assert response.status_code == 200
         assert response.mimetype == "application/json"
 
-        assert response.content_length > 0
+        assert len(response.data) > 0
         assert len(response.json["submissions"]) == 1
 
+    def test_xlsx_download(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
+        factories.submission.create(
+            collection=collection, mode=SubmissionModeEnum.TEST, created_by__email="submitter-test@recipient.org"
+        )
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.export_collection_submissions",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                export_format="xlsx",
+            )
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        assert response.is_streamed
+        assert response.headers["Content-Disposition"] == 'attachment; filename="Test Report - test.xlsx"'
+
+        workbook = zipfile.ZipFile(io.BytesIO(response.data))
+        assert workbook.testzip() is None
+        assert b"submitter-test@recipient.org" in workbook.read("xl/worksheets/sheet1.xml")
+
+    def test_pdf_zip_is_not_downloadable_directly(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
+        factories.submission.create(collection=collection, mode=SubmissionModeEnum.TEST)
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.export_collection_submissions",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                export_format="pdf.zip",
+            )
+        )
+        assert response.status_code == 400
+
+    def test_ndjson_download(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
+        factories.submission.create_batch(
+            2, collection=collection, mode=SubmissionModeEnum.TEST, created_by__email="submitter-test@recipient.org"
+        )
+        factories.submission.create(
+            collection=collection, mode=SubmissionModeEnum.LIVE, created_by__email="submitter-live@recipient.org"
+        )
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.export_collection_submissions",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                export_format="ndjson",
+            )
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed
+
+        lines = response.text.splitlines()
+        assert len(lines) == 2
+        assert all(json.loads(line)["created_by"] == "submitter-test@recipient.org" for line in lines)
+
     def test_csv_includes_submission_name_for_multiple_submissions(
         self, authenticated_grant_member_client, factories, db_session
     ):
@@ -10022,6 +10099,233 @@ class TestExportCollectionSubmissions:
         assert names == {"Alpha Project", "Beta Project"}
 
 
+class TestBackgroundSubmissionExports:
+    def test_request_export_creates_job(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
+
+        response = authenticated_grant_member_client.post(
+            url_for(
+                "deliver_grant_funding.request_submission_export",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                export_format="csv",
+            ),
+            data={"submit": "y"},
+        )
+
+        assert response.status_code == 302
+        assert response.location == url_for(
+            "deliver_grant_funding.list_submissions",
+            grant_id=authenticated_grant_member_client.grant.id,
+            collection_type=CollectionType.MONITORING_REPORT,
+            collection_id=collection.id,
+            submission_mode=SubmissionModeEnum.TEST,
+        )
+
+        job = db_session.scalars(select(SubmissionExportJob)).one()
+        assert job.collection_id == collection.id
+        assert job.submission_mode == SubmissionModeEnum.TEST
+        assert job.export_format == SubmissionExportFormatEnum.CSV
+        assert job.status == SubmissionExportJobStatusEnum.PENDING
+        assert job.requested_by == authenticated_grant_member_client.user
+
+    def test_request_export_unknown_format(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+
+        response = authenticated_grant_member_client.post(
+            url_for(
+                "deliver_grant_funding.request_submission_export",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                export_format="zip",
+            ),
+            data={"submit": "y"},
+        )
+
+        assert response.status_code == 400
+        assert db_session.scalars(select(SubmissionExportJob)).all() == []
+
+    def test_list_submissions_shows_latest_export_job(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        complete_submission_export_job(job, s3_key="some/key.csv", submissions_exported=0)
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.list_submissions",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+            )
+        )
+
+        assert response.status_code == 200
+        soup = BeautifulSoup(response.data, "html.parser")
+        assert "Your export is ready" in soup.text
+        assert soup.select_one("a[data-export-download-link]")["href"] == url_for(
+            "deliver_grant_funding.download_submission_export",
+            grant_id=authenticated_grant_member_client.grant.id,
+            collection_type=CollectionType.MONITORING_REPORT,
+            collection_id=collection.id,
+            submission_mode=SubmissionModeEnum.TEST,
+            job_id=job.id,
+        )
+
+    def test_list_submissions_shows_pdf_export_job(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.PDF_ZIP,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        complete_submission_export_job(job, s3_key="some/key.pdf.zip", submissions_exported=0)
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.list_submissions",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+            )
+        )
+
+        assert response.status_code == 200
+        soup = BeautifulSoup(response.data, "html.parser")
+        assert soup.select_one("a[data-export-download-link]").text == "Download the PDFs"
+
+    def test_job_status(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.JSON,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        db_session.commit()
+        status_url = url_for(
+            "deliver_grant_funding.get_submission_export_job_status",
+            grant_id=authenticated_grant_member_client.grant.id,
+            collection_type=CollectionType.MONITORING_REPORT,
+            collection_id=collection.id,
+            submission_mode=SubmissionModeEnum.TEST,
+            job_id=job.id,
+        )
+
+        response = authenticated_grant_member_client.get(status_url)
+        assert response.status_code == 200
+        assert response.json == {
+            "status": "Pending",
+            "submissions_exported": 0,
+            "total_submissions": None,
+            "download_url": None,
+        }
+
+        complete_submission_export_job(job, s3_key="some/key.json", submissions_exported=0)
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(status_url)
+        assert response.json["status"] == "Completed"
+        assert response.json["download_url"] == url_for(
+            "deliver_grant_funding.download_submission_export",
+            grant_id=authenticated_grant_member_client.grant.id,
+            collection_type=CollectionType.MONITORING_REPORT,
+            collection_id=collection.id,
+            submission_mode=SubmissionModeEnum.TEST,
+            job_id=job.id,
+        )
+
+    def test_job_status_404_for_other_submission_mode(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.get_submission_export_job_status",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.LIVE,
+                job_id=job.id,
+            )
+        )
+
+        assert response.status_code == 404
+
+    def test_download_404_until_completed(self, authenticated_grant_member_client, factories, db_session):
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant)
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.download_submission_export",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                job_id=job.id,
+            )
+        )
+
+        assert response.status_code == 404
+
+    def test_download_streams_file_from_s3(self, authenticated_grant_member_client, factories, db_session, mocker):
+        mock_stream_file = mocker.patch(
+            "app.services.s3.S3Service.stream_file", return_value=iter([b"\xef\xbb\xbfa,b\r\n", b"1,2\r\n"])
+        )
+        collection = factories.collection.create(grant=authenticated_grant_member_client.grant, name="Test Report")
+        job = create_submission_export_job(
+            collection,
+            submission_mode=SubmissionModeEnum.TEST,
+            export_format=SubmissionExportFormatEnum.CSV,
+            requested_by=authenticated_grant_member_client.user,
+        )
+        complete_submission_export_job(job, s3_key="some/key.csv", submissions_exported=1)
+        db_session.commit()
+
+        response = authenticated_grant_member_client.get(
+            url_for(
+                "deliver_grant_funding.download_submission_export",
+                grant_id=authenticated_grant_member_client.grant.id,
+                collection_type=CollectionType.MONITORING_REPORT,
+                collection_id=collection.id,
+                submission_mode=SubmissionModeEnum.TEST,
+                job_id=job.id,
+            )
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert response.headers["Content-Disposition"] == 'attachment; filename="Test Report - test.csv"'
+        assert response.data == b"\xef\xbb\xbfa,b\r\n1,2\r\n"
+        mock_stream_file.assert_called_once_with("some/key.csv")
+
+
 class TestViewSubmission:
     def test_404(self, authenticated_grant_member_client):
         response = authenticated_grant_member_client.get(
@@ -11395,6 +11699,10 @@ def _rows_to_csv_bytes(rows: list[dict]) -> bytes:
     return buffer.getvalue().encode("utf-8")
 
 
+def _mock_stream_data_set_file(mocker, content: bytes):
+    return mocker.patch("app.services.s3.S3Service.stream_file", side_effect=lambda *args, **kwargs: iter([content]))
+
+
 class TestUploadDataSet:
     def test_404(self, authenticated_grant_member_client):
         response = authenticated_grant_member_client.get(
@@ -11966,7 +12274,7 @@ class TestMapDataSetColumns:
                 "Area description": "A wonderful place",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "columns-0-column_type": "TEXT",
@@ -12125,7 +12433,7 @@ class TestMapDataSetColumns:
                 "Capital allocation": "£200.555",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "columns-0-column_type": "BRITISH_POUNDS",
@@ -12192,7 +12500,7 @@ class TestMapDataSetColumns:
                 "Capital allocation": "£100.00",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "columns-0-column_type": "BRITISH_POUNDS",
@@ -12281,7 +12589,7 @@ class TestDataSetConfirmData:
                     "Capital allocation": "£1000",
                 }
             ]
-            mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+            _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = client.get(
             url_for(
@@ -12350,7 +12658,7 @@ class TestDataSetConfirmData:
                 "Additional info": "Some text",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "submit": "y",
@@ -12498,7 +12806,7 @@ class TestDataSetConfirmData:
                 "Distance": "0.4km",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -12641,7 +12949,7 @@ class TestDataSetConfirmData:
                 "Distance": "0.4",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -12735,7 +13043,7 @@ class TestDataSetConfirmData:
                 "Area description": "Some more text",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -12974,7 +13282,7 @@ class TestMapDataSetNumberColumns:
                 "Additional info": "Some text",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "columns-0-prefix": "£",
@@ -13160,7 +13468,7 @@ class TestMapDataSetNumberColumns:
                 "Distance": "ABCkm",
             },
         ]
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.post(
             url_for(
@@ -13244,7 +13552,7 @@ class TestDataSetConfirmGrantRecipients:
                     "Capital allocation": "£1000",
                 }
             ]
-            mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+            _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = client.get(
             url_for(
@@ -13304,7 +13612,7 @@ class TestDataSetConfirmGrantRecipients:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -13368,7 +13676,7 @@ class TestDataSetConfirmGrantRecipients:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.post(
             url_for(
@@ -13437,7 +13745,7 @@ class TestDataSetConfirmGrantRecipients:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.post(
             url_for(
@@ -13519,7 +13827,7 @@ class TestDataSetMissingData:
                     "Capital allocation": "£1000",
                 }
             ]
-            mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+            _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = client.get(
             url_for(
@@ -13596,7 +13904,7 @@ class TestDataSetMissingData:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -13689,7 +13997,7 @@ class TestDataSetMissingData:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         response = authenticated_grant_admin_client.get(
             url_for(
@@ -13767,7 +14075,7 @@ class TestDataSetMissingData:
             },
         ]
 
-        mocker.patch("app.services.s3.S3Service.download_file", return_value=_rows_to_csv_bytes(all_rows))
+        _mock_stream_data_set_file(mocker, _rows_to_csv_bytes(all_rows))
 
         data = {
             "submit": "y",
@@ -14246,13 +14554,7 @@ class TestReplaceDataSet:
             name="Updated for full journey",
         )
 
-        def override_download_mock(*args, **kwargs):
-            return csv_file_content.encode()
-
-        mocker.patch(
-            "app.services.s3.S3Service.download_file",
-            side_effect=override_download_mock,
-        )
+        _mock_stream_data_set_file(mocker, csv_file_content.encode())
         response = authenticated_grant_admin_client.post(
             url_for(
                 "deliver_grant_funding.replace_data_set",
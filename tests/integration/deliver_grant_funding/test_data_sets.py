@@ -245,11 +245,37 @@ class TestValidateDataSet:
         result = validate_data_set(data_set, all_rows)
 
         assert result.blocking_errors
-        assert len(result.row_results) == 2
-        assert len(result.blocking_errors) == 3
+        assert result.column_results["Capital allocation"].row_numbers == [0, 1]
+        assert result.column_results["Revenue allocation"].row_numbers == [1]
 
-        assert sum(isinstance(e, BritishPoundsError) for e in result.blocking_errors) == 2
-        assert sum(isinstance(e, DataTypeError) for e in result.blocking_errors) == 1
+        # Each kind of error is only reported once per column, however many rows it's in
+        assert len(result.blocking_errors) == 2
+        assert [type(e) for e in result.column_results["Capital allocation"].errors] == [BritishPoundsError]
+        assert [type(e) for e in result.column_results["Revenue allocation"].errors] == [DataTypeError]
+
+    def test_stops_checking_a_column_after_max_errors(self, factories):
+        data_set = _make_data_set(
+            data_columns=["Capital allocation", "Revenue allocation"],
+            column_mappings=[
+                DataSetColumnMapping(column_name="Capital allocation", column_type="BRITISH_POUNDS"),
+                DataSetColumnMapping(column_name="Revenue allocation", column_type="INTEGER"),
+            ],
+        )
+
+        all_rows = [
+            {
+                DATA_SET_EXTERNAL_ID_COLUMN_HEADER: f"E0600{i:04}",
+                DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: f"Recipient {i}",
+                "Capital allocation": "not-a-number",
+                "Revenue allocation": "1.5" if i == 4 else "500",
+            }
+            for i in range(5)
+        ]
+
+        result = validate_data_set(data_set, all_rows, max_errors_per_column=2)
+
+        assert result.column_results["Capital allocation"].row_numbers == [0, 1]
+        assert result.column_results["Revenue allocation"].row_numbers == [4]
 
 
 class TestBuildDisplayRowsWithMissingTags:
@@ -276,6 +276,7 @@ class TestUploadDataSetForm:
         form.process(data)
 
         assert form.validate() is True
+        assert form.encoding == "utf-8-sig"
 
     def test_new_data_valid_with_missing_values(
         self,
@@ -733,13 +734,13 @@ class TestUploadDataSetForm:
             )
             form._validate_data_for_existing_submissions(
                 existing_datasource=data_source,
-                rows=[
-                    {
+                locked_org_rows={
+                    "E000123": {
                         DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E000123",
                         DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                         "Allocation": "123",
                     }
-                ],
+                },
             )
 
         def test_valid_submitted_unchanged(self, factories):
@@ -760,13 +761,13 @@ class TestUploadDataSetForm:
             )
             form._validate_data_for_existing_submissions(
                 existing_datasource=data_source,
-                rows=[
-                    {
+                locked_org_rows={
+                    gr1.organisation.external_id: {
                         DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
                         DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                         "Allocation": "100",
                     }
-                ],
+                },
             )
 
         def test_valid_with_prefix(self, factories):
@@ -787,13 +788,13 @@ class TestUploadDataSetForm:
             )
             form._validate_data_for_existing_submissions(
                 existing_datasource=data_source,
-                rows=[
-                    {
+                locked_org_rows={
+                    gr1.organisation.external_id: {
                         DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
                         DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                         "Allocation": "£100",  # same value, but with the optional prefix
                     }
-                ],
+                },
             )
 
         def test_valid_with_formatting_mismatch(self, factories):
@@ -814,13 +815,13 @@ class TestUploadDataSetForm:
             )
             form._validate_data_for_existing_submissions(
                 existing_datasource=data_source,
-                rows=[
-                    {
+                locked_org_rows={
+                    gr1.organisation.external_id: {
                         DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
                         DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                         "Allocation": "£1,0000000,0     ",  # same value, but with odd formatting
                     }
-                ],
+                },
             )
 
         def test_invalid_missing_row_for_submitted_org(self, factories):
@@ -842,13 +843,13 @@ class TestUploadDataSetForm:
             with pytest.raises(ValidationError) as e:
                 form._validate_data_for_existing_submissions(
                     existing_datasource=data_source,
-                    rows=[
-                        {
+                    locked_org_rows={
+                        "E000999": {
                             DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E000999",
                             DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test999",
                             "Allocation": "123",
                         }
-                    ],
+                    },
                 )
             assert str(e.value) == f"The file does not contain a row for grant recipient {gr.organisation.name}"
 
@@ -871,13 +872,13 @@ class TestUploadDataSetForm:
             with pytest.raises(StopValidation) as e:
                 form._validate_data_for_existing_submissions(
                     existing_datasource=data_source,
-                    rows=[
-                        {
+                    locked_org_rows={
+                        "E000123": {
                             DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E000123",
                             DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                             "Allocation": "123",
                         }
-                    ],
+                    },
                 )
             assert str(e.value) == "There is a problem"
             assert form.changed_column_errors["Allocation"][0] == gr.organisation.name
@@ -901,13 +902,13 @@ class TestUploadDataSetForm:
             with pytest.raises(StopValidation) as e:
                 form._validate_data_for_existing_submissions(
                     existing_datasource=data_source,
-                    rows=[
-                        {
+                    locked_org_rows={
+                        "E000123": {
                             DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E000123",
                             DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                             "Allocation": "",
                         }
-                    ],
+                    },
                 )
             assert str(e.value) == "There is a problem"
             assert form.changed_column_errors["Allocation"][0] == gr.organisation.name
@@ -931,13 +932,13 @@ class TestUploadDataSetForm:
             with pytest.raises(StopValidation) as e:
                 form._validate_data_for_existing_submissions(
                     existing_datasource=data_source,
-                    rows=[
-                        {
+                    locked_org_rows={
+                        "E000123": {
                             DATA_SET_EXTERNAL_ID_COLUMN_HEADER: "E000123",
                             DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: "test",
                             "New column": "123",
                         }
-                    ],
+                    },
                 )
             assert str(e.value) == "There is a problem"
             assert form.removed_column_errors["Allocation"][0] == gr.organisation.name
@@ -962,18 +963,7 @@ class TestUploadDataSetForm:
             )
 
             form._validate_no_dropped_organisation_items(
-                rows=[
-                    {
-                        DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
-                        DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr1.organisation.name,
-                        "Allocation": "999",
-                    },
-                    {
-                        DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr2.organisation.external_id,
-                        DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr2.organisation.name,
-                        "Allocation": "888",
-                    },
-                ],
+                new_external_ids={gr1.organisation.external_id, gr2.organisation.external_id},
             )
 
         def test_valid_when_no_existing_organisation_items(self, factories):
@@ -987,7 +977,7 @@ class TestUploadDataSetForm:
                 existing_data_source_names=[], existing_datasource=data_source, collection=collection
             )
 
-            form._validate_no_dropped_organisation_items(rows=[])
+            form._validate_no_dropped_organisation_items(new_external_ids=set())
 
         def test_valid_when_missing_organisation_was_removed_from_grant(self, factories):
             collection = factories.collection.create(status=CollectionStatusEnum.OPEN)
@@ -1012,13 +1002,7 @@ class TestUploadDataSetForm:
             )
 
             form._validate_no_dropped_organisation_items(
-                rows=[
-                    {
-                        DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
-                        DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr1.organisation.name,
-                        "Allocation": "999",
-                    },
-                ],
+                new_external_ids={gr1.organisation.external_id},
             )
 
         def test_valid_when_missing_organisation_has_no_data_in_this_data_set(self, factories):
@@ -1041,13 +1025,7 @@ class TestUploadDataSetForm:
             )
 
             form._validate_no_dropped_organisation_items(
-                rows=[
-                    {
-                        DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr1.organisation.external_id,
-                        DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr1.organisation.name,
-                        "Allocation": "999",
-                    },
-                ],
+                new_external_ids={gr1.organisation.external_id},
             )
 
         def test_not_enforced_when_collection_is_draft(self, factories):
@@ -1069,13 +1047,7 @@ class TestUploadDataSetForm:
             )
 
             form._validate_no_dropped_organisation_items(
-                rows=[
-                    {
-                        DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr2.organisation.external_id,
-                        DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr2.organisation.name,
-                        "Allocation": "888",
-                    },
-                ],
+                new_external_ids={gr2.organisation.external_id},
             )
 
         def test_raises_for_single_missing_organisation(self, factories):
@@ -1098,13 +1070,7 @@ class TestUploadDataSetForm:
 
             with pytest.raises(ValidationError) as e:
                 form._validate_no_dropped_organisation_items(
-                    rows=[
-                        {
-                            DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr2.organisation.external_id,
-                            DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr2.organisation.name,
-                            "Allocation": "888",
-                        },
-                    ],
+                    new_external_ids={gr2.organisation.external_id},
                 )
             assert str(e.value) == (
                 f"Missing grant recipient ‘{gr1.organisation.name}’ in the selected file. Make sure the data set "
@@ -1132,13 +1098,7 @@ class TestUploadDataSetForm:
 
             with pytest.raises(ValidationError) as e:
                 form._validate_no_dropped_organisation_items(
-                    rows=[
-                        {
-                            DATA_SET_EXTERNAL_ID_COLUMN_HEADER: gr3.organisation.external_id,
-                            DATA_SET_GRANT_RECIPIENT_COLUMN_HEADER: gr3.organisation.name,
-                            "Allocation": "999",
-                        },
-                    ],
+                    new_external_ids={gr3.organisation.external_id},
                 )
             assert str(e.value) == (
                 f"Missing grant recipients ‘{gr2.organisation.name}’ and ‘{gr1.organisation.name}’ in the selected file"
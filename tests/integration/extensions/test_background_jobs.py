@@ -0,0 +1,97 @@
+import pytest
+from flask import Flask, current_app
+from flask_sqlalchemy_lite import SQLAlchemy
+
+from app.extensions.background_jobs import BackgroundJobsExtension
+
+
+@pytest.fixture(scope="session")
+def app(setup_db_container):
+    app = Flask(__name__)
+    app.testing = True
+
+    postgres_uri = setup_db_container.get_connection_url().replace("+psycopg2", "+psycopg")
+    app.config["SQLALCHEMY_ENGINES"] = {"default": postgres_uri}
+    app.config["BACKGROUND_JOBS_ENABLED"] = False
+    app.config["BACKGROUND_JOBS_POLL_INTERVAL_SECONDS"] = 1
+
+    SQLAlchemy(app)
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def db(app):
+    yield app.extensions["sqlalchemy"]
+
+    with app.app_context():
+        for engine in app.extensions["sqlalchemy"].engines.values():
+            engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(app, db):
+    # The extension manages its own app contexts and transactions, so these tests can't use the usual rolled-back
+    # `db_session` isolation.
+    with app.app_context():
+        yield db.session
+
+
+@pytest.fixture(scope="function")
+def background_jobs(app, db):
+    extension = BackgroundJobsExtension(db=db)
+    extension.init_app(app)
+    return extension
+
+
+class TestBackgroundJobsExtension:
+    def test_init_app_does_not_start_polling_when_disabled(self, app, background_jobs):
+        assert background_jobs.poll_interval == 1
+        assert background_jobs.ensure_running not in app.before_request_funcs.get(None, [])
+
+    def test_run_background_jobs_command_polls_for_jobs(self, app, background_jobs, monkeypatch):
+        calls = []
+        monkeypatch.setattr(background_jobs, "run_forever", lambda: calls.append("run_forever"))
+
+        result = app.test_cli_runner().invoke(args=["run-background-jobs"])
+
+        assert result.exit_code == 0
+        assert calls == ["run_forever"]
+
+    def test_run_pending_returns_whether_any_handler_found_a_job(self, background_jobs):
+        background_jobs.register(lambda: False)
+        assert background_jobs.run_pending() is False
+
+        background_jobs.register(lambda: True)
+        assert background_jobs.run_pending() is True
+
+    def test_run_pending_runs_each_handler_in_an_app_context(self, app, background_jobs):
+        seen_apps = []
+
+        def handler():
+            seen_apps.append(current_app._get_current_object())
+            return True
+
+        background_jobs.register(handler)
+        background_jobs.register(handler)
+        background_jobs.run_pending()
+
+        assert seen_apps == [app]
+
+    def test_run_pending_carries_on_after_a_handler_fails(self, background_jobs, caplog):
+        calls = []
+
+        def failing_handler():
+            calls.append("failing")
+            raise RuntimeError("Something went wrong")
+
+        def working_handler():
+            calls.append("working")
+            return True
+
+        background_jobs.register(failing_handler)
+        background_jobs.register(working_handler)
+
+        assert background_jobs.run_pending() is True
+        assert calls == ["failing", "working"]
+        assert "Background job handler" in caplog.text
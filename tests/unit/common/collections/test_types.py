@@ -57,6 +57,9 @@ class TestSubmissionAnswerRootModels:
     def test_get_value_for_text_export(self, model, data, expected_text_export):
         assert model(data).get_value_for_text_export() == expected_text_export
 
+    def test_get_value_for_spreadsheet_export(self, model, data, expected_text_export):
+        assert model(data).get_value_for_spreadsheet_export() == data
+
 
 class TestSubmissionAnswerBaseModels:
     @pytest.mark.parametrize(
@@ -178,3 +181,22 @@ class TestSubmissionAnswerBaseModels:
     )
     def test_get_value_for_json_export(self, model, data, json_export_value):
         assert model(**data).get_value_for_json_export() == json_export_value
+
+    @pytest.mark.parametrize(
+        "model, data, spreadsheet_export_value",
+        (
+            (IntegerAnswer, {"value": 50}, 50),
+            (IntegerAnswer, {"value": 1_000_000, "prefix": "£"}, 1_000_000),
+            (DecimalAnswer, {"value": Decimal("1002350.12"), "suffix": "kgs"}, Decimal("1002350.12")),
+            (SingleChoiceFromListAnswer, {"key": "key", "label": "label"}, "label"),
+            (
+                DateAnswer,
+                {"answer": datetime.date(2023, 10, 5), "approximate_date": False},
+                datetime.date(2023, 10, 5),
+            ),
+            (DateAnswer, {"answer": datetime.date(2023, 10, 1), "approximate_date": True}, "October 2023"),
+            (FileUploadAnswer, {"filename": "report.pdf", "size": 0, "mime_type": "application/pdf"}, "report.pdf"),
+        ),
+    )
+    def test_get_value_for_spreadsheet_export(self, model, data, spreadsheet_export_value):
+        assert model(**data).get_value_for_spreadsheet_export() == spreadsheet_export_value
@@ -1,10 +1,16 @@
+import uuid
 from unittest import mock
 
 import pytest
 
 from app import QuestionDataType
-from app.common.collections.types import TextSingleLineAnswer
-from app.common.data.submission_data_manager import SubmissionDataAddAnotherIndexInvalid, SubmissionDataManager
+from app.common.collections.types import IntegerAnswer, TextSingleLineAnswer, YesNoAnswer
+from app.common.data.submission_data_manager import (
+    SubmissionDataAddAnotherIndexInvalid,
+    SubmissionDataManager,
+    deserialise_all,
+)
+from app.common.helpers.collection_plan import CollectionPlan
 from tests.conftest import _Factories
 
 
@@ -217,3 +223,131 @@ class TestSubmissionDataManager:
                 ValueError, match="Cannot remove answers at index 0 as there are only 0 existing answers"
             ):
                 data.remove_add_another_entry(group, add_another_index=0)
+
+    class TestCopyOnWrite:
+        def test_does_not_modify_original_data(self, factories: _Factories):
+            group = factories.group.build(add_another=True)
+            add_another_question = factories.question.build(form=group.form, parent=group)
+            question = factories.question.build(form=group.form, data_type=QuestionDataType.FILE_UPLOAD)
+            other_question = factories.question.build(form=group.form)
+            original = {
+                str(question.id): "file",
+                str(other_question.id): "other",
+                str(group.id): [{str(add_another_question.id): "a"}, {str(add_another_question.id): "b"}],
+            }
+            data = SubmissionDataManager(original)
+
+            data.set(add_another_question, TextSingleLineAnswer("changed"), add_another_index=0)
+            data.set(add_another_question, TextSingleLineAnswer("new"), add_another_index=2)
+            data.remove_add_another_entry(group, add_another_index=1)
+            data.remove(question)
+
+            assert original == {
+                str(question.id): "file",
+                str(other_question.id): "other",
+                str(group.id): [{str(add_another_question.id): "a"}, {str(add_another_question.id): "b"}],
+            }
+            assert data.data == {
+                str(other_question.id): "other",
+                str(group.id): [{str(add_another_question.id): "changed"}, {str(add_another_question.id): "new"}],
+            }
+
+        def test_data_is_a_new_copy(self, factories: _Factories):
+            group = factories.group.build(add_another=True)
+            question = factories.question.build(form=group.form, parent=group)
+            data = SubmissionDataManager({str(group.id): [{str(question.id): "a"}]})
+
+            data.data[str(group.id)][0][str(question.id)] = "modified"
+
+            assert data.get(question, add_another_index=0) == TextSingleLineAnswer("a")
+
+        def test_has_changes(self, factories: _Factories):
+            question = factories.question.build()
+            data = SubmissionDataManager({str(question.id): "a"})
+
+            assert data.get(question) == TextSingleLineAnswer("a")
+            assert data.has_changes is False
+
+            data.set(question, TextSingleLineAnswer("b"))
+
+            assert data.has_changes is True
+
+        def test_get_changes(self, factories: _Factories):
+            question = factories.question.build()
+            file_question = factories.question.build(data_type=QuestionDataType.FILE_UPLOAD)
+            data = SubmissionDataManager({str(question.id): "a", str(file_question.id): {"filename": "a.txt"}})
+
+            data.set(question, TextSingleLineAnswer("b"))
+            data.remove(file_question)
+
+            assert data.get_changes() == ({(str(question.id),): "b"}, {(str(file_question.id),)})
+
+        def test_get_changes_for_add_another_entries(self, factories: _Factories):
+            group = factories.group.build(add_another=True)
+            question = factories.question.build(form=group.form, parent=group)
+            file_question = factories.question.build(
+                form=group.form, parent=group, data_type=QuestionDataType.FILE_UPLOAD
+            )
+            data = SubmissionDataManager(
+                {str(group.id): [{str(question.id): "a", str(file_question.id): {"filename": "a.txt"}}, {}]}
+            )
+
+            data.set(question, TextSingleLineAnswer("b"), add_another_index=0)
+            data.remove(file_question, add_another_index=0)
+            data.set(question, TextSingleLineAnswer("c"), add_another_index=1)
+
+            assert data.get_changes() == (
+                {(str(group.id), "0", str(question.id)): "b", (str(group.id), "1", str(question.id)): "c"},
+                {(str(group.id), "0", str(file_question.id))},
+            )
+
+        def test_get_changes_for_add_another_entries_added_or_removed(self, factories: _Factories):
+            group = factories.group.build(add_another=True)
+            question = factories.question.build(form=group.form, parent=group)
+            data = SubmissionDataManager({str(group.id): [{str(question.id): "a"}, {str(question.id): "b"}]})
+
+            data.set(question, TextSingleLineAnswer("changed"), add_another_index=1)
+            data.remove_add_another_entry(group, add_another_index=0)
+
+            assert data.get_changes() == ({(str(group.id),): [{str(question.id): "changed"}]}, set())
+
+
+class TestDeserialiseAll:
+    def test_deserialises_every_answer(self, factories: _Factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form, data_type=QuestionDataType.YES_NO)
+        group = factories.group.build(form=form, add_another=True)
+        q2 = factories.question.build(form=form, parent=group)
+        q3 = factories.question.build(form=form, add_another=True, data_type=QuestionDataType.NUMBER)
+        data = {
+            str(q1.id): True,
+            str(group.id): [{str(q2.id): "entry0"}, {str(q2.id): "entry1"}],
+            str(q3.id): [{str(q3.id): {"value": 5}}],
+        }
+
+        answers = deserialise_all(CollectionPlan.build(form.collection), data)
+
+        assert answers == {
+            (q1.id, None): YesNoAnswer(True),
+            (q2.id, 0): TextSingleLineAnswer("entry0"),
+            (q2.id, 1): TextSingleLineAnswer("entry1"),
+            (q3.id, 0): IntegerAnswer(value=5),
+        }
+
+    def test_skips_answers_to_unknown_questions(self, factories: _Factories):
+        question = factories.question.build()
+
+        answers = deserialise_all(
+            CollectionPlan.build(question.form.collection), {str(question.id): "hello", str(uuid.uuid4()): "gone"}
+        )
+
+        assert answers == {(question.id, None): TextSingleLineAnswer("hello")}
+
+    def test_matches_data_manager_get_all(self, factories: _Factories):
+        question = factories.question.build()
+        data = SubmissionDataManager({str(question.id): "old"})
+        data.set(question, TextSingleLineAnswer("new"))
+
+        assert data.get_all(CollectionPlan.build(question.form.collection)) == {
+            (question.id, None): TextSingleLineAnswer("new")
+        }
@@ -7,6 +7,7 @@ from markupsafe import Markup
 
 from app.common.data.models import Expression
 from app.common.expressions import (
+    DEFAULT_STATEMENT_CACHE_SIZE,
     DisallowedExpression,
     EvaluationStatement,
     ExpressionContext,
@@ -16,8 +17,11 @@ from app.common.expressions import (
     UndefinedOperatorInExpression,
     UndefinedVariableInExpression,
     _evaluate_expression_with_context,
+    compile_statement,
+    configure_statement_cache,
     evaluate,
     get_restricted_evaluator,
+    get_statement_cache_info,
     interpolate,
 )
 
@@ -163,6 +167,15 @@ class TestInternalEvaluateExpressionWithContext:
             expression = Expression(statement=EvaluationStatement("blah"))
             _evaluate_expression_with_context(expression.statement, ExpressionContext())
 
+    def test_unknown_attribute(self):
+        with pytest.raises(UndefinedVariableInExpression) as e:
+            _evaluate_expression_with_context(
+                EvaluationStatement("d_abc.missing > 1"),
+                ExpressionContext(data_source_context={"d_abc": {"allocation": Decimal("100.50")}}),
+            )
+
+        assert e.value.variable_name == "missing"
+
 
 class TestEvaluate:
     def test_additional_context(self):
@@ -288,6 +301,57 @@ class TestEvaluate:
         assert result is True
 
 
+class TestCompiledStatementCache:
+    @pytest.fixture(autouse=True)
+    def _empty_cache(self):
+        configure_statement_cache(maxsize=2)
+        yield
+        configure_statement_cache(maxsize=DEFAULT_STATEMENT_CACHE_SIZE)
+
+    def test_repeated_evaluations_reuse_compiled_statement(self):
+        assert compile_statement("answer == 1") is compile_statement(EvaluationStatement("answer == 1"))
+
+        cache_info = get_statement_cache_info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 1
+
+    def test_keyed_on_required_functions(self):
+        with_decimal = compile_statement("value >= Decimal('0.001')", {"Decimal": Decimal})
+        without_decimal = compile_statement("value >= Decimal('0.001')")
+
+        assert with_decimal is not without_decimal
+        assert with_decimal.evaluate(ExpressionContext({"value": Decimal("0.002")})) is True
+        with pytest.raises(UndefinedFunctionInExpression):
+            without_decimal.evaluate(ExpressionContext({"value": Decimal("0.002")}))
+
+    def test_names_are_bound_per_evaluation(self):
+        compiled = compile_statement("answer == 1")
+
+        assert compiled.evaluate(ExpressionContext({"answer": 1})) is True
+        assert compiled.evaluate(ExpressionContext({"answer": 2})) is False
+        with pytest.raises(UndefinedVariableInExpression):
+            compiled.evaluate(ExpressionContext())
+
+    def test_evaluates_while_shared_evaluator_is_in_use(self):
+        compiled = compile_statement("answer == 1")
+
+        with compiled._lock:
+            assert compiled.evaluate(ExpressionContext({"answer": 1})) is True
+
+    def test_cache_is_bounded(self):
+        compile_statement("1 == 1")
+        compile_statement("2 == 2")
+        compile_statement("3 == 3")
+
+        assert get_statement_cache_info().currsize == 2
+
+    def test_disallowed_nodes_are_rejected_before_evaluation(self):
+        with pytest.raises(DisallowedExpression):
+            compile_statement("answer > (1 if True else 2)")
+
+        assert get_statement_cache_info().currsize == 0
+
+
 class TestInterpolate:
     def test_no_interpolation_patterns(self):
         assert (
@@ -360,6 +424,33 @@ class TestInterpolate:
             == "Error: ((undefined_variable))"
         )
 
+    def test_interpolation_with_data_source_column_reference(self):
+        assert (
+            interpolate(
+                InterpolationStatement("Allocation: ((d_abc.allocation))"),
+                ExpressionContext(data_source_context={"d_abc": {"allocation": Decimal("100.50")}}),
+            )
+            == "Allocation: 100.50"
+        )
+
+    def test_interpolation_ignores_undefined_data_source_column(self):
+        assert (
+            interpolate(
+                InterpolationStatement("Allocation: ((d_abc.missing))"),
+                ExpressionContext(data_source_context={"d_abc": {"allocation": Decimal("100.50")}}),
+            )
+            == "Allocation: ((d_abc.missing))"
+        )
+
+    def test_interpolation_of_reference_to_object_attribute(self):
+        assert (
+            interpolate(
+                InterpolationStatement("Value: ((variable.value))"),
+                ExpressionContext({"variable": Mock(value="potato")}),
+            )
+            == "Value: potato"
+        )
+
     def test_multiple_patterns_with_mixed_types(self):
         assert (
             interpolate(
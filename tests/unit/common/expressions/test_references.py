@@ -6,11 +6,16 @@ from pydantic import BaseModel
 
 from app.common.data.types import DataSourceType
 from app.common.expressions.references import (
+    DEFAULT_INTERPOLATION_TEMPLATE_CACHE_SIZE,
     DataSourceReference,
     EvaluationStatement,
     ExpressionReference,
     ExpressionStatement,
+    InterpolationSlot,
     InterpolationStatement,
+    configure_interpolation_template_cache,
+    get_interpolation_template,
+    get_interpolation_template_cache_info,
 )
 
 
@@ -238,3 +243,53 @@ class TestInterpolationStatementReferences:
 
         assert statement.count_references(ExpressionReference("q_123")) == 2
         assert statement.count_references(ExpressionReference("q_234")) == 1
+
+
+class TestInterpolationTemplate:
+    def test_plain_text_is_a_single_literal_segment(self):
+        assert InterpolationStatement("hello world").template.segments == ("hello world",)
+
+    def test_empty_text_has_no_segments(self):
+        assert InterpolationStatement("").template.segments == ()
+
+    def test_splits_literals_and_slots_in_order(self):
+        template = InterpolationStatement("Hi ((q_123)), you have (( d_123.c_col )) left").template
+
+        assert template.segments == (
+            "Hi ",
+            InterpolationSlot(text="((q_123))", path=("q_123",)),
+            ", you have ",
+            InterpolationSlot(text="(( d_123.c_col ))", path=("d_123", "c_col")),
+            " left",
+        )
+
+    def test_adjacent_slots(self):
+        assert InterpolationStatement("((q_123))((q_234))").template.slots == [
+            InterpolationSlot(text="((q_123))", path=("q_123",)),
+            InterpolationSlot(text="((q_234))", path=("q_234",)),
+        ]
+
+    @pytest.mark.parametrize(
+        "text",
+        ["((42))", "((True))", "((x + y))", "((values[0]))", "((d_123._private))", "((d_123.format))", "(('hi'))"],
+    )
+    def test_anything_other_than_a_plain_reference_has_no_path(self, text):
+        (slot,) = InterpolationStatement(text).template.slots
+        assert slot.text == text
+        assert slot.path is None
+
+    def test_render_substitutes_each_slot(self):
+        template = InterpolationStatement("((q_123)) and ((q_234))").template
+
+        assert template.render(lambda slot: slot.path[0].upper()) == "Q_123 and Q_234"
+
+    def test_template_is_parsed_once_per_distinct_text(self):
+        configure_interpolation_template_cache(maxsize=8)
+        try:
+            assert InterpolationStatement("Hi ((q_123))").template is get_interpolation_template("Hi ((q_123))")
+
+            cache_info = get_interpolation_template_cache_info()
+            assert cache_info.hits == 1
+            assert cache_info.misses == 1
+        finally:
+            configure_interpolation_template_cache(maxsize=DEFAULT_INTERPOLATION_TEMPLATE_CACHE_SIZE)
@@ -0,0 +1,57 @@
+from app.common.data.models import ComponentReference
+from app.common.data.types import ExpressionType
+from app.common.helpers.collection_plan import CollectionPlan
+
+
+class TestCollectionPlan:
+    def test_index_maps(self, factories):
+        collection = factories.collection.build()
+        form_0 = factories.form.build(collection=collection, order=0)
+        form_1 = factories.form.build(collection=collection, order=1)
+        q0 = factories.question.build(form=form_0, order=0)
+        group = factories.group.build(form=form_1, order=0, add_another=True)
+        q1 = factories.question.build(form=form_1, parent=group, order=0)
+        q2 = factories.question.build(form=form_1, parent=group, order=1)
+
+        plan = CollectionPlan.build(collection)
+
+        assert [form.id for form in plan.forms] == [form_0.id, form_1.id]
+        assert plan.forms[1].question_ids == (q1.id, q2.id)
+        assert plan.forms[1].component_ids == (group.id, q1.id, q2.id)
+        assert plan.form_positions == {form_0.id: 0, form_1.id: 1}
+        assert plan.question_positions == {q0.id: (0, 0), q1.id: (1, 0), q2.id: (1, 1)}
+        assert plan.components[q1.id].parent_id == group.id
+        assert plan.components[q1.id].add_another_container_id == group.id
+        assert plan.components[q0.id].add_another_container_id is None
+
+    def test_conditions_and_references(self, factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form)
+        q2 = factories.question.build(form=form)
+        factories.expression.build(question=q2, type_=ExpressionType.CONDITION, statement=f"{q1.safe_qid} > 50")
+        q2.owned_component_references = [ComponentReference(component=q2, depends_on_component=q1)]
+
+        plan = CollectionPlan.build(form.collection)
+
+        assert plan.components[q2.id].condition_statements == (f"{q1.safe_qid} > 50",)
+        assert plan.components[q2.id].depends_on_component_ids == {q1.id}
+        assert plan.dependency_graph.get_affected_component_ids([q1.id]) == {q1.id, q2.id}
+
+
+class TestCollectionCachedPlan:
+    def test_reuses_plan_for_the_same_collection(self, factories):
+        question = factories.question.build()
+        collection = question.form.collection
+
+        plan = collection.cached_plan
+
+        assert collection.cached_plan is plan
+        assert plan.question_positions == {question.id: (0, 0)}
+
+    def test_rebuilds_plan_after_clearing_caches(self, factories):
+        collection = factories.collection.build()
+        plan = collection.cached_plan
+
+        collection.clear_caches()
+
+        assert collection.cached_plan is not plan
@@ -529,6 +529,66 @@ class TestSubmissionHelper:
             all_answered = helper.cached_get_all_questions_are_answered_for_form(group.form).all_answered
             assert all_answered is True
 
+    class TestClearCachesForComponents:
+        def test_only_clears_results_depending_on_changed_components(self, factories):
+            collection = factories.collection.build()
+            form_1 = factories.form.build(collection=collection, order=0)
+            form_2 = factories.form.build(collection=collection, order=1)
+            form_3 = factories.form.build(collection=collection, order=2)
+            q1 = factories.question.build(form=form_1)
+            q2 = factories.question.build(form=form_2)
+            q3 = factories.question.build(form=form_3)
+            q2.owned_component_references = [ComponentReference(component=q2, depends_on_component=q1)]
+            submission = factories.submission.build(collection=collection)
+            helper = SubmissionHelper(submission)
+
+            assert helper.cached_get_ordered_visible_questions(form_2) == []
+            assert helper.cached_get_all_questions_are_answered_for_form(form_3).all_answered is False
+
+            submission.data_manager.set(q1, TextSingleLineAnswer("answer 1"))
+            submission.data_manager.set(q3, TextSingleLineAnswer("answer 3"))
+            helper.clear_caches_for_components([q1])
+
+            assert helper.cached_get_ordered_visible_questions(form_2) == [q2]
+            assert helper.cached_get_answer_for_question(q1.id) == TextSingleLineAnswer("answer 1")
+
+            # Nothing in form 3 depends on q1, so its results are kept until its own answers are changed
+            assert helper.cached_get_all_questions_are_answered_for_form(form_3).all_answered is False
+
+            helper.clear_caches_for_components([q3])
+            assert helper.cached_get_all_questions_are_answered_for_form(form_3).all_answered is True
+
+        def test_unknown_components_clear_everything(self, factories):
+            q1 = factories.question.build()
+            submission = factories.submission.build(collection=q1.form.collection)
+            helper = SubmissionHelper(submission)
+
+            assert helper.cached_get_all_questions_are_answered_for_form(q1.form).all_answered is False
+
+            submission.data_manager.set(q1, TextSingleLineAnswer("answer 1"))
+            helper.clear_caches_for_components([factories.question.build()])
+
+            assert helper.cached_get_all_questions_are_answered_for_form(q1.form).all_answered is True
+
+    class TestPreloadAnswers:
+        def test_primes_answer_cache(self, factories, mocker):
+            form = factories.form.build()
+            q1 = factories.question.build(form=form)
+            group = factories.group.build(form=form, add_another=True)
+            q2 = factories.question.build(form=form, parent=group)
+            submission = factories.submission.build(collection=form.collection)
+            submission.data_manager.set(q1, TextSingleLineAnswer("answer 1"))
+            submission.data_manager.set(q2, TextSingleLineAnswer("answer 2"), add_another_index=0)
+            helper = SubmissionHelper(submission)
+
+            helper.preload_answers()
+
+            mock_get = mocker.patch.object(submission.data_manager, "get")
+
+            assert helper.cached_get_answer_for_question(q1.id) == TextSingleLineAnswer("answer 1")
+            assert helper.cached_get_answer_for_question(q2.id, add_another_index=0) == TextSingleLineAnswer("answer 2")
+            assert mock_get.call_count == 0
+
     class TestStatuses:
         def test_all_needed_forms_are_completed(self, db_session, factories):
             form_one = factories.form.build()
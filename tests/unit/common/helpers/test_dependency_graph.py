@@ -0,0 +1,79 @@
+import uuid
+
+from app.common.data.models import ComponentReference
+from app.common.data.types import ExpressionType
+from app.common.helpers.dependency_graph import CollectionDependencyGraph
+
+
+class TestCollectionDependencyGraph:
+    def test_follows_references_transitively(self, factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form)
+        q2 = factories.question.build(form=form)
+        q3 = factories.question.build(form=form)
+        q4 = factories.question.build(form=form)
+        q2.owned_component_references = [ComponentReference(component=q2, depends_on_component=q1)]
+        q3.owned_component_references = [ComponentReference(component=q3, depends_on_component=q2)]
+
+        graph = CollectionDependencyGraph.build(form.collection)
+
+        assert graph.get_affected_component_ids([q1.id]) == {q1.id, q2.id, q3.id}
+        assert graph.get_affected_component_ids([q3.id]) == {q3.id}
+        assert graph.get_affected_component_ids([q4.id]) == {q4.id}
+
+    def test_follows_conditions_without_references(self, factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form)
+        q2 = factories.question.build(form=form)
+        factories.expression.build(question=q2, type_=ExpressionType.CONDITION, statement=f"{q1.safe_qid} > 50")
+
+        graph = CollectionDependencyGraph.build(form.collection)
+
+        assert graph.get_affected_component_ids([q1.id]) == {q1.id, q2.id}
+
+    def test_children_depend_on_their_group(self, factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form)
+        group = factories.group.build(form=form)
+        nested_group = factories.group.build(form=form, parent=group)
+        q2 = factories.question.build(form=form, parent=nested_group)
+        group.owned_component_references = [ComponentReference(component=group, depends_on_component=q1)]
+
+        graph = CollectionDependencyGraph.build(form.collection)
+
+        assert graph.get_affected_component_ids([q1.id]) == {q1.id, group.id, nested_group.id, q2.id}
+        assert graph.get_affected_container_ids([q1.id]) == {form.id, group.id, nested_group.id}
+
+    def test_affected_containers_span_forms(self, factories):
+        collection = factories.collection.build()
+        form_1 = factories.form.build(collection=collection, order=0)
+        form_2 = factories.form.build(collection=collection, order=1)
+        form_3 = factories.form.build(collection=collection, order=2)
+        q1 = factories.question.build(form=form_1)
+        q2 = factories.question.build(form=form_2)
+        factories.question.build(form=form_3)
+        q2.owned_component_references = [ComponentReference(component=q2, depends_on_component=q1)]
+
+        graph = CollectionDependencyGraph.build(collection)
+
+        assert graph.get_affected_container_ids([q1.id]) == {form_1.id, form_2.id}
+        assert graph.get_affected_container_ids([q2.id]) == {form_2.id}
+
+    def test_handles_cycles(self, factories):
+        form = factories.form.build()
+        q1 = factories.question.build(form=form)
+        q2 = factories.question.build(form=form)
+        q1.owned_component_references = [ComponentReference(component=q1, depends_on_component=q2)]
+        q2.owned_component_references = [ComponentReference(component=q2, depends_on_component=q1)]
+
+        graph = CollectionDependencyGraph.build(form.collection)
+
+        assert graph.get_affected_component_ids([q1.id]) == {q1.id, q2.id}
+
+    def test_contains(self, factories):
+        question = factories.question.build()
+
+        graph = CollectionDependencyGraph.build(question.form.collection)
+
+        assert graph.contains([question.id]) is True
+        assert graph.contains([question.id, uuid.uuid4()]) is False
@@ -0,0 +1,89 @@
+import datetime
+import io
+import zipfile
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from app.common.helpers.spreadsheets import iter_xlsx, xlsx_row
+
+NAMESPACES = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _read_workbook(content: bytes) -> zipfile.ZipFile:
+    workbook = zipfile.ZipFile(io.BytesIO(content))
+    assert workbook.testzip() is None
+    return workbook
+
+
+def _read_cells(content: bytes) -> list[list[ElementTree.Element]]:
+    sheet = ElementTree.fromstring(_read_workbook(content).read("xl/worksheets/sheet1.xml"))
+    return [row.findall("main:c", NAMESPACES) for row in sheet.iterfind("main:sheetData/main:row", NAMESPACES)]
+
+
+class TestXlsxRow:
+    def test_cells_keep_their_types(self):
+        cells = _read_cells(
+            b"".join(
+                iter_xlsx(
+                    [
+                        xlsx_row(
+                            [
+                                "text",
+                                True,
+                                12,
+                                Decimal("1.50"),
+                                datetime.date(2025, 1, 2),
+                                datetime.datetime(2025, 1, 2, 12, 0, 0),
+                                None,
+                            ]
+                        )
+                    ]
+                )
+            )
+        )[0]
+
+        assert cells[0].get("t") == "inlineStr"
+        assert cells[0].findtext("main:is/main:t", namespaces=NAMESPACES) == "text"
+        assert cells[1].get("t") == "b"
+        assert cells[1].findtext("main:v", namespaces=NAMESPACES) == "1"
+        assert cells[2].get("t") is None
+        assert cells[2].findtext("main:v", namespaces=NAMESPACES) == "12"
+        assert cells[3].findtext("main:v", namespaces=NAMESPACES) == "1.50"
+        assert cells[4].get("s") == "1"
+        assert cells[4].findtext("main:v", namespaces=NAMESPACES) == "45659"
+        assert cells[5].get("s") == "2"
+        assert cells[5].findtext("main:v", namespaces=NAMESPACES) == "45659.5"
+        assert cells[6].find("main:v", NAMESPACES) is None
+
+    def test_text_is_escaped_and_illegal_characters_removed(self):
+        cells = _read_cells(b"".join(iter_xlsx([xlsx_row(["<b>Fish & chips</b>\x00\x1f"])])))
+
+        assert cells[0][0].findtext("main:is/main:t", namespaces=NAMESPACES) == "<b>Fish & chips</b>"
+
+
+class TestIterXlsx:
+    def test_streams_rows_as_they_are_written(self):
+        rows_written = []
+
+        def _rows():
+            for i in range(5_000):
+                rows_written.append(i)
+                yield xlsx_row([f"row {i} with some text that doesn't compress all that well {i * 7919}"])
+
+        chunks = iter_xlsx(_rows())
+        first_chunk = next(chunks)
+
+        assert len(rows_written) < 5_000
+        assert len(_read_cells(first_chunk + b"".join(chunks))) == 5_000
+
+    def test_sheet_name_is_made_valid(self):
+        workbook = _read_workbook(b"".join(iter_xlsx([], sheet_name="Q1/Q2: [monitoring] report for this year")))
+        sheet = ElementTree.fromstring(workbook.read("xl/workbook.xml")).find("main:sheets/main:sheet", NAMESPACES)
+
+        assert sheet.get("name") == "Q1 Q2   monitoring  report for "
+
+    def test_empty_sheet_name_falls_back_to_default(self):
+        workbook = _read_workbook(b"".join(iter_xlsx([], sheet_name="")))
+        sheet = ElementTree.fromstring(workbook.read("xl/workbook.xml")).find("main:sheets/main:sheet", NAMESPACES)
+
+        assert sheet.get("name") == "Sheet1"
@@ -135,3 +135,69 @@ class TestSubmissionEventHelper:
             assert events.submission_state.submitted_at_utc == datetime(2025, 11, 25, 0, 0, 0)
             assert events.submission_state.sent_for_certification_by == user
             assert events.submission_state.sent_for_certification_at_utc == datetime(2025, 11, 24, 0, 0, 0)
+
+    class TestMemoisation:
+        def test_only_reduces_new_events(self, factories, mocker):
+            user = factories.user.build()
+            submission = factories.submission.build()
+            submission.events = [
+                factories.submission_event.build(
+                    event_type=SubmissionEventType.SUBMISSION_SENT_FOR_CERTIFICATION,
+                    related_entity_id=submission.id,
+                    created_by=user,
+                    data=SubmissionEventHelper.event_from(SubmissionEventType.SUBMISSION_SENT_FOR_CERTIFICATION),
+                    created_at_utc=datetime(2025, 11, 24, 0, 0, 0),
+                ),
+            ]
+            events = SubmissionEventHelper(submission)
+            spy_reduce = mocker.spy(events, "_reduce")
+
+            assert events.submission_state.is_awaiting_sign_off is True
+            assert events.submission_state is events.submission_state
+            assert spy_reduce.call_count == 1
+
+            factories.submission_event.build(
+                submission=submission,
+                event_type=SubmissionEventType.SUBMISSION_SUBMITTED,
+                related_entity_id=submission.id,
+                created_by=user,
+                data=SubmissionEventHelper.event_from(SubmissionEventType.SUBMISSION_SUBMITTED),
+                created_at_utc=datetime(2025, 11, 25, 0, 0, 0),
+            )
+
+            assert events.submission_state.is_submitted is True
+            assert events.submission_state.sent_for_certification_by == user
+            assert spy_reduce.call_count == 2
+
+        def test_refolds_when_events_are_not_appended(self, factories):
+            user = factories.user.build()
+            submission = factories.submission.build()
+            submitted = factories.submission_event.build(
+                event_type=SubmissionEventType.SUBMISSION_SUBMITTED,
+                related_entity_id=submission.id,
+                created_by=user,
+                data=SubmissionEventHelper.event_from(SubmissionEventType.SUBMISSION_SUBMITTED),
+                created_at_utc=datetime(2025, 11, 25, 0, 0, 0),
+            )
+            submission.events = [submitted]
+            events = SubmissionEventHelper(submission)
+            assert events.submission_state.is_submitted is True
+
+            submission.events = [
+                factories.submission_event.build(
+                    event_type=SubmissionEventType.SUBMISSION_REOPENED,
+                    related_entity_id=submission.id,
+                    created_by=user,
+                    data=SubmissionEventHelper.event_from(
+                        SubmissionEventType.SUBMISSION_REOPENED, reopened_reason="reopened"
+                    ),
+                    created_at_utc=datetime(2025, 11, 26, 0, 0, 0),
+                ),
+                submitted,
+            ]
+            assert events.submission_state.is_submitted is False
+            assert events.submission_state.reopened_reason == "reopened"
+
+            submission.events = []
+            assert events.submission_state.is_submitted is False
+            assert events.submission_state.reopened_reason is None
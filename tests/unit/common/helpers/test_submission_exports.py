@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from app.common.helpers.submission_exports import SubmissionExportCache
+
+
+def _set_last_used(cache: SubmissionExportCache, key: str, timestamp: float) -> None:
+    path = os.path.join(cache.directory, f"{key}.export")
+    os.utime(path, (timestamp, timestamp))
+
+
+class TestSubmissionExportCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = SubmissionExportCache(str(tmp_path), max_size=100)
+
+        assert cache.open("key") is None
+        assert list(cache.write_through("key", iter([b"hello ", b"world"]))) == [b"hello ", b"world"]
+        assert b"".join(cache.open("key")) == b"hello world"
+
+    def test_nothing_is_cached_if_generating_fails(self, tmp_path):
+        cache = SubmissionExportCache(str(tmp_path), max_size=100)
+
+        def _chunks():
+            yield b"hello"
+            raise RuntimeError("Something went wrong")
+
+        with pytest.raises(RuntimeError):
+            list(cache.write_through("key", _chunks()))
+
+        assert cache.open("key") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_nothing_is_cached_if_the_download_is_abandoned(self, tmp_path):
+        cache = SubmissionExportCache(str(tmp_path), max_size=100)
+
+        chunks = cache.write_through("key", iter([b"hello ", b"world"]))
+        next(chunks)
+        chunks.close()
+
+        assert cache.open("key") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_exports_bigger_than_the_cache_are_not_cached(self, tmp_path):
+        cache = SubmissionExportCache(str(tmp_path), max_size=5)
+
+        assert b"".join(cache.write_through("key", iter([b"hello ", b"world"]))) == b"hello world"
+
+        assert cache.open("key") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_evicts_least_recently_used_when_full(self, tmp_path):
+        cache = SubmissionExportCache(str(tmp_path), max_size=10)
+        list(cache.write_through("first", iter([b"1111"])))
+        _set_last_used(cache, "first", 1_000)
+        list(cache.write_through("second", iter([b"2222"])))
+        _set_last_used(cache, "second", 2_000)
+
+        # Reading an entry makes it the most recently used.
+        b"".join(cache.open("first"))
+
+        list(cache.write_through("third", iter([b"3333"])))
+
+        assert cache.open("second") is None
+        assert b"".join(cache.open("first")) == b"1111"
+        assert b"".join(cache.open("third")) == b"3333"
+
+    def test_disabled_when_max_size_is_zero(self, tmp_path):
+        assert SubmissionExportCache(str(tmp_path), max_size=0).enabled is False
+        assert SubmissionExportCache(str(tmp_path), max_size=1).enabled is True
@@ -0,0 +1,31 @@
+import io
+import zipfile
+
+from app.common.helpers.zips import iter_zip
+
+
+class TestIterZip:
+    def test_streams_files_as_they_are_added(self):
+        files_added = []
+
+        def _files():
+            for i in range(3):
+                files_added.append(i)
+                yield f"file {i}.txt", f"content {i}".encode()
+
+        chunks = iter_zip(_files())
+        first_chunk = next(chunks)
+
+        assert files_added == [0]
+        archive = zipfile.ZipFile(io.BytesIO(first_chunk + b"".join(chunks)))
+        assert archive.testzip() is None
+        assert {name: archive.read(name) for name in archive.namelist()} == {
+            "file 0.txt": b"content 0",
+            "file 1.txt": b"content 1",
+            "file 2.txt": b"content 2",
+        }
+
+    def test_files_can_be_stored_without_compression(self):
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip([("a.pdf", b"%PDF")], compression=zipfile.ZIP_STORED))))
+
+        assert archive.getinfo("a.pdf").compress_type == zipfile.ZIP_STORED
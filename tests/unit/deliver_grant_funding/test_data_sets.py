@@ -1,22 +1,99 @@
+import io
+
 import pytest
 
-from app.deliver_grant_funding.data_sets import CSVDecodeError, decode_csv_bytes
+from app.deliver_grant_funding import data_sets
+from app.deliver_grant_funding.data_sets import CSVDecodeError, detect_csv_encoding, read_data_set_csv
 
 
-class TestDecodeCsvBytes:
-    def test_decodes_utf8_sig(self):
+class TestDetectCsvEncoding:
+    def test_detects_utf8_sig(self):
         content = "Organisation ID,Grant recipient\nT01,Zürich"
-        assert decode_csv_bytes(content.encode("utf-8-sig")) == content
+        assert detect_csv_encoding(io.BytesIO(content.encode("utf-8-sig"))) == "utf-8-sig"
 
-    def test_decodes_plain_utf8(self):
+    def test_detects_plain_utf8(self):
         content = "Organisation ID,Grant recipient\nT01,Zürich"
-        assert decode_csv_bytes(content.encode("utf-8")) == content
+        assert detect_csv_encoding(io.BytesIO(content.encode("utf-8"))) == "utf-8-sig"
 
-    def test_decodes_cp1252_excel_export(self):
+    def test_detects_cp1252_excel_export(self):
         # eg a CSV saved from Excel/Windows via "CSV (Comma delimited)" rather than "CSV UTF-8"
         content = "Organisation ID,Grant recipient\nT01,Zürich Café münchen"
-        assert decode_csv_bytes(content.encode("cp1252")) == content
+        assert detect_csv_encoding(io.BytesIO(content.encode("cp1252"))) == "cp1252"
+
+    def test_detects_utf16_excel_export(self):
+        # eg a spreadsheet saved from Excel as "Unicode Text"
+        content = "Organisation ID,Grant recipient\nT01,Zürich Café münchen"
+        assert detect_csv_encoding(io.BytesIO(content.encode("utf-16"))) == "utf_16"
+
+    def test_guesses_from_a_sample_of_large_files(self, mocker):
+        guess_csv_encoding = mocker.spy(data_sets, "_guess_csv_encoding")
+        content = "Organisation ID,Grant recipient\n" + "".join(f"T{i:05},Zürich Café {i}\n" for i in range(50_000))
+
+        assert detect_csv_encoding(io.BytesIO(content.encode("cp1252"))) == "cp1252"
+        assert guess_csv_encoding.call_count == 1
+        assert len(guess_csv_encoding.call_args.args[0]) == (
+            data_sets.DATA_SET_ENCODING_SAMPLE_HEAD_SIZE
+            + data_sets.DATA_SET_ENCODING_SAMPLE_WINDOWS * data_sets.DATA_SET_ENCODING_SAMPLE_WINDOW_SIZE
+        )
+
+    def test_guesses_from_the_whole_file_if_the_sample_was_misleading(self, mocker):
+        guess_csv_encoding = mocker.patch.object(data_sets, "_guess_csv_encoding", side_effect=["ascii", "cp1252"])
+        content = "Organisation ID,Grant recipient\nT01,Zürich Café münchen".encode("cp1252")
+
+        assert detect_csv_encoding(io.BytesIO(content)) == "cp1252"
+        assert guess_csv_encoding.call_args.args[0] == content
+
+    def test_checks_utf8_across_chunk_boundaries(self, monkeypatch):
+        monkeypatch.setattr(data_sets, "DATA_SET_CSV_READ_CHUNK_SIZE", 1)
+        content = "Organisation ID,Grant recipient\nT01,Zürich"
+        assert detect_csv_encoding(io.BytesIO(content.encode("utf-8"))) == "utf-8-sig"
+
+    def test_leaves_stream_at_the_start(self):
+        stream = io.BytesIO("Organisation ID,Grant recipient\nT01,Zürich".encode("cp1252"))
+        detect_csv_encoding(stream)
+        assert stream.tell() == 0
 
     def test_raises_for_unreadable_binary(self):
         with pytest.raises(CSVDecodeError):
-            decode_csv_bytes(bytes([0x00, 0x01, 0x02, 0xFF, 0xFE, 0xFD, 0x80, 0x81, 0x00, 0x00]))
+            detect_csv_encoding(io.BytesIO(bytes([0x00, 0x01, 0x02, 0xFF, 0xFE, 0xFD, 0x80, 0x81, 0x00, 0x00])))
+
+
+class TestReadDataSetCsv:
+    def test_reads_columns_and_rows(self):
+        content = " Organisation ID ,Grant recipient\r\nT01,Zürich\r\nT02,Café\r\n"
+
+        with read_data_set_csv(io.BytesIO(content.encode("utf-8-sig")), "utf-8-sig") as (columns, rows):
+            assert columns == ["Organisation ID", "Grant recipient"]
+            assert list(rows) == [
+                {"Organisation ID": "T01", "Grant recipient": "Zürich"},
+                {"Organisation ID": "T02", "Grant recipient": "Café"},
+            ]
+
+    def test_reads_cp1252_excel_export(self):
+        content = "Organisation ID,Grant recipient\r\nT01,Zürich Café münchen\r\n"
+
+        with read_data_set_csv(io.BytesIO(content.encode("cp1252")), "cp1252") as (_, rows):
+            assert list(rows) == [{"Organisation ID": "T01", "Grant recipient": "Zürich Café münchen"}]
+
+    def test_reads_values_that_span_lines(self):
+        content = 'Organisation ID,Notes\r\nT01,"Zürich\r\nCafé"\r\n'
+
+        with read_data_set_csv(io.BytesIO(content.encode("utf-8")), "utf-8-sig") as (_, rows):
+            assert list(rows) == [{"Organisation ID": "T01", "Notes": "Zürich\r\nCafé"}]
+
+    def test_reads_rows_lazily(self):
+        content = "Organisation ID,Grant recipient\r\n" + "".join(f"T{i:05},Recipient {i}\r\n" for i in range(10_000))
+        stream = io.BytesIO(content.encode("utf-8"))
+
+        with read_data_set_csv(stream, "utf-8-sig") as (_, rows):
+            assert next(rows) == {"Organisation ID": "T00000", "Grant recipient": "Recipient 0"}
+            assert stream.tell() < len(content)
+
+    def test_hands_back_stream_open_at_the_start(self):
+        stream = io.BytesIO(b"Organisation ID,Grant recipient\r\nT01,Zurich\r\n")
+
+        with read_data_set_csv(stream, "utf-8-sig") as (_, rows):
+            list(rows)
+
+        assert not stream.closed
+        assert stream.read() == b"Organisation ID,Grant recipient\r\nT01,Zurich\r\n"
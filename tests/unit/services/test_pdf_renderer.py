@@ -0,0 +1,301 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+import uuid
+
+import pytest
+
+from app.services import pdf_renderer as pdf_renderer_module
+from app.services.pdf_renderer import (
+    PdfRendererBusyError,
+    PdfRendererError,
+    PdfRendererService,
+    _BrowserPool,
+    _Request,
+    _Response,
+    _send,
+    _serve,
+)
+
+
+class _FakePage:
+    async def set_content(self, html_content, wait_until):
+        self.html_content = html_content
+
+    async def pdf(self, **kwargs):
+        return f"PDF of {self.html_content}".encode()
+
+    async def close(self):
+        pass
+
+
+class _FakeContext:
+    async def new_page(self):
+        return _FakePage()
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts_created = 0
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, **kwargs):
+        self.contexts_created += 1
+        return _FakeContext()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.browsers = []
+
+    async def launch(self):
+        self.browsers.append(_FakeBrowser())
+        return self.browsers[-1]
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+
+class TestBrowserPool:
+    def test_reuses_browser_and_contexts(self):
+        playwright = _FakePlaywright()
+        pool = _BrowserPool(playwright, concurrency=2, max_renders_per_browser=100, http_credentials=None)
+
+        async def _render_all():
+            return [await pool.render(f"page {i}") for i in range(5)]
+
+        assert asyncio.run(_render_all()) == [f"PDF of page {i}".encode() for i in range(5)]
+        assert len(playwright.chromium.browsers) == 1
+        assert playwright.chromium.browsers[0].contexts_created == 1
+
+    def test_replaces_browser_after_max_renders(self):
+        playwright = _FakePlaywright()
+        pool = _BrowserPool(playwright, concurrency=2, max_renders_per_browser=2, http_credentials=None)
+
+        async def _render_all():
+            for i in range(5):
+                await pool.render(f"page {i}")
+
+        asyncio.run(_render_all())
+
+        assert len(playwright.chromium.browsers) == 3
+        assert [browser.closed for browser in playwright.chromium.browsers] == [True, True, False]
+
+    def test_relaunches_browser_that_has_disconnected(self):
+        playwright = _FakePlaywright()
+        pool = _BrowserPool(playwright, concurrency=2, max_renders_per_browser=100, http_credentials=None)
+
+        async def _render_twice():
+            await pool.render("first")
+            playwright.chromium.browsers[0].closed = True
+            await pool.render("second")
+
+        asyncio.run(_render_twice())
+
+        assert len(playwright.chromium.browsers) == 2
+
+    def test_renders_up_to_concurrency_pages_at_once(self):
+        playwright = _FakePlaywright()
+        pool = _BrowserPool(playwright, concurrency=2, max_renders_per_browser=100, http_credentials=None)
+        rendering = 0
+        most_at_once = 0
+
+        async def _slow_set_content(self, html_content, wait_until):
+            nonlocal rendering, most_at_once
+            rendering += 1
+            most_at_once = max(most_at_once, rendering)
+            await asyncio.sleep(0.01)
+            rendering -= 1
+            self.html_content = html_content
+
+        async def _render_all():
+            await asyncio.gather(*(pool.render(f"page {i}") for i in range(6)))
+
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(_FakePage, "set_content", _slow_set_content)
+            asyncio.run(_render_all())
+
+        assert most_at_once == 2
+        assert playwright.chromium.browsers[0].contexts_created == 2
+
+
+class TestServe:
+    @pytest.fixture
+    def playwright(self, mocker):
+        playwright = _FakePlaywright()
+
+        @contextlib.asynccontextmanager
+        async def _async_playwright():
+            yield playwright
+
+        mocker.patch("playwright.async_api.async_playwright", _async_playwright)
+        return playwright
+
+    @pytest.fixture
+    def socket_path(self):
+        # Unix socket paths have to be short, so this can't go in pytest's tmp_path.
+        socket_path = os.path.join(tempfile.gettempdir(), f"test-pdf-renderer-{uuid.uuid4().hex[:12]}.sock")
+        yield socket_path
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
+
+    def _run(self, socket_path, mocker, requests, *, concurrency=2, max_queued=0):
+        """Runs the renderer on `socket_path`, sends it `requests` from a client thread, then stops it."""
+
+        async def _exercise():
+            serving = asyncio.create_task(
+                _serve(
+                    socket_path=socket_path,
+                    parent_pid=os.getppid(),
+                    concurrency=concurrency,
+                    max_queued=max_queued,
+                    max_renders_per_browser=100,
+                    http_credentials=None,
+                )
+            )
+            while not os.path.exists(socket_path) and not serving.done():
+                await asyncio.sleep(0.01)
+
+            try:
+                return await requests()
+            finally:
+                # The renderer stops once the process that started it has gone.
+                mocker.patch.object(pdf_renderer_module.os, "getppid", return_value=-1)
+                await asyncio.wait_for(serving, timeout=5)
+
+        return asyncio.run(_exercise())
+
+    @staticmethod
+    async def _send(socket_path, request, payload):
+        return await asyncio.to_thread(_send, socket_path, request, payload, timeout=5)
+
+    def test_ping(self, playwright, socket_path, mocker):
+        async def _requests():
+            return await self._send(socket_path, _Request.PING, b"")
+
+        assert self._run(socket_path, mocker, _requests) == (_Response.OK, b"")
+        assert len(playwright.chromium.browsers) == 1
+
+    def test_ping_reports_a_browser_that_will_not_connect(self, playwright, socket_path, mocker):
+        mocker.patch.object(_FakeBrowser, "is_connected", return_value=False)
+
+        async def _requests():
+            return await self._send(socket_path, _Request.PING, b"")
+
+        assert self._run(socket_path, mocker, _requests) == (_Response.ERROR, b"")
+
+    def test_renders_pdf(self, playwright, socket_path, mocker):
+        # Bigger than a single read from the socket, so the response has to be reassembled.
+        html_content = "x" * (3 * 1024 * 1024)
+
+        async def _requests():
+            return await self._send(socket_path, _Request.RENDER, html_content.encode())
+
+        assert self._run(socket_path, mocker, _requests) == (_Response.OK, f"PDF of {html_content}".encode())
+
+    def test_returns_render_errors(self, playwright, socket_path, mocker):
+        async def _failing_set_content(self, html_content, wait_until):
+            raise TimeoutError("took too long")
+
+        mocker.patch.object(_FakePage, "set_content", _failing_set_content)
+
+        async def _requests():
+            return await self._send(socket_path, _Request.RENDER, b"<p>Hello</p>")
+
+        response, body = self._run(socket_path, mocker, _requests)
+
+        assert response == _Response.ERROR
+        assert body == b"TimeoutError('took too long')"
+
+    def test_returns_busy_once_concurrency_and_queue_are_full(self, playwright, socket_path, mocker):
+        started = 0
+        release = None
+
+        # Stands in for the pool so that both requests are being handled at once, one rendering and one queued.
+        async def _blocking_render(self, html_content):
+            nonlocal started
+            started += 1
+            await release.wait()
+            return f"PDF of {html_content}".encode()
+
+        mocker.patch.object(_BrowserPool, "render", _blocking_render)
+
+        async def _requests():
+            nonlocal release
+            release = asyncio.Event()
+            rendering = [
+                asyncio.create_task(self._send(socket_path, _Request.RENDER, f"page {i}".encode())) for i in range(2)
+            ]
+            while started < 2:
+                await asyncio.sleep(0.01)
+
+            busy = await self._send(socket_path, _Request.RENDER, b"page 2")
+            # Pings don't count towards the limit.
+            ping = await self._send(socket_path, _Request.PING, b"")
+
+            release.set()
+            rendered = await asyncio.gather(*rendering)
+            after = await self._send(socket_path, _Request.RENDER, b"page 3")
+            return busy, ping, rendered, after
+
+        busy, ping, rendered, after = self._run(socket_path, mocker, _requests, concurrency=1, max_queued=1)
+
+        assert busy == (_Response.BUSY, b"")
+        assert ping == (_Response.OK, b"")
+        assert rendered == [(_Response.OK, b"PDF of page 0"), (_Response.OK, b"PDF of page 1")]
+        assert after == (_Response.OK, b"PDF of page 3")
+
+
+class TestPdfRendererService:
+    @pytest.fixture
+    def service(self, app, mocker):
+        service = PdfRendererService()
+        service.init_app(app)
+        mocker.patch.object(service, "_ensure_running", return_value="/tmp/renderer.sock")
+        return service
+
+    def test_render_returns_pdf(self, service, mocker):
+        send = mocker.patch.object(pdf_renderer_module, "_send", return_value=(_Response.OK, b"%PDF"))
+
+        assert service.render("<p>Hello</p>") == b"%PDF"
+        assert send.call_args.args[1:] == (_Request.RENDER, b"<p>Hello</p>")
+
+    def test_render_raises_when_busy(self, service, mocker):
+        mocker.patch.object(pdf_renderer_module, "_send", return_value=(_Response.BUSY, b""))
+
+        with pytest.raises(PdfRendererBusyError):
+            service.render("<p>Hello</p>")
+
+    def test_render_raises_renderer_errors(self, service, mocker):
+        mocker.patch.object(pdf_renderer_module, "_send", return_value=(_Response.ERROR, b"TimeoutError()"))
+
+        with pytest.raises(PdfRendererError, match="TimeoutError"):
+            service.render("<p>Hello</p>")
+
+    def test_restarts_renderer_that_has_gone_away(self, service, mocker):
+        mocker.patch.object(
+            pdf_renderer_module, "_send", side_effect=[ConnectionRefusedError(), (_Response.OK, b"%PDF")]
+        )
+        stop = mocker.patch.object(service, "stop")
+
+        assert service.render("<p>Hello</p>") == b"%PDF"
+        assert stop.call_count == 1
+
+    def test_is_healthy(self, service, mocker):
+        mocker.patch.object(pdf_renderer_module, "_send", return_value=(_Response.OK, b""))
+        assert service.is_healthy() is True
+
+        mocker.patch.object(pdf_renderer_module, "_send", side_effect=TimeoutError())
+        assert service.is_healthy() is False
@@ -153,6 +153,9 @@ routes_with_expected_member_only_access = [
     "deliver_grant_funding.view_submission",
     "deliver_grant_funding.export_submission_pdf",
     "deliver_grant_funding.export_collection_submissions",
+    "deliver_grant_funding.request_submission_export",
+    "deliver_grant_funding.get_submission_export_job_status",
+    "deliver_grant_funding.download_submission_export",
     "deliver_grant_funding.add_user_to_grant",
     "deliver_grant_funding.download_file",
     "deliver_grant_funding.list_collection_data_sets",
@@ -235,6 +238,8 @@ routes_with_no_expected_access_restrictions = [
     "deliver_grant_funding.api.govuk_notify_callback",
     # \/ authorisation done within the endpoint via bearer token for Jira data connector \/
     "deliver_grant_funding.api.list_active_grants",
+    # \/ authorisation done within the endpoint via bearer token for downstream data systems \/
+    "deliver_grant_funding.api.list_submission_changes",
     "xgovuk_flask_admin.static",
 ]
 routes_with_access_controlled_by_flask_admin = [